@@ -0,0 +1,36 @@
+"""Fakes shared by the tests of the ext package."""
+import datetime
+
+from zalo_bot import Chat, Message, Update
+
+
+class FakeBot:
+    """Serves a fixed list of updates and records the offsets it was asked for."""
+
+    def __init__(self, updates):
+        self.updates = list(updates)
+        self.offsets = []
+        self.application = None
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def get_update(self, offset=None, limit=None, timeout=None):
+        self.offsets.append(offset)
+        if self.updates:
+            return self.updates.pop(0)
+        self.application.stop()
+        return None
+
+
+def make_update(update_id, chat_id="chat", text="hi"):
+    message = Message(
+        message_id=str(update_id),
+        date=datetime.datetime.now(),
+        chat=Chat(id=chat_id, chat_type="PRIVATE"),
+        text=text,
+    )
+    return Update(message=message, update_id=update_id)
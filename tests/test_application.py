@@ -0,0 +1,156 @@
+import asyncio
+import time
+
+import pytest
+
+from fakes import FakeBot, make_update
+from zalo_bot.error import NetworkError
+from zalo_bot.ext import Application, ApplicationBuilder, MessageHandler, filters
+from zalo_bot.request import HTTPXRequest
+
+
+def test_polling_tracks_offset_and_processes_all_updates():
+    bot = FakeBot([make_update(5), make_update(6), make_update(7)])
+    application = Application(bot)
+    bot.application = application
+    handled = []
+
+    async def callback(update, context):
+        handled.append(update.update_id)
+
+    application.add_handler(MessageHandler(filters.TEXT, callback))
+    asyncio.run(application._polling_loop(timeout=0))
+
+    assert handled == [5, 6, 7]
+    assert bot.offsets[:4] == [None, 6, 7, 8]
+
+
+def test_concurrent_updates_keep_per_chat_order():
+    updates = [make_update(i, chat_id="slow" if i % 2 else "fast") for i in range(1, 9)]
+    bot = FakeBot(updates)
+    application = Application(bot, concurrent_updates=4)
+    bot.application = application
+    handled = []
+
+    async def callback(update, context):
+        if update.message.chat.id == "slow":
+            await asyncio.sleep(0.01)
+        handled.append((update.message.chat.id, update.update_id))
+
+    application.add_handler(MessageHandler(filters.TEXT, callback))
+    asyncio.run(application._polling_loop(timeout=0))
+
+    assert [i for chat, i in handled if chat == "slow"] == [1, 3, 5, 7]
+    assert [i for chat, i in handled if chat == "fast"] == [2, 4, 6, 8]
+    # The fast chat must not have waited for the slow one
+    assert handled.index(("fast", 8)) < handled.index(("slow", 7))
+    assert not application._lanes
+
+
+def test_builder_request_settings():
+    application = (
+        ApplicationBuilder()
+        .token("123:abc")
+        .connection_pool_size(64)
+        .http_version("1.1")
+        .get_updates_read_timeout(40)
+        .build()
+    )
+    request = application.bot.request
+    assert request._client_kwargs["limits"].max_connections == 64
+    assert application.bot._request[0].read_timeout == 40
+
+    custom = HTTPXRequest()
+    assert ApplicationBuilder().token("123:abc").request(custom).build().bot.request is custom
+    with pytest.raises(RuntimeError, match="connection_pool_size"):
+        ApplicationBuilder().request(custom).connection_pool_size(4)
+
+
+class LongPollingBot(FakeBot):
+    """Like FakeBot, but waits for new updates like a long-poll request instead of stopping."""
+
+    async def get_update(self, offset=None, limit=None, timeout=None):
+        self.offsets.append(offset)
+        if self.updates:
+            return self.updates.pop(0)
+        if timeout:
+            await asyncio.sleep(3600)
+        return None
+
+
+def test_stop_with_full_queue_loses_no_update():
+    bot = LongPollingBot([make_update(1), make_update(2), make_update(3)])
+    application = Application(bot, update_queue_size=1)
+    handled = []
+
+    async def callback(update, context):
+        handled.append(update.update_id)
+        if update.update_id == 1:
+            # Meanwhile, update 2 is queued and the fetcher waits to queue update 3
+            await asyncio.sleep(0.05)
+            application.stop()
+
+    application.add_handler(MessageHandler(filters.TEXT, callback))
+    asyncio.run(application._polling_loop(timeout=10))
+
+    assert handled == [1, 2, 3]
+    # Acknowledged only once processed
+    assert bot.offsets[-1] == 4
+
+
+@pytest.mark.parametrize("concurrent_updates", [2, 4])
+def test_flooding_chat_does_not_block_other_chats(concurrent_updates):
+    updates = [make_update(i, chat_id="flood") for i in range(1, 21)]
+    updates.append(make_update(21, chat_id="other"))
+    bot = FakeBot(updates)
+    application = Application(bot, concurrent_updates=concurrent_updates)
+    bot.application = application
+    handled = []
+
+    async def callback(update, context):
+        await asyncio.sleep(0.005)
+        handled.append(update.update_id)
+
+    application.add_handler(MessageHandler(filters.TEXT, callback))
+    asyncio.run(application._polling_loop(timeout=0))
+
+    assert sorted(handled) == list(range(1, 22))
+    assert [i for i in handled if i != 21] == list(range(1, 21))
+    assert handled.index(21) < 3
+    assert not application._lanes
+
+
+def test_waiting_chats_take_turns():
+    # More chats than slots: a busy chat hands its slot over after each update
+    updates = [make_update(i, chat_id="busy") for i in range(1, 11)]
+    updates += [make_update(11, chat_id="a"), make_update(12, chat_id="b")]
+    bot = FakeBot(updates)
+    application = Application(bot, concurrent_updates=2)
+    bot.application = application
+    handled = []
+
+    async def callback(update, context):
+        await asyncio.sleep(0.005)
+        handled.append(update.update_id)
+
+    application.add_handler(MessageHandler(filters.TEXT, callback))
+    asyncio.run(application._polling_loop(timeout=0))
+
+    assert sorted(handled) == list(range(1, 13))
+    assert handled.index(12) < 5
+
+
+def test_stop_interrupts_the_backoff():
+    class FailingBot(FakeBot):
+        async def get_update(self, offset=None, limit=None, timeout=None):
+            raise NetworkError("down")
+
+    application = Application(FailingBot([]))
+
+    async def main():
+        asyncio.get_running_loop().call_later(0.1, application.stop)
+        start = time.perf_counter()
+        await application._polling_loop(timeout=0, max_backoff=30)
+        return time.perf_counter() - start
+
+    assert asyncio.run(main()) < 0.4
@@ -0,0 +1,44 @@
+import httpx
+
+from zalo_bot import Bot
+from zalo_bot.request import HTTPXRequest, RetryPolicy
+
+
+def test_sync_methods_use_the_bot_request_settings():
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(200, json={"ok": True, "result": True})
+
+    policy = RetryPolicy()
+    request = HTTPXRequest(
+        read_timeout=7,
+        retry_policy=policy,
+        json_codec="json",
+        body_format="json",
+        keep_alive=False,
+        httpx_kwargs={"transport": httpx.MockTransport(handler)},
+    )
+    bot = Bot("123:abc", request=request)
+    try:
+        assert bot.delete_webhook_sync() is True
+        sync_request = bot._sync_request
+        assert sync_request is not request
+        assert sync_request._client is not request._client
+        assert sync_request.read_timeout == 7
+        assert sync_request.retry_policy is policy
+        assert sync_request.json_codec is request.json_codec
+    finally:
+        bot.shutdown_sync()
+
+    assert seen[0].headers["content-type"] == "application/json"
+    assert seen[0].headers["connection"] == "close"
+    assert not request._client.is_closed
+
+
+def test_copy_rebuilds_socket_options_transport():
+    request = HTTPXRequest(socket_options=[(1, 2, 3)])
+    clone = request._copy_for_event_loop()
+    assert clone._client_kwargs["transport"] is not request._client_kwargs["transport"]
+    assert clone._client_kwargs["limits"] is request._client_kwargs["limits"]
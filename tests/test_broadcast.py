@@ -0,0 +1,52 @@
+import asyncio
+
+from zalo_bot import Bot
+from zalo_bot.error import BadRequest
+
+
+class RecordingBot(Bot):
+    def __init__(self):
+        super().__init__("123:abc")
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.sent = []
+
+    async def _do_post(self, endpoint, data, *, request_data=None, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            self.sent.append(request_data.parameters)
+            if data["chat_id"] == "bad":
+                raise BadRequest("chat not found")
+            return {"message_id": "m", "chat": {"id": data["chat_id"]}, "date": 0}
+        finally:
+            self.in_flight -= 1
+
+
+def test_send_message_many_reports_every_chat():
+    async def main():
+        bot = RecordingBot()
+        chat_ids = [f"c{i}" for i in range(20)] + ["bad"]
+        results = [r async for r in bot.send_message_many(chat_ids, "hello", concurrency=4)]
+        return bot, results
+
+    bot, results = asyncio.run(main())
+    assert sorted(r.chat_id for r in results) == sorted([f"c{i}" for i in range(20)] + ["bad"])
+    failed = [r for r in results if not r.ok]
+    assert [r.chat_id for r in failed] == ["bad"]
+    assert isinstance(failed[0].error, BadRequest)
+    assert bot.max_in_flight == 4
+    assert all(params["text"] == "hello" for params in bot.sent)
+
+
+def test_send_message_many_stops_when_caller_breaks():
+    async def main():
+        bot = RecordingBot()
+        async for _ in bot.send_message_many((f"c{i}" for i in range(100)), "x", concurrency=2):
+            break
+        await asyncio.sleep(0.05)
+        return bot
+
+    bot = asyncio.run(main())
+    assert len(bot.sent) < 10
@@ -0,0 +1,54 @@
+import asyncio
+
+from fakes import FakeBot, make_update
+from zalo_bot.ext import Application, CommandHandler, MessageHandler, filters
+
+
+def dispatch(application, text):
+    asyncio.run(application.process_update(make_update(1, text=text)))
+
+
+def test_commands_are_routed_by_name_in_order():
+    application = Application(FakeBot([]))
+    handled = []
+
+    def record(name):
+        def callback(update, context):
+            handled.append((name, context.args))
+
+        return callback
+
+    for i in range(100):
+        application.add_handler(CommandHandler(f"cmd{i}", record(f"cmd{i}")))
+    application.add_handler(CommandHandler("start", record("first start")))
+    application.add_handler(CommandHandler("start", record("second start")))
+    application.add_handler(MessageHandler(filters.TEXT, record("text")))
+
+    dispatch(application, "/start a  b")
+    dispatch(application, "/cmd42")
+    dispatch(application, "/unknown x")
+    dispatch(application, "hello")
+    # Used to raise an IndexError in CommandHandler.check_update
+    dispatch(application, "   ")
+
+    assert handled == [
+        ("first start", ["a", "b"]),
+        ("cmd42", []),
+        ("text", []),
+        ("text", []),
+        ("text", []),
+    ]
+    assert len(application.handlers) == 103
+
+
+def test_earlier_message_handler_takes_precedence():
+    application = Application(FakeBot([]))
+    handled = []
+    application.add_handler(CommandHandler("help", lambda u, c: handled.append("help")))
+    application.add_handler(MessageHandler(filters.COMMAND, lambda u, c: handled.append("any")))
+    application.add_handler(CommandHandler("start", lambda u, c: handled.append("start")))
+
+    dispatch(application, "/help")
+    dispatch(application, "/start")
+
+    assert handled == ["help", "any"]
@@ -0,0 +1,39 @@
+import asyncio
+
+from fakes import FakeBot, make_update
+from zalo_bot.ext import Dispatcher, MessageHandler, filters
+
+
+def test_workers_drain_queue_on_stop():
+    dispatcher = Dispatcher(FakeBot([]), workers=3, queue_size=2)
+    handled = []
+
+    async def callback(update, context):
+        await asyncio.sleep(0.001)
+        handled.append(update.update_id)
+
+    dispatcher.add_handler(MessageHandler(filters.TEXT, callback))
+
+    async def run():
+        await dispatcher.start()
+        for update_id in range(10):
+            await dispatcher.feed_update(make_update(update_id))
+        await dispatcher.stop()
+
+    asyncio.run(run())
+
+    assert sorted(handled) == list(range(10))
+    stats = dispatcher.statistics()
+    assert stats["processed_updates"] == 10
+    assert stats["queue_size"] == 0
+    assert stats["busy_workers"] == 0
+
+
+def test_feed_update_without_workers_processes_directly():
+    dispatcher = Dispatcher(FakeBot([]))
+    handled = []
+    dispatcher.add_handler(MessageHandler(filters.TEXT, lambda u, c: handled.append(u.update_id)))
+
+    asyncio.run(dispatcher.feed_update(make_update(1)))
+
+    assert handled == [1]
@@ -0,0 +1,114 @@
+import asyncio
+import io
+import tracemalloc
+
+import httpx
+import pytest
+
+from zalo_bot import Bot, File
+from zalo_bot.error import InvalidToken
+from zalo_bot.request import BaseRequest, HTTPXRequest
+
+CHUNK = b"x" * 65536
+
+
+def make_file(handler, file_size=None):
+    request = HTTPXRequest(httpx_kwargs={"transport": httpx.MockTransport(handler)})
+    file = File("id", "unique", file_size=file_size, file_path="https://example.com/file.mp4")
+    file.set_bot(Bot("123:abc", request=request))
+    return file, request
+
+
+def stream_body(chunks):
+    async def body():
+        for _ in range(chunks):
+            yield CHUNK
+
+    return lambda request: httpx.Response(200, content=body())
+
+
+def test_download_to_drive_streams(tmp_path):
+    # 32 MiB, served chunk by chunk
+    file, request = make_file(stream_body(512))
+    progress = []
+
+    async def main():
+        async with request:
+            tracemalloc.start()
+            try:
+                path = await file.download_to_drive(
+                    tmp_path / "video.mp4", progress=lambda done, total: progress.append(done)
+                )
+                return path, tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+    path, peak = asyncio.run(main())
+    assert path.stat().st_size == 512 * len(CHUNK)
+    assert progress[-1] == 512 * len(CHUNK)
+    assert peak < 4 * 1024 * 1024
+
+
+def test_max_size(tmp_path):
+    file, request = make_file(stream_body(4))
+
+    async def main():
+        async with request:
+            with pytest.raises(ValueError, match="max_size"):
+                await file.download_to_drive(tmp_path / "big", max_size=len(CHUNK))
+            out = io.BytesIO()
+            await file.download_to_memory(out, max_size=4 * len(CHUNK))
+            return out
+
+    assert len(asyncio.run(main()).getvalue()) == 4 * len(CHUNK)
+    assert not (tmp_path / "big").exists()
+    assert not list(tmp_path.iterdir())
+
+    file, _ = make_file(stream_body(4), file_size=10)
+    with pytest.raises(ValueError, match="10 bytes"):
+        asyncio.run(file.download_to_memory(io.BytesIO(), max_size=5))
+
+
+def test_failed_download_keeps_existing_file(tmp_path):
+    target = tmp_path / "video.mp4"
+    target.write_bytes(b"previous")
+    file, request = make_file(stream_body(4))
+
+    async def main():
+        async with request:
+            with pytest.raises(ValueError, match="max_size"):
+                await file.download_to_drive(target, max_size=len(CHUNK))
+            assert target.read_bytes() == b"previous"
+            await file.download_to_drive(target)
+
+    asyncio.run(main())
+    assert target.stat().st_size == 4 * len(CHUNK)
+    assert list(tmp_path.iterdir()) == [target]
+
+
+def test_error_response():
+    file, request = make_file(lambda request: httpx.Response(404, json={"ok": False}))
+
+    async def main():
+        async with request:
+            await file.download_to_memory(io.BytesIO())
+
+    with pytest.raises(InvalidToken):
+        asyncio.run(main())
+
+
+def test_fallback_for_other_backends():
+    class BufferedRequest(BaseRequest):
+        async def initialize(self):
+            pass
+
+        async def shutdown(self):
+            pass
+
+        async def do_request(self, url, method, request_data=None, **kwargs):
+            return 200, b"abcdefg"
+
+    async def main():
+        return [chunk async for chunk in BufferedRequest().stream("https://x", chunk_size=3)]
+
+    assert asyncio.run(main()) == [b"abc", b"def", b"g"]
@@ -0,0 +1,77 @@
+import datetime
+import re
+
+from zalo_bot import Chat, Message, Update, User
+from zalo_bot.ext import filters
+
+
+def make_update(text="hi", chat_type="PRIVATE", chat_id="chat", user_id="user"):
+    message = Message(
+        message_id="1",
+        date=datetime.datetime.now(),
+        chat=Chat(id=chat_id, chat_type=chat_type),
+        text=text,
+        from_user=User(id=user_id, display_name="Name"),
+    )
+    return Update(message=message, update_id=1)
+
+
+class Counting(filters.BaseFilter):
+    def __init__(self, result, cost=filters.DEFAULT_COST):
+        self.calls = 0
+
+        def check(update):
+            self.calls += 1
+            return result
+
+        super().__init__(check, cost)
+
+
+def test_composition():
+    text_not_command = filters.TEXT & ~filters.COMMAND
+    assert text_not_command(make_update("hello"))
+    assert not text_not_command(make_update("/start"))
+    assert not text_not_command(make_update(None))
+    assert (filters.PHOTO | filters.TEXT)(make_update("hello"))
+    assert not (filters.PHOTO | filters.STICKER)(make_update("hello"))
+    assert ~~filters.TEXT is filters.TEXT
+
+
+def test_flattened_and_deduplicated():
+    custom = Counting(True)
+    combined = (filters.TEXT & custom) & (filters.TEXT & filters.Regex("a+"))
+    assert combined.operands[0] is filters.TEXT
+    assert len(combined.operands) == 3
+    assert len((filters.Regex("a") | filters.Regex("a")).operands) == 1
+    assert (filters.ALL & filters.TEXT).operands == (filters.TEXT,)
+
+
+def test_shared_filter_is_evaluated_once_per_update():
+    custom = Counting(True)
+    combined = (custom & filters.PHOTO) | (custom & filters.TEXT) | ~custom
+    update = make_update("hello")
+    assert combined(update)
+    assert combined(update)
+    assert custom.calls == 1
+    assert combined(make_update("hello"))
+    assert custom.calls == 2
+
+
+def test_cheap_filters_first():
+    expensive = Counting(True, cost=filters.EXPENSIVE)
+    assert not (expensive & filters.COMMAND)(make_update("hello"))
+    assert expensive.calls == 0
+
+
+def test_builtin_filters():
+    update = make_update("Order #42", chat_type="GROUP", chat_id="g1", user_id="u1")
+    assert filters.Regex(r"#\d+")(update)
+    assert not filters.Regex("order")(update)
+    assert filters.Regex(re.compile("order", re.IGNORECASE))(update)
+    assert filters.GROUP(update)
+    assert not filters.PRIVATE(update)
+    assert filters.ChatType("private", "group")(update)
+    assert filters.User(["u1", "u2"])(update)
+    assert not filters.User("u2")(update)
+    assert filters.Chat("g1")(update)
+    assert (filters.GROUP & filters.Chat({"g1", "g2"}) & ~filters.User("u2"))(update)
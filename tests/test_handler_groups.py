@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import time
+
+import pytest
+
+from fakes import FakeBot, make_update
+from zalo_bot.ext import (
+    Application,
+    ApplicationHandlerStop,
+    CommandHandler,
+    Dispatcher,
+    MessageHandler,
+    filters,
+)
+
+
+def dispatch(application, text):
+    application.process_update_sync(make_update(1, text=text))
+
+
+def test_one_handler_per_group_in_ascending_order():
+    application = Application(FakeBot([]))
+    handled = []
+    application.add_handler(MessageHandler(filters.TEXT, lambda u, c: handled.append("text")))
+    application.add_handler(CommandHandler("start", lambda u, c: handled.append("start")), 1)
+    application.add_handler(MessageHandler(filters.ALL, lambda u, c: handled.append("all")), -1)
+    application.add_handler(MessageHandler(filters.ALL, lambda u, c: handled.append("all2")), -1)
+
+    dispatch(application, "/start")
+    assert handled == ["all", "text", "start"]
+    assert len(application.handlers) == 4
+
+
+def test_handler_stop_skips_later_groups():
+    application = Application(FakeBot([]))
+    handled = []
+
+    def stop(update, context):
+        handled.append("stop")
+        raise ApplicationHandlerStop
+
+    application.add_handler(MessageHandler(filters.TEXT, stop))
+    application.add_handler(MessageHandler(filters.TEXT, lambda u, c: handled.append("late")), 1)
+
+    dispatch(application, "hi")
+    assert handled == ["stop"]
+
+
+def test_independent_groups_run_concurrently(caplog):
+    application = Application(FakeBot([]))
+    handled = []
+
+    async def slow(update, context):
+        await asyncio.sleep(0.2)
+        handled.append("analytics")
+        raise RuntimeError("analytics is down")
+
+    async def reply(update, context):
+        await asyncio.sleep(0.2)
+        handled.append("reply")
+
+    application.add_handler(MessageHandler(filters.ALL, slow), -1)
+    application.mark_group_independent(-1)
+    application.add_handler(MessageHandler(filters.TEXT, reply))
+
+    start = time.perf_counter()
+    with caplog.at_level(logging.ERROR):
+        dispatch(application, "hi")
+    assert time.perf_counter() - start < 0.35
+    assert sorted(handled) == ["analytics", "reply"]
+    assert any(record.exc_info for record in caplog.records)
+
+
+def test_handlers_can_only_be_changed_via_methods():
+    application = Application(FakeBot([]))
+    handled = []
+    text = MessageHandler(filters.TEXT, lambda u, c: handled.append("text"))
+    start = CommandHandler("start", lambda u, c: handled.append("start"))
+    fallback = MessageHandler(filters.ALL, lambda u, c: handled.append("all"))
+    application.add_handler(text)
+    application.add_handler(start)
+    application.add_handler(fallback, 1)
+
+    assert application.handlers == (text, start, fallback)
+    with pytest.raises(AttributeError):
+        application.handlers.append(fallback)
+
+    application.remove_handler(text)
+    application.remove_handler(fallback, 1)
+    with pytest.raises(ValueError):
+        application.remove_handler(fallback, 1)
+    assert application.handlers == (start,)
+    dispatch(application, "hi")
+    dispatch(application, "/start")
+    assert handled == ["start"]
+
+
+def test_dispatcher_handlers_are_the_application_handlers():
+    dispatcher = Dispatcher(FakeBot([]))
+    handler = MessageHandler(filters.ALL, lambda u, c: None)
+    dispatcher.add_handler(handler)
+    assert dispatcher.handlers == dispatcher.application.handlers == (handler,)
+    dispatcher.remove_handler(handler)
+    assert dispatcher.handlers == ()
+
+
+def test_independent_groups_do_not_hold_the_update():
+    handled = []
+
+    async def slow(update, context):
+        context.chat_data["seen"] = True
+        await asyncio.sleep(0.2)
+        handled.append(("analytics", update.update_id))
+
+    async def reply(update, context):
+        handled.append(("reply", update.update_id))
+
+    def build(application):
+        application.add_handler(MessageHandler(filters.ALL, slow), -1)
+        application.mark_group_independent(-1)
+        application.add_handler(MessageHandler(filters.TEXT, reply))
+        return application
+
+    # Updates of the same chat are processed one after the other, but the second one
+    # doesn't wait for the analytics of the first one
+    bot = FakeBot([make_update(1), make_update(2)])
+    application = build(Application(bot, concurrent_updates=2))
+    bot.application = application
+    application.run_polling(timeout=0)
+    assert handled[:2] == [("reply", 1), ("reply", 2)]
+    # Stopping waited for the independent handlers
+    assert sorted(handled[2:]) == [("analytics", 1), ("analytics", 2)]
+
+    dispatcher = Dispatcher(FakeBot([]), workers=1)
+    build(dispatcher.application)
+    handled.clear()
+
+    async def main():
+        await dispatcher.start()
+        await dispatcher.feed_update(make_update(3))
+        await dispatcher.stop()
+
+    asyncio.run(main())
+    assert handled == [("reply", 3), ("analytics", 3)]
@@ -0,0 +1,190 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from zalo_bot import Bot, InputFile
+from zalo_bot.constants import BASE_URL
+from zalo_bot.request import HTTPXRequest, RequestData
+from zalo_bot.request._request_parameter import RequestParameter
+
+
+def send(body_format, parameters):
+    captured = {}
+
+    def handler(request):
+        captured["content_type"] = request.headers.get("content-type", "")
+        captured["body"] = request.read()
+        return httpx.Response(200, json={"ok": True, "result": True})
+
+    async def main():
+        request = HTTPXRequest(
+            body_format=body_format,
+            httpx_kwargs={"transport": httpx.MockTransport(handler)},
+        )
+        async with request:
+            await request.post("https://example.com/botX/sendMessage", RequestData(parameters))
+
+    asyncio.run(main())
+    return captured
+
+
+def test_json_body():
+    captured = send(
+        "json",
+        [
+            RequestParameter.from_input("chat_id", "c1"),
+            RequestParameter.from_input("ids", [1, 2]),
+        ],
+    )
+    assert captured["content_type"] == "application/json"
+    assert json.loads(captured["body"]) == {"chat_id": "c1", "ids": [1, 2]}
+
+
+def test_form_body():
+    captured = send("form", [RequestParameter.from_input("chat_id", "c1")])
+    assert captured["content_type"] == "application/x-www-form-urlencoded"
+    assert captured["body"] == b"chat_id=c1"
+
+
+def test_json_falls_back_to_multipart_for_files():
+    captured = send(
+        "json",
+        [
+            RequestParameter.from_input("chat_id", "c1"),
+            RequestParameter.from_input("photo", InputFile(b"data", filename="a.jpg")),
+        ],
+    )
+    assert captured["content_type"].startswith("multipart/form-data")
+    assert b'name="photo"' in captured["body"]
+
+
+def test_invalid_body_format():
+    with pytest.raises(ValueError, match="body_format"):
+        HTTPXRequest(body_format="xml")
+
+
+def mock_request(handler, **kwargs):
+    return HTTPXRequest(httpx_kwargs={"transport": httpx.MockTransport(handler)}, **kwargs)
+
+
+def test_keep_alive_limits():
+    limits = HTTPXRequest(connection_pool_size=4, keepalive_expiry=10)._client_kwargs["limits"]
+    assert (limits.max_connections, limits.max_keepalive_connections) == (4, 4)
+    assert limits.keepalive_expiry == 10
+
+    limits = HTTPXRequest(max_keepalive_connections=2)._client_kwargs["limits"]
+    assert limits.max_keepalive_connections == 2
+
+    limits = HTTPXRequest(keep_alive=False)._client_kwargs["limits"]
+    assert limits.max_keepalive_connections == 0
+
+
+@pytest.mark.parametrize("keep_alive", [True, False])
+def test_connection_header(keep_alive):
+    headers = []
+
+    def handler(request):
+        headers.append(request.headers)
+        return httpx.Response(200, json={"ok": True, "result": True})
+
+    async def main():
+        async with mock_request(handler, keep_alive=keep_alive) as request:
+            await request.post("https://example.com/botX/getMe")
+
+    asyncio.run(main())
+    assert headers[0]["user-agent"] == HTTPXRequest.USER_AGENT
+    assert (headers[0].get("connection") == "close") is not keep_alive
+
+
+def test_warm_up():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if len(requests) == 3:
+            raise httpx.ConnectError("refused")
+        return httpx.Response(404)
+
+    async def main():
+        request = mock_request(handler)
+        await request.shutdown()
+        with pytest.raises(RuntimeError, match="not initialized"):
+            await request.warm_up("https://example.com")
+        await request.initialize()
+        # Failures are only logged
+        await request.warm_up("https://example.com:8443/bot123:secret/getMe?x=1", connections=3)
+        await request.shutdown()
+
+    asyncio.run(main())
+    assert [r.method for r in requests] == ["HEAD"] * 3
+    assert {str(r.url) for r in requests} == {"https://example.com:8443/"}
+
+
+def test_default_timeouts_are_reused():
+    timeouts = []
+
+    def handler(request):
+        timeouts.append(request.extensions["timeout"])
+        return httpx.Response(200, json={"ok": True, "result": True})
+
+    async def main():
+        request = mock_request(
+            handler, read_timeout=3, write_timeout=4, media_write_timeout=30
+        )
+        default = HTTPXRequest.DEFAULT_NONE
+        assert request._resolve_timeout(
+            request._default_timeout, default, default, default, default
+        ) is request._default_timeout
+        url = "https://example.com/botX/sendPhoto"
+        async with request:
+            await request.post(url)
+            await request.post(url, read_timeout=9)
+            await request.post(
+                url,
+                RequestData([RequestParameter.from_input("photo", InputFile(b"x"))]),
+            )
+            await request.post(url)
+        # Re-initializing doesn't change the defaults
+        async with request:
+            await request.post(url)
+
+    asyncio.run(main())
+    assert [(t["read"], t["write"]) for t in timeouts] == [
+        (3, 4),
+        (9, 4),
+        (3, 30),
+        (3, 4),
+        (3, 4),
+    ]
+
+
+def test_bot_endpoint_urls():
+    urls = []
+
+    def handler(request):
+        urls.append(request.url)
+        return httpx.Response(200, json={"ok": True, "result": True})
+
+    async def main():
+        request = mock_request(handler)
+        bot = Bot("123:abc", request=request)
+        other = Bot("456:def", base_url="https://other.example", request=request)
+        await bot.delete_webhook()
+        await bot.delete_webhook()
+        await other.delete_webhook()
+        await bot._post("getChat", {})
+        await request.shutdown()
+        return bot, request
+
+    bot, request = asyncio.run(main())
+    assert bot._endpoint_urls["sendMessage"] == f"{BASE_URL}/bot123:abc/sendMessage"
+    assert [str(url) for url in urls] == [
+        f"{BASE_URL}/bot123:abc/deleteWebhook",
+        f"{BASE_URL}/bot123:abc/deleteWebhook",
+        "https://other.example/bot456:def/deleteWebhook",
+        f"{BASE_URL}/bot123:abc/getChat",
+    ]
+    # Each URL is parsed once
+    assert sorted(map(str, request._urls)) == sorted(set(map(str, urls)))
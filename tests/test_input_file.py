@@ -0,0 +1,101 @@
+import asyncio
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from zalo_bot import InputFile
+from zalo_bot._utils.files import LocalFileReader, parse_file_input
+from zalo_bot.request import HTTPXRequest, RequestData
+from zalo_bot.request._request_parameter import RequestParameter
+
+SIZE = 32 * 1024 * 1024
+
+
+@pytest.fixture(scope="module")
+def large_file(tmp_path_factory):
+    path = tmp_path_factory.mktemp("upload") / "video.mp4"
+    with path.open("wb") as file:
+        for i in range(SIZE // 65536):
+            file.write(bytes([i % 256]) * 65536)
+    return path
+
+
+async def upload(input_files):
+    """Uploads the files concurrently to a local stub and returns the body sizes it received
+    and the peak of the memory allocated meanwhile."""
+    received = []
+
+    async def handle(reader, writer):
+        head = await reader.readuntil(b"\r\n\r\n")
+        length = next(
+            int(line.split(b":")[1])
+            for line in head.split(b"\r\n")
+            if line.lower().startswith(b"content-length:")
+        )
+        remaining = length
+        while remaining:
+            remaining -= len(await reader.read(min(remaining, 1 << 20)))
+        received.append(length)
+        body = b'{"ok": true, "result": true}'
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    async with HTTPXRequest() as request:
+        tracemalloc.start()
+        try:
+            await asyncio.gather(
+                *(
+                    request.post(
+                        f"http://127.0.0.1:{port}/sendVideo",
+                        RequestData([RequestParameter.from_input("video", input_file)]),
+                    )
+                    for input_file in input_files
+                )
+            )
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    server.close()
+    return received, peak
+
+
+@pytest.mark.parametrize("memory_map", [False, True])
+def test_path_upload_is_streamed(large_file, memory_map):
+    input_file = InputFile(large_file, memory_map=memory_map)
+    assert input_file.filename == "video.mp4"
+    assert input_file.mimetype == "video/mp4"
+
+    # The same InputFile, uploaded three times at once
+    received, peak = asyncio.run(upload([input_file] * 3))
+    assert len(received) == 3
+    assert all(length > SIZE for length in received)
+    assert peak < 4 * 1024 * 1024
+
+
+def test_local_file_reader_reopens(tmp_path):
+    path = tmp_path / "file.txt"
+    path.write_bytes(b"abcdef")
+    reader = LocalFileReader(path)
+    assert reader.seek(0, 2) == 6
+    reader.seek(0)
+    assert reader.read(4) == b"abcd"
+    assert reader.read(4) == b"ef"
+    assert reader.read(4) == b""
+    assert reader._file is None
+    # A retry starts over
+    reader.seek(0)
+    assert reader.read() == b"abcdef"
+    assert reader._file is None
+
+
+def test_parse_file_input_keeps_path(tmp_path):
+    path = tmp_path / "photo.jpg"
+    path.write_bytes(b"jpg")
+    input_file = parse_file_input(str(path))
+    assert isinstance(input_file, InputFile)
+    assert input_file.input_file_content == Path(path)
+    assert input_file.filename == "photo.jpg"
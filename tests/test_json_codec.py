@@ -0,0 +1,80 @@
+import pytest
+
+from zalo_bot import Bot
+from zalo_bot._utils.json_codec import ORJSON_AVAILABLE, get_json_codec
+from zalo_bot.error import ZaloError
+from zalo_bot.request import BaseRequest, HTTPXRequest, JSONCodec, RequestData
+from zalo_bot.request._request_parameter import RequestParameter
+
+CODECS = ["json", "auto"] + (["orjson"] if ORJSON_AVAILABLE else [])
+
+
+@pytest.mark.parametrize("name", CODECS)
+def test_round_trip(name):
+    codec = get_json_codec(name)
+    data = {"text": "xin chào / hi", "nested": [1, 2.5, None, True]}
+    assert codec.loads(codec.dumps_bytes(data)) == data
+    assert codec.loads(codec.dumps(data)) == data
+
+
+def test_unknown_codec():
+    with pytest.raises(ValueError, match="Unknown JSON codec"):
+        get_json_codec("simplejson")
+
+
+@pytest.mark.parametrize("name", CODECS)
+def test_request_data_uses_codec(name):
+    codec = get_json_codec(name)
+    request_data = RequestData(
+        [
+            RequestParameter.from_input("chat_id", "abc"),
+            RequestParameter.from_input("ids", [1, 2]),
+        ],
+        json_codec=codec,
+    )
+    assert request_data.json_parameters == {"chat_id": "abc", "ids": codec.dumps([1, 2])}
+    assert codec.loads(request_data.json_payload) == {"chat_id": "abc", "ids": [1, 2]}
+
+
+@pytest.mark.parametrize("name", CODECS)
+def test_parse_json_payload(name):
+    request = HTTPXRequest(json_codec=name)
+    assert request.parse_json_payload(b'{"ok": true, "result": "\xc3\xa0"}')["result"] == "à"
+    # Invalid UTF-8 is replaced instead of failing the whole response
+    assert request.parse_json_payload(b'{"result": "\xff"}') == {"result": "�"}
+    with pytest.raises(ZaloError, match="Invalid server response"):
+        request.parse_json_payload(b"not json")
+
+
+def test_bot_passes_codec_on():
+    class CustomCodec(JSONCodec):
+        pass
+
+    codec = CustomCodec()
+    bot = Bot("123:abc", json_codec=codec)
+    assert bot.json_codec is codec
+    assert all(request.json_codec is codec for request in bot._request)
+
+
+def test_parse_json_payload_stays_static():
+    assert BaseRequest.parse_json_payload(b'{"ok": true}') == {"ok": True}
+    codec = get_json_codec("json")
+    assert BaseRequest.parse_json_payload(b'{"ok": true}', codec) == {"ok": True}
+
+
+def test_overridden_parse_json_payload_is_used():
+    class CustomRequest(HTTPXRequest):
+        @staticmethod
+        def parse_json_payload(payload):
+            return {"ok": True, "result": "custom"}
+
+    class CountingCodec(JSONCodec):
+        calls = 0
+
+        def loads(self, data):
+            CountingCodec.calls += 1
+            return super().loads(data)
+
+    assert CustomRequest()._parse_json(b"{}") == {"ok": True, "result": "custom"}
+    assert HTTPXRequest(json_codec=CountingCodec())._parse_json(b"{}") == {}
+    assert CountingCodec.calls == 1
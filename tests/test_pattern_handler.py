@@ -0,0 +1,137 @@
+import asyncio
+import re
+
+import pytest
+
+from fakes import FakeBot, make_update
+from zalo_bot.ext import Application, PatternHandler
+
+
+def recorder(name, handled):
+    def callback(update, context):
+        handled.append((name, context.match))
+
+    return callback
+
+
+def test_regex_routes():
+    handled = []
+    handler = PatternHandler(
+        [
+            (r"order #(\d+)", recorder("order", handled)),
+            (r"(?P<amount>\d+) tickets?", recorder("tickets", handled)),
+            (re.compile("help"), recorder("help", handled)),
+        ],
+        flags=re.IGNORECASE,
+    )
+    application = Application(FakeBot([]))
+
+    for text in ["Order #42 please", "I need 3 tickets", "help, order #7", "nothing"]:
+        update = make_update(1, text=text)
+        if handler.check_update(update):
+            asyncio.run(handler.handle_update(update, application))
+
+    assert [name for name, _ in handled] == ["order", "tickets", "help"]
+    assert handled[0][1].group(1) == "42"
+    assert handled[1][1]["amount"] == "3"
+
+
+def test_patterns_that_cannot_be_combined():
+    handled = []
+    # Duplicate group names
+    handler = PatternHandler(
+        [
+            (r"(?P<word>\w+) (?P=word)", recorder("repeat", handled)),
+            (r"(?P<word>bye)", recorder("bye", handled)),
+        ]
+    )
+    assert handler._combined is None
+    application = Application(FakeBot([]))
+    for text in ["well bye", "so so"]:
+        update = make_update(1, text=text)
+        assert handler.check_update(update)
+        asyncio.run(handler.handle_update(update, application))
+    assert [(name, match.group()) for name, match in handled] == [
+        ("bye", "bye"),
+        ("repeat", "so so"),
+    ]
+
+
+def test_numbered_back_references():
+    handled = []
+    handler = PatternHandler(
+        [
+            (r"(a)b", recorder("ab", handled)),
+            (r"(x)\1", recorder("xx", handled)),
+            (r"(?(1)never)(y)", recorder("y", handled)),
+            (r"z", recorder("z", handled)),
+        ]
+    )
+    # The routes without numbered references are still combined
+    assert handler._separate == [1, 2]
+    application = Application(FakeBot([]))
+    for text in ["xx", "ab xx", "xx ab", "y z", "z y", "x"]:
+        update = make_update(1, text=text)
+        if handler.check_update(update):
+            asyncio.run(handler.handle_update(update, application))
+    assert [(name, match.group(1) if name != "z" else None) for name, match in handled] == [
+        ("xx", "x"),
+        ("ab", "a"),
+        ("xx", "x"),
+        ("y", "y"),
+        ("z", None),
+    ]
+
+
+def test_keyword_routes():
+    handled = []
+    handler = PatternHandler(
+        [
+            (["hi", "hello", "xin chào"], recorder("greeting", handled)),
+            (["giá vé", "giá vé cáp treo", "price"], recorder("price", handled)),
+            ("hotline", recorder("hotline", handled)),
+        ],
+        keywords=True,
+    )
+    application = Application(FakeBot([]))
+    texts = ["Xin chào!", "Giá vé cáp treo bao nhiêu?", "this is it", "the price, hi", "hotlines"]
+    for text in texts:
+        update = make_update(1, text=text)
+        if handler.check_update(update):
+            asyncio.run(handler.handle_update(update, application))
+
+    assert [(name, match.group()) for name, match in handled] == [
+        ("greeting", "Xin chào"),
+        ("price", "Giá vé cáp treo"),
+        ("price", "price"),
+    ]
+
+
+def test_keywords_matching_beyond_lower_case():
+    handled = []
+    handler = PatternHandler(
+        [("status", recorder("status", handled)), ("kelvin", recorder("kelvin", handled))],
+        keywords=True,
+    )
+    application = Application(FakeBot([]))
+    # Long s and the Kelvin sign match "s" and "k", but lower() keeps them as they are
+    for text in ["ſtatus?", "200 \u212aelvin", "STATUS"]:
+        update = make_update(1, text=text)
+        assert handler.check_update(update)
+        asyncio.run(handler.handle_update(update, application))
+    assert [name for name, _ in handled] == ["status", "kelvin", "status"]
+
+
+def test_empty_routes():
+    with pytest.raises(ValueError):
+        PatternHandler([])
+
+
+def test_dispatched_by_application():
+    handled = []
+    application = Application(FakeBot([]))
+    application.add_handler(
+        PatternHandler([(["hello"], recorder("greeting", handled))], keywords=True)
+    )
+    asyncio.run(application.process_update(make_update(1, text="hello there")))
+    assert [name for name, _ in handled] == ["greeting"]
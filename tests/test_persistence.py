@@ -0,0 +1,216 @@
+import asyncio
+import datetime
+import time
+
+import pytest
+
+from fakes import FakeBot
+from zalo_bot import Chat, Message, Update, User
+from zalo_bot.ext import (
+    Application,
+    BasePersistence,
+    InMemoryPersistence,
+    MessageHandler,
+    SQLitePersistence,
+    filters,
+)
+
+
+def make_update(update_id, user_id="u1", chat_id="c1"):
+    message = Message(
+        message_id=str(update_id),
+        date=datetime.datetime.now(),
+        chat=Chat(id=chat_id, chat_type="PRIVATE"),
+        text="hi",
+        from_user=User(id=user_id),
+    )
+    return Update(message=message, update_id=update_id)
+
+
+def count(update, context):
+    context.user_data["count"] = context.user_data.get("count", 0) + 1
+    context.chat_data.setdefault("users", []).append(update.effective_user.id)
+    context.bot_data["total"] = context.bot_data.get("total", 0) + 1
+
+
+def test_data_is_kept_between_updates():
+    persistence = InMemoryPersistence()
+    application = Application(FakeBot([]), persistence=persistence)
+    application.add_handler(MessageHandler(filters.TEXT, count))
+
+    async def main():
+        for update_id, user_id in enumerate(["u1", "u2", "u1"]):
+            await application.process_update(make_update(update_id, user_id))
+        await application.update_persistence()
+        return (
+            await persistence.get_data(("user", "u1")),
+            await persistence.get_data(("chat", "c1")),
+            await persistence.get_data(("bot", "")),
+        )
+
+    assert asyncio.run(main()) == ({"count": 2}, {"users": ["u1", "u2", "u1"]}, {"total": 3})
+
+
+def test_in_memory_lru_and_ttl():
+    async def main():
+        persistence = InMemoryPersistence(max_entries=2, ttl=0.05)
+        await persistence.update_data({("user", "a"): {"a": 1}, ("user", "b"): {"b": 1}})
+        await persistence.get_data(("user", "a"))
+        await persistence.update_data({("user", "c"): {}})
+        assert await persistence.get_data(("user", "b")) is None
+        assert await persistence.get_data(("user", "a")) == {"a": 1}
+        await asyncio.sleep(0.06)
+        assert await persistence.get_data(("user", "a")) is None
+        assert len(persistence) == 1
+
+    asyncio.run(main())
+    with pytest.raises(ValueError):
+        InMemoryPersistence(ttl=0)
+
+
+def test_sqlite_survives_restart(tmp_path):
+    path = tmp_path / "state.sqlite"
+
+    async def run(updates):
+        application = Application(FakeBot([]), persistence=SQLitePersistence(path))
+        application.add_handler(MessageHandler(filters.TEXT, count))
+        for update_id in range(updates):
+            await application.process_update(make_update(update_id))
+        await application._stop_persistence()
+
+    asyncio.run(run(2))
+    asyncio.run(run(1))
+
+    async def read():
+        persistence = SQLitePersistence(path, json_codec="json")
+        try:
+            return await persistence.get_data(("user", "u1")), await persistence.get_data(
+                ("user", "u2")
+            )
+        finally:
+            await persistence.close()
+
+    assert asyncio.run(read()) == ({"count": 3}, None)
+
+
+class SlowPersistence(InMemoryPersistence):
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    async def update_data(self, entries):
+        await asyncio.sleep(0.2)
+        self.batches.append(sorted(entries))
+        await super().update_data(entries)
+
+
+def test_writes_are_batched_in_the_background():
+    persistence = SlowPersistence()
+    application = Application(FakeBot([]), persistence=persistence, persistence_interval=0.05)
+    application.add_handler(MessageHandler(filters.TEXT, count))
+
+    async def main():
+        application._start_persistence()
+        start = time.perf_counter()
+        for update_id in range(50):
+            await application.process_update(make_update(update_id, f"u{update_id % 5}"))
+        elapsed = time.perf_counter() - start
+        await application._stop_persistence()
+        return elapsed
+
+    assert asyncio.run(main()) < 0.1
+    assert len(persistence.batches) == 1
+    assert len(persistence.batches[0]) == 7
+    assert (asyncio.run(persistence.get_data(("user", "u0")))) == {"count": 10}
+
+
+def test_failed_writes_are_retried(caplog):
+    class FailingOnce(InMemoryPersistence):
+        failed = False
+
+        async def update_data(self, entries):
+            if not self.failed:
+                self.failed = True
+                raise OSError("disk full")
+            await super().update_data(entries)
+
+    persistence = FailingOnce()
+    application = Application(FakeBot([]), persistence=persistence)
+    application.add_handler(MessageHandler(filters.TEXT, count))
+
+    async def main():
+        await application.process_update(make_update(1))
+        await application.update_persistence()
+        await application.update_persistence()
+        return await persistence.get_data(("user", "u1"))
+
+    assert asyncio.run(main()) == {"count": 1}
+    assert issubclass(InMemoryPersistence, BasePersistence)
+
+
+def test_stopping_during_a_write_loses_nothing():
+    persistence = SlowPersistence()
+    application = Application(FakeBot([]), persistence=persistence, persistence_interval=0.01)
+    application.add_handler(MessageHandler(filters.TEXT, count))
+
+    async def main():
+        application._start_persistence()
+        await application.process_update(make_update(1, "u1"))
+        # The background flush is writing now
+        await asyncio.sleep(0.05)
+        await application.process_update(make_update(2, "u2"))
+        await application._stop_persistence()
+
+    asyncio.run(main())
+    # The first write finished before the final one, which only holds what changed since
+    assert persistence.batches == [
+        [("bot", ""), ("chat", "c1"), ("user", "u1")],
+        [("bot", ""), ("chat", "c1"), ("user", "u2")],
+    ]
+    assert asyncio.run(persistence.get_data(("user", "u1"))) == {"count": 1}
+
+
+def test_cancelled_write_is_retried():
+    persistence = SlowPersistence()
+    application = Application(FakeBot([]), persistence=persistence)
+    application.add_handler(MessageHandler(filters.TEXT, count))
+
+    async def main():
+        await application.process_update(make_update(1))
+        flush = asyncio.ensure_future(application.update_persistence())
+        await asyncio.sleep(0.05)
+        flush.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await flush
+        await application.update_persistence()
+        return await persistence.get_data(("user", "u1"))
+
+    assert asyncio.run(main()) == {"count": 1}
+
+
+def test_data_dropped_during_a_write_stays_dropped():
+    class FailingSlowly(SlowPersistence):
+        async def update_data(self, entries):
+            if not self.batches:
+                self.batches.append(None)
+                await asyncio.sleep(0.1)
+                raise OSError("disk full")
+            await super().update_data(entries)
+
+    for persistence in (FailingSlowly(), SlowPersistence()):
+        application = Application(FakeBot([]), persistence=persistence)
+        application.add_handler(MessageHandler(filters.TEXT, count))
+
+        async def main():
+            await application.process_update(make_update(1))
+            flush = asyncio.ensure_future(application.update_persistence())
+            await asyncio.sleep(0.05)
+            await application.drop_user_data("u1")
+            await flush
+            await application.update_persistence()
+            return await persistence.get_data(("user", "u1")), await persistence.get_data(
+                ("chat", "c1")
+            )
+
+        assert asyncio.run(main()) == (None, {"users": ["u1"]})
+
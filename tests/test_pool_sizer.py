@@ -0,0 +1,126 @@
+import asyncio
+
+from zalo_bot._utils.stats import Histogram
+from zalo_bot.error import TimedOut
+from zalo_bot.request import HTTPXRequest
+from zalo_bot.request._pool_sizer import PoolSizer
+
+
+def test_histogram_percentiles():
+    histogram = Histogram(bounds=(1, 2, 4, 8))
+    for value in (0.5, 1.5, 1.5, 3, 100):
+        histogram.observe(value)
+    assert histogram.percentile(50) == 2
+    assert histogram.percentile(100) == 100
+    assert histogram.snapshot()["count"] == 5
+    assert Histogram().percentile(50) is None
+
+
+def test_pool_sizer_grows_and_shrinks():
+    sizer = PoolSizer(2, 16, shrink_after=0)
+    assert sizer.request_started() is None
+    assert sizer.request_started() is None
+    assert sizer.request_started() == 4
+    # At most half of the connections in use for a whole window
+    assert [sizer.request_finished(0.0, False) for _ in range(3)] == [None, 2, None]
+    assert sizer.size == 2
+    # A long pool wait or a pool timeout also triggers growth
+    sizer.request_started()
+    assert sizer.request_finished(1.0, False) == 4
+
+
+def serve(connections):
+    async def handle(reader, writer):
+        connections.append(writer)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = next(
+                    (
+                        int(line.split(b":")[1])
+                        for line in head.split(b"\r\n")
+                        if line.lower().startswith(b"content-length:")
+                    ),
+                    0,
+                )
+                await reader.readexactly(length)
+                await asyncio.sleep(0.05)
+                body = b'{"ok": true, "result": true}'
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    return asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+def test_adaptive_pool_under_burst():
+    connections = []
+
+    async def main():
+        server = await serve(connections)
+        port = server.sockets[0].getsockname()[1]
+        request = HTTPXRequest(connection_pool_size=1, max_connection_pool_size=8)
+        async with request:
+            results = await asyncio.gather(
+                *(request.post(f"http://127.0.0.1:{port}/sendMessage") for _ in range(16))
+            )
+            stats = request.pool_statistics()
+        server.close()
+        return results, stats
+
+    results, stats = asyncio.run(main())
+    assert results == [True] * 16
+    assert stats["pool_size"] == 8
+    assert stats["resizes"] >= 1
+    assert stats["in_flight"] == 0
+    assert stats["pool_wait"]["count"] == 16
+    assert len(connections) <= 8
+
+
+def test_resizing_keeps_connections():
+    connections = []
+
+    async def main():
+        server = await serve(connections)
+        url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/sendMessage"
+        request = HTTPXRequest(connection_pool_size=1, max_connection_pool_size=4)
+        request._pool_sizer = PoolSizer(1, 4, shrink_after=0)
+        async with request:
+            for _ in range(3):
+                # Grows to 4 connections, then shrinks once the burst is over
+                await asyncio.gather(*(request.post(url) for _ in range(4)))
+                await request.post(url)
+            stats = request.pool_statistics()
+            client = request._client
+        server.close()
+        return stats, client
+
+    stats, client = asyncio.run(main())
+    assert stats["resizes"] >= 4
+    # The warm connections were reused by every burst and closed on shutdown
+    assert len(connections) == 4
+    assert client.is_closed
+
+
+def test_pool_timeout_while_waiting_for_a_turn():
+    async def main():
+        server = await serve([])
+        url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/getMe"
+        request = HTTPXRequest(
+            connection_pool_size=1, max_connection_pool_size=1, pool_timeout=0.01
+        )
+        async with request:
+            results = await asyncio.gather(
+                request.post(url), request.post(url), return_exceptions=True
+            )
+            stats = request.pool_statistics()
+        server.close()
+        return results, stats
+
+    results, stats = asyncio.run(main())
+    assert results[0] is True
+    assert isinstance(results[1], TimedOut)
+    assert "Pool timeout" in results[1].message
+    assert stats["pool_timeouts"] == 1
+    assert stats["in_flight"] == 0
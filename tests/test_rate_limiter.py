@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from zalo_bot.error import RetryAfter
+from zalo_bot.ext import TokenBucketRateLimiter
+
+
+async def ok():
+    return True
+
+
+def test_per_chat_bucket_delays_instead_of_failing():
+    limiter = TokenBucketRateLimiter(
+        overall_max_rate=0, per_chat_max_rate=2, per_chat_time_period=0.1
+    )
+
+    async def run():
+        started = time.monotonic()
+        results = await asyncio.gather(
+            *(limiter.process_request(ok, (), {}, "sendMessage", {"chat_id": "a"}) for _ in range(6))
+        )
+        # A different chat is not throttled by chat "a"
+        await limiter.process_request(ok, (), {}, "sendMessage", {"chat_id": "b"})
+        return results, time.monotonic() - started
+
+    results, elapsed = asyncio.run(run())
+
+    assert all(results)
+    # 2 requests burst, the remaining 4 need 0.2s to refill
+    assert elapsed >= 0.18
+    stats = limiter.statistics()
+    assert stats["requests"] == 7
+    assert stats["delayed_requests"] == 4
+
+
+def test_retry_after_pauses_and_retries():
+    limiter = TokenBucketRateLimiter(max_retries=1)
+    calls = []
+
+    async def flaky():
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            raise RetryAfter(0.05)
+        return "done"
+
+    assert asyncio.run(limiter.process_request(flaky, (), {}, "sendMessage", {})) == "done"
+    assert calls[1] - calls[0] >= 0.05
+    assert limiter.statistics()["retry_after"] == 1
+
+    async def always_limited():
+        raise RetryAfter(0)
+
+    with pytest.raises(RetryAfter):
+        asyncio.run(limiter.process_request(always_limited, (), {}, "sendMessage", {}))
+
+
+def test_limiter_works_across_event_loops():
+    # Built outside of any event loop and used by two consecutive asyncio.run calls
+    limiter = TokenBucketRateLimiter(overall_max_rate=2, overall_time_period=0.05)
+
+    async def run():
+        return await asyncio.gather(
+            *(limiter.process_request(ok, (), {}, "sendMessage", {"chat_id": "a"}) for _ in range(4))
+        )
+
+    assert asyncio.run(run()) == [True] * 4
+    assert asyncio.run(run()) == [True] * 4
+
+
+def test_buckets_are_shared_between_threads():
+    # As by the *_sync methods of Bot, which run in a background event loop
+    limiter = TokenBucketRateLimiter(overall_max_rate=2, overall_time_period=0.1)
+    results = []
+
+    def run():
+        async def requests():
+            return await asyncio.gather(
+                *(limiter.process_request(ok, (), {}, "getMe", {}) for _ in range(4))
+            )
+
+        results.extend(asyncio.run(requests()))
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=run) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [True] * 8
+    # 2 at once, then one every 0.05 seconds
+    assert time.perf_counter() - start >= 0.29
+    assert limiter.statistics()["delayed_requests"] == 6
@@ -0,0 +1,26 @@
+from zalo_bot import Bot
+from zalo_bot._utils.default_value import DefaultValue
+from zalo_bot.request import RequestData
+from zalo_bot.request._request_parameter import RequestParameter
+
+
+def test_prepare_request_single_pass():
+    bot = Bot("123:abc")
+    data, parameters = bot._prepare_request(
+        {"chat_id": "c1", "text": DefaultValue("hi"), "reply_to_message_id": None},
+        api_kwargs={"extra": [1, 2]},
+    )
+    assert data == {"chat_id": "c1", "text": "hi", "extra": [1, 2]}
+    assert [(p.name, p.value) for p in parameters] == [
+        ("chat_id", "c1"),
+        ("text", "hi"),
+        ("extra", [1, 2]),
+    ]
+
+
+def test_views_are_cached():
+    request_data = RequestData([RequestParameter.from_input("ids", [1, 2])])
+    assert request_data.json_parameters is request_data.json_parameters
+    assert request_data.json_payload is request_data.json_payload
+    assert request_data.multipart_data is request_data.multipart_data
+    assert request_data.json_parameters == {"ids": "[1, 2]"}
@@ -0,0 +1,154 @@
+import asyncio
+
+import httpx
+import pytest
+
+from zalo_bot.error import BadRequest, Forbidden, TimedOut
+from zalo_bot.request import BaseRequest, HTTPXRequest, MetricsCollector, RequestData, RequestHook, RetryPolicy
+from zalo_bot.request._request_parameter import RequestParameter
+
+
+class ScriptedRequest(BaseRequest):
+    """Answers requests with the given responses or exceptions, then with a success."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def do_request(self, url, method, request_data=None, **kwargs):
+        if self.responses:
+            response = self.responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+        return 200, b'{"ok": true, "result": true}'
+
+
+class RecordingHook(RequestHook):
+    def __init__(self):
+        self.calls = []
+
+    def before_send(self, event):
+        self.calls.append(("before_send", event.endpoint, event.attempt))
+
+    def after_response(self, event):
+        self.calls.append(("after_response", event.status_code, event.bytes_received))
+
+    def on_error(self, event):
+        self.calls.append(("on_error", event.status_code, type(event.error)))
+
+
+def post(request, endpoint, request_data=None):
+    return asyncio.run(request.post(f"https://example.com/botTOKEN/{endpoint}", request_data))
+
+
+def test_hooks_see_every_attempt():
+    request = ScriptedRequest([TimedOut()])
+    request.retry_policy = RetryPolicy(base_delay=0)
+    hook = RecordingHook()
+    request.add_hook(hook)
+
+    assert post(request, "getMe") is True
+    assert hook.calls == [
+        ("before_send", "getMe", 1),
+        ("on_error", None, TimedOut),
+        ("before_send", "getMe", 2),
+        ("after_response", 200, 28),
+    ]
+
+    hook.calls.clear()
+    request.responses = [(400, b'{"ok": false, "description": "nope"}')]
+    with pytest.raises(BadRequest):
+        post(request, "sendMessage")
+    assert hook.calls == [("before_send", "sendMessage", 1), ("on_error", 400, BadRequest)]
+
+    request.remove_hook(hook)
+    assert request.hooks == ()
+    with pytest.raises(ValueError):
+        request.remove_hook(hook)
+
+
+def test_failing_hook_does_not_break_request():
+    class BrokenHook(RequestHook):
+        def before_send(self, event):
+            raise RuntimeError
+
+    request = ScriptedRequest([])
+    request.add_hook(BrokenHook())
+    assert post(request, "getMe") is True
+
+
+def test_metrics_collector():
+    request = ScriptedRequest([TimedOut(), (403, b'{"ok": false}')])
+    request.retry_policy = RetryPolicy(base_delay=0)
+    metrics = MetricsCollector()
+    request.add_hook(metrics)
+
+    with pytest.raises(Forbidden):
+        post(request, "getMe")
+    post(request, "getMe")
+    data = RequestData([RequestParameter.from_input("text", "hello")])
+    post(request, "sendMessage", data)
+
+    stats = metrics.statistics()
+    assert stats["getMe"]["requests"] == 3
+    assert stats["getMe"]["errors"] == 2
+    assert stats["getMe"]["retries"] == 1
+    assert stats["getMe"]["status_codes"] == {200: 1, 403: 1}
+    assert stats["getMe"]["latency"]["count"] == 3
+    assert stats["sendMessage"]["bytes_sent"] == len(b"text=hello")
+    assert stats["sendMessage"]["bytes_received"] == 28
+    assert metrics.percentile("sendMessage", 99) is not None
+    assert metrics.percentile("getChat", 99) is None
+
+    metrics.reset()
+    assert metrics.statistics() == {}
+
+
+@pytest.mark.parametrize("body_format", ["form", "json"])
+def test_bytes_sent_is_the_size_of_the_body(body_format):
+    bodies = []
+
+    def handler(request):
+        bodies.append(request.read())
+        return httpx.Response(200, json={"ok": True, "result": True})
+
+    async def main():
+        request = HTTPXRequest(
+            body_format=body_format, httpx_kwargs={"transport": httpx.MockTransport(handler)}
+        )
+        metrics = MetricsCollector()
+        request.add_hook(metrics)
+        data = RequestData(
+            [
+                RequestParameter.from_input("chat_id", "c1"),
+                RequestParameter.from_input("text", "xin chào & hi"),
+            ]
+        )
+        async with request:
+            await request.post("https://example.com/botX/sendMessage", data)
+        return metrics.statistics()["sendMessage"], data
+
+    stats, data = asyncio.run(main())
+    assert stats["bytes_sent"] == len(bodies[0])
+    # Form bodies are never encoded as JSON
+    assert (data._json_payload is None) is (body_format == "form")
+
+
+def test_bytes_sent_is_computed_on_demand():
+    sizes = []
+
+    class CountingRequest(ScriptedRequest):
+        def _request_size(self, request_data):
+            sizes.append(request_data)
+            return super()._request_size(request_data)
+
+    request = CountingRequest([])
+    request.add_hook(RecordingHook())
+    post(request, "getMe")
+    assert sizes == []
@@ -0,0 +1,67 @@
+import asyncio
+import logging
+
+import pytest
+
+from zalo_bot import Bot
+from zalo_bot.request import BaseRequest, RequestLogger
+
+TOKEN = "123:secret-token"
+
+
+class EchoRequest(BaseRequest):
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def do_request(self, url, method, request_data=None, **kwargs):
+        url = f"https://example.com/bot{TOKEN}/file"
+        return 200, f'{{"ok": true, "result": {{"url": "{url}"}}}}'.encode()
+
+
+def call(bot, data):
+    return asyncio.run(bot._post("sendMessage", data))
+
+
+def records(caplog):
+    return [record for record in caplog.records if hasattr(record, "endpoint")]
+
+
+def test_request_logging_truncates_and_redacts(caplog):
+    bot = Bot(TOKEN, request=EchoRequest(), request_logger=RequestLogger(max_length=100))
+    with caplog.at_level(logging.DEBUG):
+        call(bot, {"chat_id": "1", "text": "x" * 100_000})
+
+    request_record, response_record = records(caplog)
+    assert request_record.endpoint == "sendMessage"
+    assert request_record.direction == "request"
+    assert len(request_record.getMessage()) < 200
+    assert response_record.direction == "response"
+    assert TOKEN not in response_record.getMessage()
+    assert "<redacted>" in response_record.getMessage()
+
+
+def test_request_logging_is_skipped(caplog):
+    bot = Bot(TOKEN, request=EchoRequest(), request_logger=RequestLogger(sample_rate=0))
+    with caplog.at_level(logging.DEBUG):
+        call(bot, {"chat_id": "1", "text": "hi"})
+    assert not records(caplog)
+
+    # Not enabled for the level: nothing is sampled, let alone formatted
+    logger = logging.getLogger("test_request_logger")
+    logger.setLevel(logging.INFO)
+    assert RequestLogger(logger).sample() is False
+    assert RequestLogger(logger, level=logging.INFO).sample() is True
+
+
+def test_request_logger_arguments():
+    with pytest.raises(ValueError, match="sample_rate"):
+        RequestLogger(sample_rate=2)
+    with pytest.raises(ValueError, match="max_length"):
+        RequestLogger(max_length=0)
+    logger = RequestLogger(secrets=["a"])
+    logger.add_secret("b")
+    logger.add_secret("a")
+    assert logger.secrets == ("a", "b")
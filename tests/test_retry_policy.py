@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from zalo_bot.error import BadRequest, NetworkError, TimedOut
+from zalo_bot.request import BaseRequest, RetryPolicy
+
+
+class ScriptedRequest(BaseRequest):
+    """Answers requests with the given exceptions or ``(code, payload)`` responses, then with a
+    successful response."""
+
+    def __init__(self, failures, unsent=False):
+        self.failures = list(failures)
+        self.unsent = unsent
+        self.calls = 0
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    def _is_unsent_error(self, exc):
+        return self.unsent
+
+    async def do_request(self, url, method, request_data=None, **kwargs):
+        self.calls += 1
+        if self.failures:
+            failure = self.failures.pop(0)
+            if isinstance(failure, tuple):
+                return failure
+            raise failure
+        return 200, b'{"ok": true, "result": true}'
+
+
+def post(request, endpoint):
+    return asyncio.run(request.post(f"https://example.com/botTOKEN/{endpoint}"))
+
+
+def test_idempotent_endpoint_is_retried():
+    request = ScriptedRequest([TimedOut(), NetworkError("Bad Gateway")])
+    request.retry_policy = RetryPolicy(base_delay=0)
+
+    assert post(request, "getMe") is True
+    assert request.calls == 3
+    assert request.retry_policy.statistics()["retries"] == 2
+
+
+def test_gateway_error_page_is_retried():
+    page = (502, b"<html><body>502 Bad Gateway</body></html>")
+    request = ScriptedRequest([page])
+    request.retry_policy = RetryPolicy(base_delay=0)
+    assert post(request, "getMe") is True
+    assert request.calls == 2
+
+    request = ScriptedRequest([page])
+    request.retry_policy = RetryPolicy(base_delay=0)
+    with pytest.raises(NetworkError, match="502"):
+        post(request, "sendMessage")
+
+
+def test_write_is_only_retried_if_unsent():
+    request = ScriptedRequest([TimedOut()])
+    request.retry_policy = RetryPolicy(base_delay=0)
+    with pytest.raises(TimedOut):
+        post(request, "sendMessage")
+    assert request.calls == 1
+
+    request = ScriptedRequest([TimedOut()], unsent=True)
+    request.retry_policy = RetryPolicy(base_delay=0)
+    assert post(request, "sendMessage") is True
+    assert request.calls == 2
+
+
+def test_bad_request_attempts_and_budget():
+    request = ScriptedRequest([BadRequest("nope")])
+    request.retry_policy = RetryPolicy(base_delay=0)
+    with pytest.raises(BadRequest):
+        post(request, "getMe")
+
+    request = ScriptedRequest([TimedOut()] * 3)
+    request.retry_policy = RetryPolicy(base_delay=0, max_attempts=2)
+    with pytest.raises(TimedOut):
+        post(request, "getMe")
+    assert request.calls == 2
+    assert request.retry_policy.statistics()["attempts_exhausted"] == 1
+
+    request = ScriptedRequest([TimedOut()] * 3)
+    request.retry_policy = RetryPolicy(base_delay=0, retry_budget=1)
+    with pytest.raises(TimedOut):
+        post(request, "getMe")
+    assert request.calls == 2
+    assert request.retry_policy.statistics()["budget_exhausted"] == 1
+
+
+def test_backoff_is_capped():
+    policy = RetryPolicy(base_delay=1, multiplier=10, max_delay=5, jitter=False)
+    assert [policy.get_delay(attempt) for attempt in (1, 2, 3)] == [1, 5, 5]
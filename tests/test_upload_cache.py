@@ -0,0 +1,143 @@
+import asyncio
+import io
+import json
+import threading
+
+import pytest
+
+from zalo_bot import Bot, InputFile
+from zalo_bot.request import BaseRequest, UploadCache
+
+
+class PhotoRequest(BaseRequest):
+    """Records whether each request uploaded a file and answers like sendPhoto."""
+
+    def __init__(self):
+        self.uploads = []
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def do_request(self, url, method, request_data=None, **kwargs):
+        if url.endswith("/getMe"):
+            return 200, b'{"ok": true, "result": {"id": "1"}}'
+        self.uploads.append(request_data.contains_files)
+        photo = request_data.parameters.get("photo", "https://cdn.example.com/banner.jpg")
+        return 200, (
+            '{"ok": true, "result": {"message_id": "m", "date": 0, "chat": {"id": "c"}, '
+            f'"photo_url": "{photo}"}}}}'
+        ).encode()
+
+
+def test_repeated_sends_upload_once(tmp_path):
+    banner = tmp_path / "banner.jpg"
+    banner.write_bytes(b"jpeg data")
+    request = PhotoRequest()
+    bot = Bot("123:abc", request=request, upload_cache=UploadCache())
+
+    async def main():
+        await bot.send_photo("c", "hi", InputFile(banner))
+        await bot.send_photo("c", "hi", InputFile(banner))
+        # Same content, different object
+        await bot.send_photo("c", "hi", InputFile(b"jpeg data"))
+        await bot.send_photo("c", "hi", InputFile(b"other data"))
+
+    asyncio.run(main())
+    assert request.uploads == [True, False, False, True]
+    assert bot._upload_cache.statistics() == {"entries": 2, "hits": 2, "misses": 2}
+
+
+def test_broadcast_uploads_with_first_message():
+    request = PhotoRequest()
+    bot = Bot("123:abc", request=request, upload_cache=UploadCache())
+
+    async def main():
+        photo = InputFile(b"jpeg data", filename="banner.jpg")
+        return [r async for r in bot.send_photo_many(["a", "b", "c"], "hi", photo)]
+
+    results = asyncio.run(main())
+    assert all(result.ok for result in results)
+    assert request.uploads == [True, False, False]
+
+
+def test_lru_and_persistence(tmp_path):
+    path = tmp_path / "uploads.json"
+    cache = UploadCache(max_size=2, path=path)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.get("a")
+    cache.put("c", "3")
+    assert cache.get("b") is None
+
+    restored = UploadCache(path=path)
+    assert (restored.get("a"), restored.get("c")) == ("1", "3")
+    assert len(restored) == 2
+
+    path.write_text("not json")
+    assert len(UploadCache(path=path)) == 0
+    with pytest.raises(ValueError):
+        UploadCache(max_size=0)
+
+
+def test_digest_of_handles():
+    cache = UploadCache()
+    handle = io.BytesIO(b"data")
+    handle.seek(2)
+    digest = cache.digest(InputFile(handle, read_file_handle=False))
+    assert digest == cache.digest(InputFile(b"data"))
+    assert handle.tell() == 2
+
+
+class RecordingCache(UploadCache):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.writes = []
+        self.hash_threads = []
+
+    def _write(self, text):
+        self.writes.append(json.loads(text))
+        super()._write(text)
+
+    def _hash_file(self, path):
+        self.hash_threads.append(threading.current_thread())
+        return super()._hash_file(path)
+
+
+def test_saves_are_batched_and_off_the_event_loop(tmp_path):
+    path = tmp_path / "uploads.json"
+    cache = RecordingCache(path=path, save_delay=0.01)
+
+    async def main():
+        cache.put("a", "1")
+        cache.put("b", "2")
+        assert cache.writes == [] and not path.exists()
+        await asyncio.sleep(0.1)
+        cache.put("c", "3")
+        # flush doesn't wait for the delay
+        await cache.flush()
+        await cache.flush()
+
+    asyncio.run(main())
+    assert cache.writes == [{"a": "1", "b": "2"}, {"a": "1", "b": "2", "c": "3"}]
+    assert json.loads(path.read_text()) == cache.writes[-1]
+
+
+def test_bot_shutdown_saves_entries_and_files_are_hashed_in_a_thread(tmp_path):
+    banner = tmp_path / "banner.jpg"
+    banner.write_bytes(b"jpeg data")
+    cache = RecordingCache(path=tmp_path / "uploads.json", save_delay=3600)
+    bot = Bot("123:abc", request=PhotoRequest(), upload_cache=cache)
+
+    async def main():
+        async with bot:
+            await bot.send_photo("c", "hi", InputFile(banner))
+            await bot.send_photo("c", "hi", InputFile(banner))
+            assert cache.writes == []
+
+    asyncio.run(main())
+    assert len(cache.writes) == 1
+    assert cache.hash_threads and threading.main_thread() not in cache.hash_threads
+    assert len(cache.hash_threads) == 1
@@ -0,0 +1,104 @@
+import asyncio
+import json
+
+import httpx
+
+from zalo_bot import Bot
+from zalo_bot.ext._webhook_server import WebhookServer
+from zalo_bot.request import JSONCodec
+
+UPDATE = {
+    "event_name": "message.text.received",
+    "message": {"message_id": "m1", "date": 0, "chat": {"id": "c1"}, "text": "hi"},
+}
+
+
+async def post_updates(secret_token, requests, queue_size=0):
+    queue = asyncio.Queue(queue_size)
+    server = WebhookServer(
+        "127.0.0.1", 0, "hook", queue, bot=None, secret_token=secret_token
+    )
+    await server.start()
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{server.port}") as client:
+            codes = [
+                (await client.request(method, path, headers=headers, **kwargs)).status_code
+                for method, path, headers, kwargs in requests
+            ]
+    finally:
+        await server.stop()
+    return codes, [queue.get_nowait() for _ in range(queue.qsize())]
+
+
+def test_webhook_server_queues_valid_updates():
+    good = {"X-Bot-Api-Secret-Token": "s3cret"}
+    codes, updates = asyncio.run(
+        post_updates(
+            "s3cret",
+            [
+                ("POST", "/hook", good, {"json": UPDATE}),
+                ("POST", "/hook", good, {"json": {"ok": True, "result": UPDATE}}),
+                ("POST", "/hook", {"X-Bot-Api-Secret-Token": "wrong"}, {"json": UPDATE}),
+                ("POST", "/other", good, {"json": UPDATE}),
+                ("GET", "/hook", good, {}),
+                ("POST", "/hook", good, {"content": b"not json"}),
+            ],
+        )
+    )
+
+    assert codes == [200, 200, 403, 404, 405, 400]
+    assert [update.message.text for update in updates] == ["hi", "hi"]
+
+
+def test_full_queue_is_answered_right_away():
+    good = {"X-Bot-Api-Secret-Token": "s3cret"}
+    codes, updates = asyncio.run(
+        post_updates("s3cret", [("POST", "/hook", good, {"json": UPDATE})] * 3, queue_size=2)
+    )
+    assert codes == [200, 200, 503]
+    assert len(updates) == 2
+
+
+def test_no_update_is_queued_after_stop():
+    body = json.dumps(UPDATE).encode()
+    request = (
+        b"POST /hook HTTP/1.1\r\nHost: x\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)
+    )
+
+    async def main():
+        queue = asyncio.Queue()
+        server = WebhookServer("127.0.0.1", 0, "hook", queue, bot=None)
+        await server.start()
+        idle_reader, idle_writer = await asyncio.open_connection("127.0.0.1", server.port)
+        busy_reader, busy_writer = await asyncio.open_connection("127.0.0.1", server.port)
+        idle_writer.write(request)
+        first = await idle_reader.readuntil(b"\r\n\r\n")
+        # A request that is still being received while the server stops
+        busy_writer.write(request[:-5])
+        await asyncio.sleep(0.05)
+
+        stopping = asyncio.ensure_future(server.stop())
+        await asyncio.sleep(0.05)
+        busy_writer.write(request[-5:])
+        busy_response = await asyncio.wait_for(busy_reader.read(), 1)
+        await asyncio.wait_for(stopping, 1)
+
+        # The idle keep-alive connection was closed
+        idle_writer.write(request)
+        second = await asyncio.wait_for(idle_reader.read(), 1)
+        for writer in (idle_writer, busy_writer):
+            writer.close()
+        return first, second, busy_response, queue.qsize()
+
+    first, second, busy_response, queued = asyncio.run(main())
+    assert first.startswith(b"HTTP/1.1 200")
+    assert second == b""
+    assert busy_response.startswith(b"HTTP/1.1 503")
+    assert b"Connection: close" in busy_response
+    assert queued == 1
+
+
+def test_requests_are_decoded_with_the_bot_codec():
+    codec = JSONCodec()
+    server = WebhookServer("127.0.0.1", 0, "hook", None, bot=Bot("123:abc", json_codec=codec))
+    assert server._json_codec is codec
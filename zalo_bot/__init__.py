@@ -22,6 +22,7 @@ __all__ = [
     "Message",
     "Chat",
     "Update",
+    "BroadcastResult",
 ]
 
 from . import request
@@ -42,6 +43,7 @@ from ._message import Message
 from ._chat import Chat
 
 from ._update import Update
+from ._broadcast import BroadcastResult
 
 
 def __version__():
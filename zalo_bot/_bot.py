@@ -1,10 +1,15 @@
 import asyncio
+import contextlib
 from copy import copy
 from types import TracebackType
 from typing import (
+    TYPE_CHECKING,
     Any,
     AsyncContextManager,
+    AsyncIterator,
+    Coroutine,
     Dict,
+    Iterable,
     List,
     Optional,
     Sequence,
@@ -15,9 +20,13 @@ from typing import (
     cast,
 )
 from zalo_bot import request
+from zalo_bot._broadcast import BroadcastResult
+from zalo_bot._files.input_file import InputFile
 from zalo_bot._files.input_media import InputMedia, InputPaidMedia
 from zalo_bot._update import Update
 from zalo_bot._utils.default_value import DEFAULT_NONE, DefaultValue
+from zalo_bot._utils.event_loop import BackgroundEventLoop
+from zalo_bot._utils.json_codec import JSONCodec, get_json_codec
 from zalo_bot._utils.logging import get_logger
 from zalo_bot._utils.types import JSONDict, ODVInput
 from zalo_bot._webhook import Webhook
@@ -28,25 +37,84 @@ from zalo_bot.error import InvalidToken
 from zalo_bot.request._base_request import BaseRequest
 from zalo_bot.request._httpx_request import HTTPXRequest
 from zalo_bot.request._request_data import RequestData
+from zalo_bot.request._request_logger import RequestLogger
 from zalo_bot.request._request_parameter import RequestParameter
+from zalo_bot.request._retry_policy import RetryPolicy
+from zalo_bot.request._upload_cache import UploadCache
 from zalo_bot.warnings import PTBDeprecationWarning
 from zalo_bot._message import Message
 
+if TYPE_CHECKING:
+    from zalo_bot.ext import BaseRateLimiter
 
 BT = TypeVar("BT", bound="Bot")
+RT = TypeVar("RT")
 
 
 class Bot(ZaloObject, AsyncContextManager["Bot"]):
+    """This object represents a Zalo Bot.
+
+    Args:
+        token (:obj:`str`): Bot's unique authentication token.
+        base_url (:obj:`str`, optional): Zalo Bot API service URL.
+        rate_limiter (:class:`zalo_bot.ext.BaseRateLimiter`, optional): A rate limiter all
+            requests are passed through.
+        json_codec (:obj:`str` | :class:`zalo_bot.request.JSONCodec`, optional): Codec for
+            encoding requests and decoding responses, see :class:`zalo_bot.request.JSONCodec`.
+        request (:class:`zalo_bot.request.BaseRequest`, optional): Pre initialized
+            :class:`zalo_bot.request.BaseRequest` instance used for all requests except
+            :meth:`get_update`. Defaults to :class:`zalo_bot.request.HTTPXRequest` with a
+            :class:`~zalo_bot.request.RetryPolicy`.
+        get_updates_request (:class:`zalo_bot.request.BaseRequest`, optional): Like
+            :paramref:`request`, but only used for :meth:`get_update`.
+        request_logger (:class:`zalo_bot.request.RequestLogger`, optional): Logs the API calls.
+            Defaults to logging all calls at ``DEBUG`` level, truncated to 1000 characters. The
+            token is always redacted.
+        upload_cache (:class:`zalo_bot.request.UploadCache`, optional): If passed, files whose
+            content was uploaded before are referenced by the value the server returned for them
+            instead of being uploaded again.
+    """
+
     _LOGGER = get_logger(__name__)
 
+    # The URLs of these endpoints are built once per bot
+    _ENDPOINTS = (
+        "getMe",
+        "getUpdates",
+        "setWebhook",
+        "deleteWebhook",
+        "getWebhookInfo",
+        "sendMessage",
+        "sendPhoto",
+        "sendSticker",
+        "sendChatAction",
+    )
+
     __slots__ = (
         "_base_url",
+        "_endpoint_urls",
         "_request",
         "_token",
         "_initialized",
+        "_sync_loop",
+        "_sync_request",
+        "_rate_limiter",
+        "_json_codec",
+        "_request_logger",
+        "_upload_cache",
     )
 
-    def __init__(self, token: str, base_url: str = BASE_URL) -> None:
+    def __init__(
+        self,
+        token: str,
+        base_url: str = BASE_URL,
+        rate_limiter: Optional["BaseRateLimiter"] = None,
+        json_codec: Optional[Union[str, JSONCodec]] = None,
+        request: Optional[BaseRequest] = None,
+        get_updates_request: Optional[BaseRequest] = None,
+        request_logger: Optional[RequestLogger] = None,
+        upload_cache: Optional[UploadCache] = None,
+    ) -> None:
         super().__init__(api_kwargs=None)
         if not token:
             raise InvalidToken(
@@ -57,12 +125,44 @@ class Bot(ZaloObject, AsyncContextManager["Bot"]):
 
         self._token = token
         self._base_url: str = f"{base_url}/bot{self._token}"
+        self._endpoint_urls: Dict[str, str] = {
+            endpoint: f"{self._base_url}/{endpoint}" for endpoint in self._ENDPOINTS
+        }
 
+        self._json_codec: JSONCodec = get_json_codec(json_codec)
+        # Long polling gets its own connections, so that it never waits for a busy pool
         self._request: Tuple[BaseRequest, BaseRequest] = (
-            HTTPXRequest(),
-            HTTPXRequest(),
+            get_updates_request or self._build_default_request(),
+            request or self._build_default_request(),
         )
         self._initialized: bool = False
+        self._sync_loop: Optional[BackgroundEventLoop] = None
+        self._sync_request: Optional[BaseRequest] = None
+        self._rate_limiter: Optional["BaseRateLimiter"] = rate_limiter
+        self._request_logger: RequestLogger = request_logger or RequestLogger(self._LOGGER)
+        self._request_logger.add_secret(self._token)
+        self._upload_cache: Optional[UploadCache] = upload_cache
+
+    @property
+    def rate_limiter(self) -> Optional["BaseRateLimiter"]:
+        """:class:`zalo_bot.ext.BaseRateLimiter`: Optional. The rate limiter all requests of
+        this bot are passed through."""
+        return self._rate_limiter
+
+    def _build_default_request(self) -> BaseRequest:
+        return HTTPXRequest(retry_policy=RetryPolicy(), json_codec=self._json_codec)
+
+    @property
+    def request(self) -> BaseRequest:
+        """:class:`zalo_bot.request.BaseRequest`: The request object used for all API calls
+        except :meth:`get_update`, as passed via :paramref:`request`."""
+        return self._request[1]
+
+    @property
+    def json_codec(self) -> JSONCodec:
+        """:class:`zalo_bot.request.JSONCodec`: The codec used to encode request parameters and
+        to decode responses."""
+        return self._json_codec
 
     def _insert_defaults(self, data: Dict[str, object]) -> None:
         """Make ext.Defaults work by converting DefaultValue instances to normal values.
@@ -70,27 +170,57 @@ class Bot(ZaloObject, AsyncContextManager["Bot"]):
         This is necessary because shortcuts like Message.reply_text need to work for both
         Bot and ExtBot, so they have DEFAULT_NONE default values.
         """
-        # Set correct parse_mode for InputMedia objects and replace DefaultValue instances
         for key, val in data.items():
-            if isinstance(val, InputMedia):
-                # Copy object to avoid editing in-place
-                new = copy.copy(val)
-                with new._unfrozen():
-                    new.parse_mode = DefaultValue.get_value(new.parse_mode)
-                data[key] = new
-            elif (
-                key == "media"
-                and isinstance(val, Sequence)
-                and not isinstance(val[0], InputPaidMedia)
-            ):
-                # Copy objects to avoid editing in-place
-                copy_list = [copy.copy(media) for media in val]
-                for media in copy_list:
-                    with media._unfrozen():
-                        media.parse_mode = DefaultValue.get_value(media.parse_mode)
-                data[key] = copy_list
-            else:
-                data[key] = DefaultValue.get_value(val)
+            data[key] = self._insert_default(key, val)
+
+    @staticmethod
+    def _insert_default(key: str, val: object) -> object:
+        # Set correct parse_mode for InputMedia objects and replace DefaultValue instances
+        val = DefaultValue.get_value(val)
+        if isinstance(val, InputMedia):
+            # Copy object to avoid editing in-place
+            new = copy(val)
+            with new._unfrozen():
+                new.parse_mode = DefaultValue.get_value(new.parse_mode)
+            return new
+        if (
+            key == "media"
+            and isinstance(val, Sequence)
+            and val
+            and not isinstance(val[0], InputPaidMedia)
+        ):
+            # Copy objects to avoid editing in-place
+            copy_list = [copy(media) for media in val]
+            for media in copy_list:
+                with media._unfrozen():
+                    media.parse_mode = DefaultValue.get_value(media.parse_mode)
+            return copy_list
+        return val
+
+    def _prepare_request(
+        self, data: JSONDict, api_kwargs: Optional[JSONDict] = None
+    ) -> Tuple[JSONDict, List[RequestParameter]]:
+        """Turn the parameters of an API call into the data to send, in a single pass: defaults
+        are inserted, :paramref:`api_kwargs` are merged, :obj:`None` values are dropped (the
+        Bot API doesn't handle them well) and each remaining value is converted into a
+        :class:`~zalo_bot.request.RequestParameter`.
+
+        Returns:
+            Tuple[Dict[:obj:`str`, any], List[:class:`~zalo_bot.request.RequestParameter`]]: The
+            final parameters, e.g. for the rate limiter, and the request parameters built from
+            them.
+        """
+        if api_kwargs:
+            data = {**data, **api_kwargs}
+        final_data: JSONDict = {}
+        parameters = []
+        for key, value in data.items():
+            value = self._insert_default(key, value)
+            if value is None:
+                continue
+            final_data[key] = value
+            parameters.append(RequestParameter.from_input(key, value))
+        return final_data, parameters
 
     async def get_me(
         self,
@@ -243,36 +373,34 @@ class Bot(ZaloObject, AsyncContextManager["Bot"]):
     ) -> Any:
         # Return type is Union[bool, JSONDict, List[JSONDict]], but hard to tell mypy
         # which methods expect which return values, so use Any to avoid type: ignore
-        if data is None:
-            data = {}
-
-        # Insert defaults for ext.Defaults compatibility
-        self._insert_defaults(data)
-
-        # Insert api_kwargs in-place
-        if api_kwargs:
-            data.update(api_kwargs)
-
-        # Insert is in-place, so no return value for data
-        self._insert_defaults(data)
-
-        # Drop any None values because Zalo Bot doesn't handle them well
-        data = {key: value for key, value in data.items() if value is not None}
+        uploads = None
+        if self._upload_cache is not None and data:
+            data, uploads = await self._upload_cache.substitute(data)
+        data, parameters = self._prepare_request(data or {}, api_kwargs)
 
-        return await self._do_post(
+        result = await self._do_post(
             endpoint=endpoint,
             data=data,
+            request_data=RequestData(parameters=parameters, json_codec=self._json_codec),
             read_timeout=read_timeout,
             write_timeout=write_timeout,
             connect_timeout=connect_timeout,
             pool_timeout=pool_timeout,
         )
+        if uploads:
+            self._upload_cache.remember(uploads, result)  # type: ignore[union-attr]
+        return result
+
+    def _endpoint_url(self, endpoint: str) -> str:
+        # Subclasses may call endpoints that are not in _ENDPOINTS
+        return self._endpoint_urls.get(endpoint) or f"{self._base_url}/{endpoint}"
 
     async def _do_post(
         self,
         endpoint: str,
         data: JSONDict,
         *,
+        request_data: Optional[RequestData] = None,
         read_timeout: ODVInput[float] = DEFAULT_NONE,
         write_timeout: ODVInput[float] = DEFAULT_NONE,
         connect_timeout: ODVInput[float] = DEFAULT_NONE,
@@ -281,31 +409,41 @@ class Bot(ZaloObject, AsyncContextManager["Bot"]):
         # This also converts datetimes into timestamps.
         # We don't do this earlier so that _insert_defaults (see above) has a chance to convert
         # to the default timezone in case this is called by ExtBot
-        request_data = RequestData(
-            parameters=[
-                RequestParameter.from_input(key, value) for key, value in data.items()
-            ],
-        )
-
-        request = self._request[0] if endpoint == "getUpdates" else self._request[1]
-
-        self._LOGGER.debug(
-            "Calling Bot API endpoint `%s` with parameters `%s`", endpoint, data
-        )
+        if request_data is None:
+            request_data = RequestData(
+                parameters=[
+                    RequestParameter.from_input(key, value) for key, value in data.items()
+                ],
+                json_codec=self._json_codec,
+            )
 
-        result = await request.post(
-            url=f"{self._base_url}/{endpoint}",
-            request_data=request_data,
-            read_timeout=read_timeout,
-            write_timeout=write_timeout,
-            connect_timeout=connect_timeout,
-            pool_timeout=pool_timeout,
-        )
-        self._LOGGER.debug(
-            "Call to Bot API endpoint `%s` finished with return value `%s`",
-            endpoint,
-            result,
-        )
+        if self._sync_loop is not None and self._sync_loop.is_current():
+            request = self._sync_request
+        else:
+            request = self._request[0] if endpoint == "getUpdates" else self._request[1]
+
+        # Sampled once, so that request and response are either both logged or not at all
+        log = self._request_logger.sample()
+        if log:
+            self._request_logger.log_request(endpoint, data)
+
+        kwargs = {
+            "url": self._endpoint_url(endpoint),
+            "request_data": request_data,
+            "read_timeout": read_timeout,
+            "write_timeout": write_timeout,
+            "connect_timeout": connect_timeout,
+            "pool_timeout": pool_timeout,
+        }
+        # Long polling only waits for incoming updates, there is nothing to throttle
+        if self._rate_limiter is None or endpoint == "getUpdates":
+            result = await request.post(**kwargs)
+        else:
+            result = await self._rate_limiter.process_request(
+                callback=request.post, args=(), kwargs=kwargs, endpoint=endpoint, data=data
+            )
+        if log:
+            self._request_logger.log_response(endpoint, result)
 
         return result
 
@@ -323,6 +461,8 @@ class Bot(ZaloObject, AsyncContextManager["Bot"]):
         await asyncio.gather(
             self._request[0].initialize(), self._request[1].initialize()
         )
+        if self._rate_limiter:
+            await self._rate_limiter.initialize()
         # Since the bot is to be initialized only once, we can also use it for
         # verifying the token passed and raising an exception if it's invalid.
         try:
@@ -334,8 +474,9 @@ class Bot(ZaloObject, AsyncContextManager["Bot"]):
         self._initialized = True
 
     async def shutdown(self) -> None:
-        """Stop & clear resources used by this class. Currently just calls
-        :meth:`zalo_bot.request.BaseRequest.shutdown` for the request objects used by this bot.
+        """Stop & clear resources used by this class. Calls
+        :meth:`zalo_bot.request.BaseRequest.shutdown` for the request objects used by this bot
+        and saves the pending entries of the :paramref:`upload_cache`.
 
         .. seealso:: :meth:`initialize`
 
@@ -345,6 +486,10 @@ class Bot(ZaloObject, AsyncContextManager["Bot"]):
             return
 
         await asyncio.gather(self._request[0].shutdown(), self._request[1].shutdown())
+        if self._rate_limiter:
+            await self._rate_limiter.shutdown()
+        if self._upload_cache is not None:
+            await self._upload_cache.flush()
         self._initialized = False
 
     async def __aenter__(self: BT) -> BT:
@@ -411,43 +556,150 @@ class Bot(ZaloObject, AsyncContextManager["Bot"]):
         result = await self._post(endpoint, data)
         return Message.de_json(result, self)
 
-    async def _set_webhook_async(self, url: str, secret_token: str) -> bool:
-        """Internal async helper to set webhook."""
-        result = await self._post("setWebhook", {"url": url, "secret_token": secret_token})
+    async def set_webhook(
+        self,
+        url: str,
+        secret_token: str,
+        *,
+        read_timeout: ODVInput[float] = DEFAULT_NONE,
+        write_timeout: ODVInput[float] = DEFAULT_NONE,
+        connect_timeout: ODVInput[float] = DEFAULT_NONE,
+        pool_timeout: ODVInput[float] = DEFAULT_NONE,
+        api_kwargs: Optional[JSONDict] = None,
+    ) -> bool:
+        """Specify a URL to receive incoming updates via an outgoing webhook.
+
+        .. seealso:: :meth:`zalo_bot.ext.Application.run_webhook`, :meth:`set_webhook_sync`
+
+        Args:
+            url (:obj:`str`): HTTPS URL to send updates to.
+            secret_token (:obj:`str`): Sent in the header ``X-Bot-Api-Secret-Token`` of every
+                webhook request, so the receiver can verify that the request comes from the
+                Bot API.
+
+        Returns:
+            :obj:`bool`: On success, :obj:`True` is returned.
+
+        Raises:
+            :class:`zalo_bot.error.ZaloError`
+        """
+        result = await self._post(
+            "setWebhook",
+            {"url": url, "secret_token": secret_token},
+            read_timeout=read_timeout,
+            write_timeout=write_timeout,
+            connect_timeout=connect_timeout,
+            pool_timeout=pool_timeout,
+            api_kwargs=api_kwargs,
+        )
         return bool(result)
 
-    def set_webhook(self, url: str, secret_token: str) -> bool:
-        """Configure a webhook URL synchronously."""
-        return asyncio.run(self._set_webhook_async(url, secret_token))
+    async def delete_webhook(
+        self,
+        *,
+        read_timeout: ODVInput[float] = DEFAULT_NONE,
+        write_timeout: ODVInput[float] = DEFAULT_NONE,
+        connect_timeout: ODVInput[float] = DEFAULT_NONE,
+        pool_timeout: ODVInput[float] = DEFAULT_NONE,
+        api_kwargs: Optional[JSONDict] = None,
+    ) -> bool:
+        """Remove the webhook integration if you decide to switch back to
+        :meth:`get_update`.
+
+        .. seealso:: :meth:`delete_webhook_sync`
+
+        Returns:
+            :obj:`bool`: On success, :obj:`True` is returned.
 
-    async def _delete_webhook_async(self) -> bool:
-        """Delete webhook URL synchronously."""
-        result = await self._post("deleteWebhook")
+        Raises:
+            :class:`zalo_bot.error.ZaloError`
+        """
+        result = await self._post(
+            "deleteWebhook",
+            read_timeout=read_timeout,
+            write_timeout=write_timeout,
+            connect_timeout=connect_timeout,
+            pool_timeout=pool_timeout,
+            api_kwargs=api_kwargs,
+        )
         return bool(result)
-    
-    def delete_webhook(self) -> bool:
-        """Delete the webhook URL synchronously."""
-        return asyncio.run(self._delete_webhook_async())
-    
-    async def _get_webhook_info_async(self) -> Webhook:
-        """Get webhook information asynchronously."""
-        result = await self._post("getWebhookInfo")
+
+    async def get_webhook_info(
+        self,
+        *,
+        read_timeout: ODVInput[float] = DEFAULT_NONE,
+        write_timeout: ODVInput[float] = DEFAULT_NONE,
+        connect_timeout: ODVInput[float] = DEFAULT_NONE,
+        pool_timeout: ODVInput[float] = DEFAULT_NONE,
+        api_kwargs: Optional[JSONDict] = None,
+    ) -> Webhook:
+        """Get the current webhook status.
+
+        .. seealso:: :meth:`get_webhook_info_sync`
+
+        Returns:
+            :class:`zalo_bot.Webhook`
+
+        Raises:
+            :class:`zalo_bot.error.ZaloError`
+        """
+        result = await self._post(
+            "getWebhookInfo",
+            read_timeout=read_timeout,
+            write_timeout=write_timeout,
+            connect_timeout=connect_timeout,
+            pool_timeout=pool_timeout,
+            api_kwargs=api_kwargs,
+        )
         return Webhook.de_json(result, self)
-    
-    def get_webhook_info(self) -> Webhook:
-        """Get webhook information synchronously."""
-        return asyncio.run(self._get_webhook_info_async())
-    
+
+    def _run_sync(self, coroutine: Coroutine[Any, Any, RT]) -> RT:
+        if self._sync_loop is None:
+            self._sync_loop = BackgroundEventLoop()
+            # Connections are bound to the loop they were opened in, so the background loop
+            # gets its own client, configured like the one used by async code
+            self._sync_request = self._request[1]._copy_for_event_loop()
+        return self._sync_loop.run(coroutine)
+
+    def set_webhook_sync(self, url: str, secret_token: str) -> bool:
+        """Blocking version of :meth:`set_webhook` for use outside of an event loop, e.g. in
+        deployment scripts.
+
+        All ``*_sync`` methods of a bot run on the same background event loop and reuse the same
+        connection pool. Call :meth:`shutdown_sync` to release them.
+        """
+        return self._run_sync(self.set_webhook(url, secret_token))
+
+    def delete_webhook_sync(self) -> bool:
+        """Blocking version of :meth:`delete_webhook`. See :meth:`set_webhook_sync`."""
+        return self._run_sync(self.delete_webhook())
+
+    def get_webhook_info_sync(self) -> Webhook:
+        """Blocking version of :meth:`get_webhook_info`. See :meth:`set_webhook_sync`."""
+        return self._run_sync(self.get_webhook_info())
+
+    def shutdown_sync(self) -> None:
+        """Close the connection pool and background event loop used by the ``*_sync`` methods.
+        Does nothing if none of them was called."""
+        if self._sync_loop is None:
+            return
+        if self._sync_request is not self._request[1]:
+            self._sync_loop.run(self._sync_request.shutdown())  # type: ignore[union-attr]
+        self._sync_loop.close()
+        self._sync_loop = None
+        self._sync_request = None
+
     async def send_photo(
         self,
         chat_id: str,
         caption: str,
-        photo: str,
+        photo: Union[str, InputFile],
         *,
         reply_to_message_id: Optional[str] = None,
     ) -> Message:
         """
-        Send a photo to a chat.
+        Send a photo to a chat. :paramref:`photo` is a URL or a file to upload, which is only
+        uploaded once if an :paramref:`~zalo_bot.Bot.upload_cache` is set.
         """
         data: JSONDict = {
             "chat_id": chat_id,
@@ -478,6 +730,126 @@ class Bot(ZaloObject, AsyncContextManager["Bot"]):
             "sendSticker", data, reply_to_message_id=reply_to_message_id
         )
 
+    async def _send_many(
+        self, endpoint: str, chat_ids: Iterable[str], data: JSONDict, concurrency: int
+    ) -> AsyncIterator[BroadcastResult]:
+        """Send the same message to many chats, yielding a result per chat as soon as it is
+        available."""
+        if concurrency < 1:
+            raise ValueError("`concurrency` must be a positive integer.")
+
+        pending = iter(chat_ids)
+        if self._upload_cache is not None:
+            data, uploads = await self._upload_cache.substitute(data)
+            if uploads:
+                # Upload the files along with the first message only, so that the remaining
+                # messages can reference them
+                first_chat_id = next(pending, None)
+                if first_chat_id is None:
+                    return
+                prepared, parameters = self._prepare_request(data)
+                outcome, result = await self._send_one(
+                    endpoint, first_chat_id, prepared, parameters
+                )
+                if result is not None:
+                    self._upload_cache.remember(uploads, result)
+                    data, _ = await self._upload_cache.substitute(data)
+                yield outcome
+
+        # Converting the shared parameters is done once, only `chat_id` differs per request
+        data, shared_parameters = self._prepare_request(data)
+        results: asyncio.Queue = asyncio.Queue()
+        done = object()
+
+        async def send() -> None:
+            # All workers pull from the same iterator; `next` doesn't await, so this is safe
+            for chat_id in pending:
+                outcome, _ = await self._send_one(endpoint, chat_id, data, shared_parameters)
+                results.put_nowait(outcome)
+
+        workers = [asyncio.create_task(send()) for _ in range(concurrency)]
+        all_sent = asyncio.gather(*workers)
+        all_sent.add_done_callback(lambda _: results.put_nowait(done))
+        try:
+            while True:
+                outcome = await results.get()
+                if outcome is done:
+                    break
+                yield outcome
+        finally:
+            # Stop sending if the caller stopped iterating early
+            all_sent.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await all_sent
+
+    async def _send_one(
+        self,
+        endpoint: str,
+        chat_id: str,
+        data: JSONDict,
+        shared_parameters: List[RequestParameter],
+    ) -> Tuple[BroadcastResult, Optional[JSONDict]]:
+        request_data = RequestData(
+            parameters=[RequestParameter.from_input("chat_id", chat_id), *shared_parameters],
+            json_codec=self._json_codec,
+        )
+        try:
+            result = await self._do_post(
+                endpoint, {**data, "chat_id": chat_id}, request_data=request_data
+            )
+            return BroadcastResult(chat_id, Message.de_json(result, self), None), result
+        except Exception as exc:
+            return BroadcastResult(chat_id, None, exc), None
+
+    def send_message_many(
+        self, chat_ids: Iterable[str], text: str, *, concurrency: int = 8
+    ) -> AsyncIterator[BroadcastResult]:
+        """Send the same text message to many chats.
+
+        Messages are sent by up to :paramref:`concurrency` concurrent requests, which still pass
+        through the :attr:`rate_limiter`, if one is set. A failure for one chat does not abort
+        the others; it is reported in the corresponding result instead.
+
+        Example:
+            .. code:: python
+
+                async for result in bot.send_message_many(chat_ids, "Closed due to weather"):
+                    if not result.ok:
+                        logger.warning("Could not notify %s: %s", result.chat_id, result.error)
+
+        Args:
+            chat_ids (Iterable[:obj:`str`]): The chats to send the message to. Consumed lazily.
+            text (:obj:`str`): Text of the message.
+            concurrency (:obj:`int`, optional): Maximum number of requests in flight.
+                Defaults to ``8``.
+
+        Returns:
+            AsyncIterator[:class:`zalo_bot.BroadcastResult`]: One result per chat, in order of
+            completion.
+        """
+        return self._send_many("sendMessage", chat_ids, {"text": text}, concurrency)
+
+    def send_photo_many(
+        self,
+        chat_ids: Iterable[str],
+        caption: str,
+        photo: Union[str, InputFile],
+        *,
+        concurrency: int = 8,
+    ) -> AsyncIterator[BroadcastResult]:
+        """Send the same photo to many chats. See :meth:`send_message_many`. If
+        :paramref:`photo` is a file and an :paramref:`~zalo_bot.Bot.upload_cache` is set, it is
+        uploaded with the first message only."""
+        return self._send_many(
+            "sendPhoto", chat_ids, {"photo": photo, "caption": caption}, concurrency
+        )
+
+    def send_sticker_many(
+        self, chat_ids: Iterable[str], sticker: str, *, concurrency: int = 8
+    ) -> AsyncIterator[BroadcastResult]:
+        """Send the same sticker to many chats. See :meth:`send_message_many`."""
+        return self._send_many("sendSticker", chat_ids, {"sticker": sticker}, concurrency)
+
     async def send_chat_action(
         self,
         chat_id: Union[int, str],
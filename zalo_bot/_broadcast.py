@@ -0,0 +1,28 @@
+"""This module contains the result type of the bulk sending methods of :class:`zalo_bot.Bot`."""
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from zalo_bot import Message
+
+
+@dataclass(frozen=True)
+class BroadcastResult:
+    """Outcome of sending a message to one chat via e.g. :meth:`zalo_bot.Bot.send_message_many`.
+
+    Attributes:
+        chat_id (:obj:`str`): The chat the message was addressed to.
+        message (:class:`zalo_bot.Message`): Optional. The sent message, if sending succeeded.
+        error (:exc:`Exception`): Optional. The error raised while sending, if it failed.
+    """
+
+    __slots__ = ("chat_id", "error", "message")
+
+    chat_id: str
+    message: Optional["Message"]
+    error: Optional[Exception]
+
+    @property
+    def ok(self) -> bool:
+        """:obj:`bool`: Whether the message was sent successfully."""
+        return self.error is None
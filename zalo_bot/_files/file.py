@@ -1,15 +1,17 @@
 """This module contains an object that represents a Zalo Bot File."""
+import os
 import shutil
 import urllib.parse as urllib_parse
+import uuid
 from base64 import b64decode
 from pathlib import Path
-from typing import TYPE_CHECKING, BinaryIO, Optional
+from typing import TYPE_CHECKING, BinaryIO, Callable, Optional
 
 from zalo_bot._passport.credentials import decrypt
 from zalo_bot._zalo_object import ZaloObject
 from zalo_bot._utils.default_value import DEFAULT_NONE
 from zalo_bot._utils.files import is_local_file
-from zalo_bot._utils.types import FilePathInput, JSONDict, ODVInput
+from zalo_bot._utils.types import FilePathInput, JSONDict, ODVInput, ProgressCallback
 
 if TYPE_CHECKING:
     from zalo_bot import FileCredentials
@@ -96,10 +98,48 @@ class File(ZaloObject):
     def _prepare_decrypt(self, buf: bytes) -> bytes:
         return decrypt(b64decode(self._credentials.secret), b64decode(self._credentials.hash), buf)
 
+    async def _stream_to(
+        self,
+        write: Callable[[bytes], object],
+        progress: Optional[ProgressCallback],
+        max_size: Optional[int],
+        read_timeout: ODVInput[float],
+        write_timeout: ODVInput[float],
+        connect_timeout: ODVInput[float],
+        pool_timeout: ODVInput[float],
+    ) -> None:
+        """Download the file chunk by chunk and pass each chunk to :paramref:`write`."""
+        if max_size is not None and self.file_size is not None and self.file_size > max_size:
+            raise ValueError(
+                f"The file has {self.file_size} bytes, more than max_size={max_size}."
+            )
+
+        downloaded = 0
+        chunks = self.get_bot().request.stream(
+            self._get_encoded_url(),
+            read_timeout=read_timeout,
+            write_timeout=write_timeout,
+            connect_timeout=connect_timeout,
+            pool_timeout=pool_timeout,
+        )
+        try:
+            async for chunk in chunks:
+                downloaded += len(chunk)
+                if max_size is not None and downloaded > max_size:
+                    raise ValueError(f"The file has more than max_size={max_size} bytes.")
+                write(chunk)
+                if progress is not None:
+                    progress(downloaded, self.file_size)
+        finally:
+            # Releases the connection right away if we stopped early
+            await chunks.aclose()  # type: ignore[attr-defined]
+
     async def download_to_drive(
         self,
         custom_path: Optional[FilePathInput] = None,
         *,
+        progress: Optional[ProgressCallback] = None,
+        max_size: Optional[int] = None,
         read_timeout: ODVInput[float] = DEFAULT_NONE,
         write_timeout: ODVInput[float] = DEFAULT_NONE,
         connect_timeout: ODVInput[float] = DEFAULT_NONE,
@@ -121,6 +161,10 @@ class File(ZaloObject):
             original file in order to decrypt the file without changing the existing one
             in-place.
 
+            The file is streamed to disk chunk by chunk, so memory use doesn't grow with its
+            size. Encrypted files are the exception, as they can only be decrypted as a whole. If
+            the download fails, an existing file at the target path is left as it was.
+
         .. seealso:: :wiki:`Working with Files and Media <Working-with-Files-and-Media>`
 
         Args:
@@ -130,6 +174,11 @@ class File(ZaloObject):
                 is not set.
 
         Keyword Args:
+            progress (Callable[[:obj:`int`, :obj:`int` | :obj:`None`], any], optional): Called
+                after each chunk with the number of bytes downloaded so far and
+                :attr:`file_size`.
+            max_size (:obj:`int`, optional): Abort the download with a :exc:`ValueError` if the
+                file turns out to be larger than this many bytes.
             read_timeout (:obj:`float` | :obj:`None`, optional): Value to pass to
                 :paramref:`zalo_bot.request.BaseRequest.post.read_timeout`. Defaults to
                 :attr:`~zalo_bot.request.BaseRequest.DEFAULT_NONE`.
@@ -148,7 +197,6 @@ class File(ZaloObject):
 
         """
         local_file = is_local_file(self.file_path)
-        url = None if local_file else self._get_encoded_url()
 
         # if _credentials exists we want to decrypt the file
         if local_file and self._credentials:
@@ -174,22 +222,46 @@ class File(ZaloObject):
         else:
             filename = Path.cwd() / self.file_id
 
-        buf = await self.get_bot().request.retrieve(
-            url,
-            read_timeout=read_timeout,
-            write_timeout=write_timeout,
-            connect_timeout=connect_timeout,
-            pool_timeout=pool_timeout,
-        )
         if self._credentials:
-            buf = self._prepare_decrypt(buf)
-        filename.write_bytes(buf)
+            buf = bytearray()
+            await self._stream_to(
+                buf.extend,
+                progress,
+                max_size,
+                read_timeout,
+                write_timeout,
+                connect_timeout,
+                pool_timeout,
+            )
+            filename.write_bytes(self._prepare_decrypt(bytes(buf)))
+            return filename
+
+        # Stream into a temporary file next to the target, so that a failed download leaves an
+        # existing file at that path untouched
+        temp_file = filename.with_name(f".{filename.name}.{uuid.uuid4().hex[:8]}.part")
+        try:
+            with temp_file.open("xb") as out:
+                await self._stream_to(
+                    out.write,
+                    progress,
+                    max_size,
+                    read_timeout,
+                    write_timeout,
+                    connect_timeout,
+                    pool_timeout,
+                )
+            os.replace(temp_file, filename)
+        except BaseException:
+            temp_file.unlink(missing_ok=True)
+            raise
         return filename
 
     async def download_to_memory(
         self,
         out: BinaryIO,
         *,
+        progress: Optional[ProgressCallback] = None,
+        max_size: Optional[int] = None,
         read_timeout: ODVInput[float] = DEFAULT_NONE,
         write_timeout: ODVInput[float] = DEFAULT_NONE,
         connect_timeout: ODVInput[float] = DEFAULT_NONE,
@@ -206,11 +278,20 @@ class File(ZaloObject):
             If you want to immediately read the data from ``out`` after calling this method, you
             should call ``out.seek(0)`` first. See also :meth:`io.IOBase.seek`.
 
+        Note:
+            The file is written to :paramref:`out` chunk by chunk as it is downloaded, unless it
+            is encrypted. If the download fails, :paramref:`out` may contain part of the file.
+
         Args:
             out (:obj:`io.BufferedIOBase`): A file-like object. Must be opened for writing in
                 binary mode.
 
         Keyword Args:
+            progress (Callable[[:obj:`int`, :obj:`int` | :obj:`None`], any], optional): Called
+                after each chunk with the number of bytes downloaded so far and
+                :attr:`file_size`.
+            max_size (:obj:`int`, optional): Abort the download with a :exc:`ValueError` if the
+                file turns out to be larger than this many bytes.
             read_timeout (:obj:`float` | :obj:`None`, optional): Value to pass to
                 :paramref:`zalo_bot.request.BaseRequest.post.read_timeout`. Defaults to
                 :attr:`~zalo_bot.request.BaseRequest.DEFAULT_NONE`.
@@ -224,19 +305,31 @@ class File(ZaloObject):
                 :paramref:`zalo_bot.request.BaseRequest.post.pool_timeout`. Defaults to
                 :attr:`~zalo_bot.request.BaseRequest.DEFAULT_NONE`.
         """
-        local_file = is_local_file(self.file_path)
-        url = None if local_file else self._get_encoded_url()
-        path = Path(self.file_path) if local_file else None
-        if local_file:
-            buf = path.read_bytes()
+        if is_local_file(self.file_path):
+            buf = Path(self.file_path).read_bytes()
+        elif self._credentials:
+            buffer = bytearray()
+            await self._stream_to(
+                buffer.extend,
+                progress,
+                max_size,
+                read_timeout,
+                write_timeout,
+                connect_timeout,
+                pool_timeout,
+            )
+            buf = bytes(buffer)
         else:
-            buf = await self.get_bot().request.retrieve(
-                url,
-                read_timeout=read_timeout,
-                write_timeout=write_timeout,
-                connect_timeout=connect_timeout,
-                pool_timeout=pool_timeout,
+            await self._stream_to(
+                out.write,
+                progress,
+                max_size,
+                read_timeout,
+                write_timeout,
+                connect_timeout,
+                pool_timeout,
             )
+            return
         if self._credentials:
             buf = self._prepare_decrypt(buf)
         out.write(buf)
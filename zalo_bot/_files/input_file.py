@@ -1,10 +1,11 @@
 """This module contains an object that represents a Zalo Bot InputFile."""
 
 import mimetypes
+from pathlib import Path
 from typing import IO, Optional, Union
 from uuid import uuid4
 
-from zalo_bot._utils.files import guess_file_name, load_file
+from zalo_bot._utils.files import LocalFileReader, guess_file_name, load_file
 from zalo_bot._utils.strings import TextEncoding
 from zalo_bot._utils.types import FieldTuple
 
@@ -22,13 +23,18 @@ class InputFile:
           in addition.
 
     Args:
-        obj (:term:`file object` | :obj:`bytes` | :obj:`str`): An open file descriptor or the files
-            content as bytes or string.
+        obj (:term:`file object` | :obj:`bytes` | :obj:`str` | :class:`pathlib.Path`): An open
+            file descriptor, the files content as bytes or string or the path of a local file.
 
             Note:
                 If :paramref:`obj` is a string, it will be encoded as bytes via
                 :external:obj:`obj.encode('utf-8') <str.encode>`.
 
+            Tip:
+                Local files passed as :class:`pathlib.Path` are not loaded into memory. They are
+                streamed from disk during the upload and only open while being read, so the
+                same :class:`InputFile` can be used for concurrent and retried requests.
+
         filename (:obj:`str`, optional): Filename for this InputFile.
         attach (:obj:`bool`, optional): Pass :obj:`True` if the parameter this file belongs to in
             the request to Zalo Bot should point to the multipart data via an ``attach://`` URI.
@@ -58,28 +64,42 @@ class InputFile:
                     # here the file handle is already closed and the upload will fail
                     await bot.send_document(chat_id, input_file)
 
+            Caution:
+                A file handle that is not read on initialization can't be shared by concurrent
+                requests, as they would read from the same position. Pass a
+                :class:`pathlib.Path` instead.
+        memory_map (:obj:`bool`, optional): If :obj:`True` and :paramref:`obj` is a
+            :class:`pathlib.Path`, the file is read via :mod:`mmap` while uploading. Defaults to
+            :obj:`False`.
 
     Attributes:
-        input_file_content (:obj:`bytes` | :class:`IO`): The binary content of the file to send.
+        input_file_content (:obj:`bytes` | :class:`IO` | :class:`pathlib.Path`): The binary
+            content of the file to send or the path of the file.
         attach_name (:obj:`str`): Optional. If present, the parameter this file belongs to in
             the request to Zalo Bot should point to the multipart data via a an URI of the form
             ``attach://<attach_name>`` URI.
         filename (:obj:`str`): Filename for the file to be sent.
         mimetype (:obj:`str`): The mimetype inferred from the file to be sent.
+        memory_map (:obj:`bool`): Whether a file given by path is read via :mod:`mmap`.
 
     """
 
-    __slots__ = ("attach_name", "filename", "input_file_content", "mimetype")
+    __slots__ = ("attach_name", "filename", "input_file_content", "memory_map", "mimetype")
 
     def __init__(
         self,
-        obj: Union[IO[bytes], bytes, str],
+        obj: Union[IO[bytes], bytes, str, Path],
         filename: Optional[str] = None,
         attach: bool = False,
         read_file_handle: bool = True,
+        memory_map: bool = False,
     ):
+        self.memory_map: bool = memory_map
         if isinstance(obj, bytes):
-            self.input_file_content: Union[bytes, IO[bytes]] = obj
+            self.input_file_content: Union[bytes, IO[bytes], Path] = obj
+        elif isinstance(obj, Path):
+            self.input_file_content = obj
+            filename = filename or obj.name
         elif isinstance(obj, str):
             self.input_file_content = obj.encode(TextEncoding.UTF_8)
         elif read_file_handle:
@@ -104,9 +124,18 @@ class InputFile:
     def field_tuple(self) -> FieldTuple:
         """Field tuple representing the contents of the file for upload to the Zalo Bot servers.
 
+        Note:
+            For a :class:`pathlib.Path`, every access gives a new file object, so that requests
+            don't share a read position.
+
         Returns:
             Tuple[:obj:`str`, :obj:`bytes` | :class:`IO`, :obj:`str`]:
         """
+        if isinstance(self.input_file_content, Path):
+            content: Union[bytes, IO[bytes]] = LocalFileReader(  # type: ignore[assignment]
+                self.input_file_content, self.memory_map
+            )
+            return self.filename, content, self.mimetype
         return self.filename, self.input_file_content, self.mimetype
 
     @property
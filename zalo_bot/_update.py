@@ -7,16 +7,19 @@ if TYPE_CHECKING:
     from zalo_bot import Bot, User
 
 class Update(ZaloObject):
-    __slots__ = ("message", "_effective_user")
+    __slots__ = ("message", "update_id", "_effective_user")
 
     def __init__(
         self,
         message: Optional["Message"] = None,
+        update_id: Optional[int] = None,
         *,
         api_kwargs: Optional[JSONDict] = None,
     ):
         super().__init__(api_kwargs=api_kwargs)
         self.message: Optional["Message"] = message
+        # Not every Bot API deployment numbers its updates, so this may be None
+        self.update_id: Optional[int] = update_id
         self._effective_user: Optional["User"] = None
 
     @property
@@ -35,6 +38,7 @@ class Update(ZaloObject):
         data["message"] = Message.de_json(data.get("message"), bot)
         update = cls(
             message=data.get("message"),
+            update_id=data.get("update_id"),
             api_kwargs=data,
         )
         update.set_bot(bot)
@@ -0,0 +1,71 @@
+"""This module contains a helper for running coroutines from synchronous code.
+
+Warning:
+    Contents of this module are intended to be used internally by the library and *not* by the
+    user. Changes to this module are not considered breaking changes and may not be documented in
+    the changelog.
+"""
+import asyncio
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+RT = TypeVar("RT")
+
+
+class BackgroundEventLoop:
+    """An event loop running forever in a daemon thread.
+
+    Unlike :func:`asyncio.run`, which creates and closes a new loop on every call, this keeps
+    one loop alive, so that resources bound to it (e.g. pooled HTTP connections) can be reused
+    across calls. The thread is started lazily on the first call to :meth:`run`.
+    """
+
+    __slots__ = ("_lock", "_loop", "_thread")
+
+    def __init__(self) -> None:
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name="zalo-bot-sync", daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    def is_current(self) -> bool:
+        """Whether the calling code is running inside this loop."""
+        if self._loop is None:
+            return False
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def run(self, coroutine: Coroutine[Any, Any, RT]) -> RT:
+        """Run :paramref:`coroutine` in the background loop and block until it is done.
+
+        Raises:
+            :exc:`RuntimeError`: If called from within the background loop itself, which would
+                deadlock.
+        """
+        if self.is_current():
+            coroutine.close()
+            raise RuntimeError("Can not block on the background loop from within itself.")
+        loop = self._ensure_started()
+        return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+    def close(self) -> None:
+        """Stop the loop and wait for the thread to finish."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()  # type: ignore[union-attr]
+        loop.close()
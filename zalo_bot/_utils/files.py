@@ -6,6 +6,8 @@ Warning:
     the changelog.
 """
 
+import io
+import mmap
 from pathlib import Path
 from typing import IO, TYPE_CHECKING, Any, Optional, Tuple, Type, TypeVar, Union, cast, overload
 
@@ -42,6 +44,58 @@ def load_file(
     return filename, contents
 
 
+class LocalFileReader:
+    """Read-only file object for uploading a local file without loading it into memory.
+
+    The file is opened on first use and closed again once it was read to the end, so that
+    pending uploads don't hold file descriptors. Seeking after that reopens it, which is how a
+    retried request reads the file again.
+
+    Args:
+        path (:class:`pathlib.Path`): The file.
+        memory_map (:obj:`bool`, optional): Read via :mod:`mmap` instead of buffered reads.
+    """
+
+    __slots__ = ("_file", "memory_map", "name", "path")
+
+    def __init__(self, path: Path, memory_map: bool = False):
+        self.path = path
+        self.name = path.name
+        self.memory_map = memory_map
+        self._file: Optional[Union[IO[bytes], mmap.mmap]] = None
+
+    def _open(self) -> Union[IO[bytes], mmap.mmap]:
+        if self._file is None:
+            file = self.path.open("rb")
+            # Empty files can't be mapped
+            if self.memory_map and self.path.stat().st_size:
+                with file:
+                    self._file = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self._file = file
+        return self._file
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._open().read(size)
+        if size is None or size < 0 or not data:
+            self.close()
+        return data
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        file = self._open()
+        file.seek(offset, whence)
+        # mmap.seek returns None before Python 3.13
+        return file.tell()
+
+    def tell(self) -> int:
+        return self._open().tell()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
 def guess_file_name(obj: FileInput) -> Optional[str]:
     """Get filename from file handle, or return input unchanged."""
     if hasattr(obj, "name") and not isinstance(obj.name, int):
@@ -77,7 +131,7 @@ def parse_file_input(  # pylint: disable=too-many-return-statements
 
     * String input: if absolute path of local file:
         * local_mode=True: add file:// prefix
-        * local_mode=False: load as binary data and build InputFile
+        * local_mode=False: build InputFile that streams the file
     * Path objects: treated same as strings
     * IO/bytes input: return InputFile
     * If tg_type specified and input is that type: return file_id attribute
@@ -104,7 +158,8 @@ def parse_file_input(  # pylint: disable=too-many-return-statements
             path = Path(file_input)
             if local_mode:
                 return path.absolute().as_uri()
-            return InputFile(path.open(mode="rb"), filename=filename, attach=attach)
+            # Streamed from disk during the upload
+            return InputFile(path, filename=filename, attach=attach)
 
         return file_input
     if isinstance(file_input, bytes):
@@ -0,0 +1,130 @@
+"""This module contains the JSON codecs used for encoding requests and decoding responses.
+
+Warning:
+    Contents of this module are intended to be used internally by the library and *not* by the
+    user. Changes to this module are not considered breaking changes and may not be documented in
+    the changelog. The public interface is :class:`zalo_bot.request.JSONCodec`.
+"""
+import json
+from typing import Any, Dict, Optional, Union
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ujson
+
+    UJSON_AVAILABLE = True
+except ImportError:
+    UJSON_AVAILABLE = False
+
+
+class JSONCodec:
+    """Encodes and decodes JSON. The base class uses the standard library's :mod:`json`.
+
+    Subclass this and override :meth:`dumps`, :meth:`loads` and optionally
+    :meth:`dumps_bytes` to plug in a different JSON library.
+
+    Instead of an instance, the parameters accepting a codec also take one of the names
+    ``"json"`` (the standard library), ``"orjson"``, ``"ujson"`` or ``"auto"``. The latter picks
+    the fastest installed library, in that order of preference: ``orjson``, ``ujson``,
+    ``json``.
+    """
+
+    __slots__ = ()
+
+    name = "json"
+    """:obj:`str`: Name of the JSON library."""
+
+    def dumps(self, obj: Any) -> str:
+        """Encode :paramref:`obj` as JSON text."""
+        return json.dumps(obj)
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        """Encode :paramref:`obj` as UTF-8 encoded JSON."""
+        return self.dumps(obj).encode("utf-8")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Decode JSON text. :paramref:`data` may be UTF-8 encoded :obj:`bytes`, which is
+        decoded directly without creating an intermediate :obj:`str` where the library allows.
+
+        Raises:
+            :exc:`ValueError`: If :paramref:`data` is not valid JSON.
+        """
+        return json.loads(data)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}()"
+
+
+class _OrjsonCodec(JSONCodec):
+    __slots__ = ()
+
+    name = "orjson"
+
+    def dumps(self, obj: Any) -> str:
+        return self.dumps_bytes(obj).decode("utf-8")
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        # The stdlib allows e.g. integer keys, which orjson rejects by default
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        # orjson.JSONDecodeError is a subclass of ValueError
+        return orjson.loads(data)
+
+
+class _UjsonCodec(JSONCodec):
+    __slots__ = ()
+
+    name = "ujson"
+
+    def dumps(self, obj: Any) -> str:
+        # Match the output of the stdlib, which does not escape slashes
+        return ujson.dumps(obj, escape_forward_slashes=False)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        # ujson.JSONDecodeError is a subclass of ValueError
+        return ujson.loads(data)
+
+
+DEFAULT_CODEC = JSONCodec()
+
+_CODECS: Dict[str, JSONCodec] = {"json": DEFAULT_CODEC}
+if ORJSON_AVAILABLE:
+    _CODECS["orjson"] = _OrjsonCodec()
+if UJSON_AVAILABLE:
+    _CODECS["ujson"] = _UjsonCodec()
+
+
+def get_json_codec(codec: Optional[Union[str, JSONCodec]]) -> JSONCodec:
+    """Resolve the value passed for a ``json_codec`` parameter.
+
+    Args:
+        codec (:obj:`str` | :class:`JSONCodec` | :obj:`None`): A codec, the name of a JSON
+            library or ``"auto"``. :obj:`None` gives the standard library codec.
+
+    Raises:
+        :exc:`ValueError`: If the name is unknown.
+        :exc:`RuntimeError`: If the named library is not installed.
+    """
+    if codec is None:
+        return DEFAULT_CODEC
+    if isinstance(codec, JSONCodec):
+        return codec
+    if codec == "auto":
+        return _CODECS.get("orjson") or _CODECS.get("ujson") or DEFAULT_CODEC
+    if codec not in ("json", "orjson", "ujson"):
+        raise ValueError(
+            f"Unknown JSON codec {codec!r}. Expected 'json', 'orjson', 'ujson' or 'auto'."
+        )
+    try:
+        return _CODECS[codec]
+    except KeyError as exc:
+        raise RuntimeError(
+            f"To use the JSON codec {codec!r}, install it via `pip install {codec}`."
+        ) from exc
@@ -0,0 +1,65 @@
+"""This module contains helpers for collecting metrics.
+
+Warning:
+    Contents of this module are intended to be used internally by the library and *not* by the
+    user. Changes to this module are not considered breaking changes and may not be documented in
+    the changelog.
+"""
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence
+
+# 0.5 ms to ~65 s, doubling
+DEFAULT_LATENCY_BOUNDS = tuple(0.0005 * 2**i for i in range(18))
+
+
+class Histogram:
+    """Histogram with fixed buckets, e.g. for latencies in seconds.
+
+    Memory and the cost of :meth:`observe` are constant. Percentiles are estimated as the upper
+    bound of the bucket they fall into, so they are accurate up to the bucket width.
+    """
+
+    __slots__ = ("_bounds", "_counts", "count", "max", "total")
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_LATENCY_BOUNDS) -> None:
+        self._bounds = tuple(bounds)
+        # The last bucket catches everything above the largest bound
+        self._counts: List[int] = [0] * (len(self._bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect_left(self._bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Estimate the value below which :paramref:`percent` percent of the observations fall.
+        Returns :obj:`None` if nothing was observed yet."""
+        if not self.count:
+            return None
+        rank = percent / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank and count:
+                if index == len(self._bounds):
+                    return self.max
+                return min(self._bounds[index], self.max)
+        return self.max
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        """The ``count``, ``sum``, ``mean``, ``max``, ``p50``, ``p90`` and ``p99`` of the
+        observations."""
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else None,
+            "max": self.max if self.count else None,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+        }
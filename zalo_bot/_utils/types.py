@@ -11,6 +11,7 @@ from typing import (
     IO,
     TYPE_CHECKING,
     Any,
+    Callable,
     Collection,
     Dict,
     Literal,
@@ -38,6 +39,9 @@ FileInput = Union[FilePathInput, FileLike, bytes, str]
 JSONDict = Dict[str, Any]
 """Dictionary for Zalo Bot API requests/responses."""
 
+ProgressCallback = Callable[[int, Optional[int]], Any]
+"""Called with the number of bytes transferred so far and the total size, if known."""
+
 DVValueType = TypeVar("DVValueType")  # pylint: disable=invalid-name
 DVType = Union[DVValueType, "DefaultValue[DVValueType]"]
 """Type that can be either `type` or `DefaultValue[type]`."""
@@ -60,6 +64,9 @@ UploadFileDict = Dict[str, FieldTuple]
 HTTPVersion = Literal["1.1", "2.0", "2"]
 """Allowed HTTP versions."""
 
+BodyFormat = Literal["form", "json"]
+"""Allowed encodings of request bodies."""
+
 CorrectOptionID = Literal[0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
 
 MarkdownVersion = Literal[1, 2]
@@ -2,7 +2,6 @@
 import contextlib
 import datetime
 import inspect
-import json
 from collections.abc import Sized
 from contextlib import contextmanager
 from copy import deepcopy
@@ -27,6 +26,7 @@ from typing import (
 
 from zalo_bot._utils.datetime import to_timestamp
 from zalo_bot._utils.default_value import DefaultValue
+from zalo_bot._utils.json_codec import DEFAULT_CODEC
 from zalo_bot._utils.types import JSONDict
 from zalo_bot._utils.warnings import warn
 
@@ -517,12 +517,14 @@ class ZaloObject:
         return data
 
     def to_json(self) -> str:
-        """Gives a JSON representation of object.
+        """Gives a JSON representation of object. Uses the
+        :attr:`~zalo_bot.Bot.json_codec` of the associated bot, if any.
 
         Returns:
             :obj:`str`
         """
-        return json.dumps(self.to_dict())
+        json_codec = getattr(self._bot, "json_codec", None) or DEFAULT_CODEC
+        return json_codec.dumps(self.to_dict())
 
     def to_dict(self, recursive: bool = True) -> JSONDict:
         """Get object as dictionary.
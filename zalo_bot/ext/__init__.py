@@ -1,18 +1,27 @@
 """Extensions over the Zalo Bot API to facilitate bot making."""
 
-from ._application import ApplicationBuilder, Application
+from ._application import ApplicationBuilder, Application, ApplicationHandlerStop
 from ._dispatcher import Dispatcher
-from ._handler import CommandHandler, MessageHandler
+from ._handler import CommandHandler, MessageHandler, PatternHandler
 from ._context import ContextTypes, CallbackContext
+from ._persistence import BasePersistence, InMemoryPersistence, SQLitePersistence
+from ._rate_limiter import BaseRateLimiter, TokenBucketRateLimiter
 from . import filters
 
 __all__ = [
     "ApplicationBuilder",
     "Application",
+    "ApplicationHandlerStop",
     "Dispatcher",
     "CommandHandler",
     "MessageHandler",
+    "PatternHandler",
     "ContextTypes",
     "CallbackContext",
+    "BasePersistence",
+    "InMemoryPersistence",
+    "SQLitePersistence",
+    "BaseRateLimiter",
+    "TokenBucketRateLimiter",
     "filters",
 ]
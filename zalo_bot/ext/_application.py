@@ -1,67 +1,691 @@
 from __future__ import annotations
 
 import asyncio
-from typing import List
+import collections
+import contextlib
+import itertools
+from collections import OrderedDict
+from typing import Any, Deque, Dict, Hashable, List, Optional, Set, Tuple
 
 from zalo_bot._bot import Bot
 from zalo_bot._update import Update
-from zalo_bot._utils.default_value import DEFAULT_NONE
+from zalo_bot._utils.default_value import DEFAULT_80, DEFAULT_IP, DEFAULT_NONE, DefaultValue
 from zalo_bot._utils.logging import get_logger
+from zalo_bot._utils.types import DVInput, HTTPVersion
+from zalo_bot.error import InvalidToken
+from zalo_bot.request import BaseRequest, HTTPXRequest, RetryPolicy
 
 from ._handler import CommandHandler
+from ._persistence import BasePersistence, InMemoryPersistence, StateKey
+from ._rate_limiter import BaseRateLimiter
+from ._router import CommandRouter
+from ._webhook_server import WebhookServer
+
+# Number of user_data/chat_data dicts kept loaded when they are not in use
+_STATE_CACHE_SIZE = 1024
+
+
+class ApplicationHandlerStop(Exception):
+    """Raise this in a handler callback to prevent the handlers of later groups from running
+    for the current update. Handlers of independent groups are not affected.
+
+    See :meth:`Application.add_handler`.
+    """
+
+    __slots__ = ()
 
 
 class Application:
-    """Main class that dispatches updates to handlers."""
+    """Main class that dispatches updates to handlers.
+
+    Args:
+        bot (:class:`zalo_bot.Bot`): The bot used to fetch updates and passed to the callbacks.
+        update_queue_size (:obj:`int`, optional): Maximum number of fetched updates waiting to
+            be processed. When the queue is full, fetching pauses until handlers catch up.
+            Defaults to ``100``.
+        concurrent_updates (:obj:`int`, optional): Maximum number of updates processed at the
+            same time. Updates belonging to the same chat are still handled one after another,
+            in the order they were received; only updates of different chats run in parallel.
+            Defaults to ``1``, i.e. all updates are processed sequentially.
+        persistence (:class:`BasePersistence`, optional): Where :attr:`CallbackContext.user_data`,
+            :attr:`~CallbackContext.chat_data` and :attr:`~CallbackContext.bot_data` are stored.
+            Defaults to an :class:`InMemoryPersistence`.
+        persistence_interval (:obj:`float`, optional): Seconds between two writes of the
+            changed dicts to :paramref:`persistence`. Defaults to ``5``.
+    """
 
-    def __init__(self, bot: Bot) -> None:
+    def __init__(
+        self,
+        bot: Bot,
+        update_queue_size: int = 100,
+        concurrent_updates: int = 1,
+        persistence: Optional[BasePersistence] = None,
+        persistence_interval: float = 5.0,
+    ) -> None:
+        if concurrent_updates < 1:
+            raise ValueError("`concurrent_updates` must be a positive integer.")
+        if persistence_interval <= 0:
+            raise ValueError("`persistence_interval` must be positive.")
         self.bot = bot
-        self.handlers: List[CommandHandler] = []
+        self._handlers: List[CommandHandler] = []
+        self._groups: Dict[int, CommandRouter] = {}
+        self._sequential_groups: List[CommandRouter] = []
+        self._independent_groups: Set[int] = set()
+        self._independent_routers: List[CommandRouter] = []
         self._running = False
         self._logger = get_logger(__name__, "Application")
+        # The queue is created in the running event loop, see _polling_loop
         self.update_queue: asyncio.Queue[object] = DEFAULT_NONE
+        self._update_queue_size = update_queue_size
+        self._last_update_id: Optional[int] = None
+        self._fetcher: Optional[asyncio.Task] = None
+        # Whether the fetcher waits for the server, i.e. may be cancelled without losing updates
+        self._awaiting_server = False
+        # Set by stop() while running, to end the webhook loop and the backoff of the fetcher
+        self._stop_event: Optional[asyncio.Event] = None
+        self._concurrent_updates = concurrent_updates
+        # Updates received but not yet processed by chat, the first one being processed. A chat
+        # has a lane while it has updates and at most one task works on each lane.
+        self._lanes: Dict[Hashable, Deque[Update]] = {}
+        # Lanes waiting for one of the concurrent_updates slots
+        self._waiting_lanes: Deque[Hashable] = collections.deque()
+        self._active_lanes = 0
+        # Updates taken from the queue but not yet processed, limited to apply backpressure
+        self._held_updates = 0
+        self._room_for_updates: Optional[asyncio.Event] = None
+        self._update_tasks: Set[asyncio.Task] = set()
+        self.persistence: BasePersistence = (
+            persistence if persistence is not None else InMemoryPersistence()
+        )
+        self.persistence_interval = persistence_interval
+        self._persistence_task: Optional[asyncio.Task] = None
+        # The flush started by _persistence_loop, which stopping waits for
+        self._persistence_flush: Optional[asyncio.Future] = None
+        # Loaded dicts, least recently used first. Those that are changed but not yet written
+        # or used by an update in progress are never evicted.
+        self._state: "OrderedDict[StateKey, Dict[str, Any]]" = OrderedDict()
+        self._dirty: Dict[StateKey, Dict[str, Any]] = {}
+        self._state_in_use: Dict[StateKey, int] = {}
+        # For each write in progress, the keys dropped since its batch was taken
+        self._dropped_while_writing: List[Set[StateKey]] = []
+
+    def add_handler(self, handler: CommandHandler, group: int = 0) -> None:
+        """Register a handler in a group.
+
+        For each update, the groups are processed in ascending order. In each group, the first
+        matching handler, in the order they were added, is run. Raise
+        :class:`ApplicationHandlerStop` in a callback to skip the remaining groups. Command
+        handlers are looked up by command instead of being checked one by one, so their number
+        doesn't slow down dispatching.
+
+        Example:
+            Log every message without delaying the replies of the handlers in group ``0``:
+
+            .. code:: python
+
+                application.add_handler(MessageHandler(filters.ALL, log_message), group=-1)
+                application.mark_group_independent(-1)
+
+        Args:
+            handler: The handler.
+            group (:obj:`int`, optional): The group. Defaults to ``0``.
+        """
+        router = self._groups.get(group)
+        if router is None:
+            router = self._groups[group] = CommandRouter()
+            self._order_groups()
+        router.add(handler)
+        self._handlers.append(handler)
+
+    def remove_handler(self, handler: CommandHandler, group: int = 0) -> None:
+        """Unregister a handler added via :meth:`add_handler`.
+
+        Args:
+            handler: The handler.
+            group (:obj:`int`, optional): The group it was added to. Defaults to ``0``.
+
+        Raises:
+            :exc:`ValueError`: If :paramref:`handler` is not registered in :paramref:`group`.
+        """
+        router = self._groups.get(group)
+        if router is None or handler not in router.handlers:
+            raise ValueError("The handler is not registered in this group.")
+        remaining = list(router.handlers)
+        remaining.remove(handler)
+        # The routers index their handlers, so the group is rebuilt
+        if remaining:
+            self._groups[group] = CommandRouter()
+            for other in remaining:
+                self._groups[group].add(other)
+        else:
+            del self._groups[group]
+        self._order_groups()
+        self._handlers.remove(handler)
+
+    @property
+    def handlers(self) -> Tuple[CommandHandler, ...]:
+        """Tuple[:class:`zalo_bot.ext.CommandHandler`]: All handlers in the order they were
+        added. Use :meth:`add_handler` and :meth:`remove_handler` to change them."""
+        return tuple(self._handlers)
+
+    def mark_group_independent(self, group: int) -> None:
+        """Run the handlers of :paramref:`group` concurrently with the other groups instead of
+        in order. Their errors are logged instead of being propagated, and
+        :class:`ApplicationHandlerStop` doesn't affect them. Use this for cross-cutting handlers,
+        e.g. for analytics, that the others don't depend on. An update counts as processed, e.g.
+        the next update of its chat may start, once the other groups are done. The handlers of
+        independent groups are awaited when the application stops.
+
+        Args:
+            group (:obj:`int`): The group.
+        """
+        self._independent_groups.add(group)
+        self._order_groups()
+
+    def _order_groups(self) -> None:
+        ordered = sorted(self._groups.items())
+        self._sequential_groups = [
+            router for group, router in ordered if group not in self._independent_groups
+        ]
+        self._independent_routers = [
+            router for group, router in ordered if group in self._independent_groups
+        ]
+
+    @property
+    def concurrent_updates(self) -> int:
+        """:obj:`int`: Maximum number of updates processed at the same time."""
+        return self._concurrent_updates
+
+    async def _run_group(self, router: CommandRouter, update: Update) -> None:
+        matched = router.match(update)
+        if matched is None:
+            return
+        handler, args = matched
+        if args is None:
+            await handler.handle_update(update, self)
+        else:
+            # Spare the command handler from parsing the message again
+            await handler.handle_update(update, self, args)
+
+    def _start_independent_groups(self, update: Update, keys: List[StateKey]) -> None:
+        # Not awaited by process_update, so the update (and its lane) is released once the
+        # sequential groups are done. The tasks keep the dicts of the update loaded.
+        for router in self._independent_routers:
+            self._pin_state(keys)
+            self._track(
+                asyncio.create_task(self._run_independent_group(router, update, keys))
+            )
+
+    async def _run_independent_group(
+        self, router: CommandRouter, update: Update, keys: List[StateKey]
+    ) -> None:
+        try:
+            await self._run_group(router, update)
+        except ApplicationHandlerStop:
+            pass
+        except Exception:
+            self._logger.exception("Error in a handler of an independent group")
+        finally:
+            self._release_state(keys)
+
+    def _track(self, task: asyncio.Task) -> None:
+        self._update_tasks.add(task)
+        task.add_done_callback(self._update_tasks.discard)
+
+    async def _wait_for_update_tasks(self) -> None:
+        """Wait until the tasks working on updates, including independent groups, are done."""
+        while self._update_tasks:
+            await asyncio.gather(*self._update_tasks, return_exceptions=True)
+
+    @staticmethod
+    def _state_keys(update: Update) -> List[StateKey]:
+        keys: List[StateKey] = [("bot", "")]
+        user = update.effective_user
+        if user is not None and user.id:
+            keys.append(("user", str(user.id)))
+        chat = update.message.chat if update.message else None
+        if chat is not None and chat.id:
+            keys.append(("chat", str(chat.id)))
+        return keys
+
+    def _pin_state(self, keys: List[StateKey]) -> List[StateKey]:
+        """Protect the dicts of an update from eviction. Returns the keys that aren't loaded."""
+        missing = []
+        for key in keys:
+            self._state_in_use[key] = self._state_in_use.get(key, 0) + 1
+            if key in self._state:
+                self._state.move_to_end(key)
+            else:
+                missing.append(key)
+        return missing
+
+    async def _load_state(self, keys: List[StateKey]) -> None:
+        for key in keys:
+            data = await self.persistence.get_data(key)
+            # Another update may have loaded it in the meantime
+            self._state.setdefault(key, data if data is not None else {})
+
+    def _release_state(self, keys: List[StateKey]) -> None:
+        for key in keys:
+            count = self._state_in_use[key] - 1
+            if count:
+                self._state_in_use[key] = count
+            else:
+                del self._state_in_use[key]
+        self._trim_state()
+
+    def _trim_state(self) -> None:
+        excess = len(self._state) - _STATE_CACHE_SIZE
+        if excess <= 0:
+            return
+        evictable = (
+            key for key in self._state if key not in self._dirty and key not in self._state_in_use
+        )
+        for key in list(itertools.islice(evictable, excess)):
+            del self._state[key]
+
+    def _get_state(self, kind: str, id_: str) -> Dict[str, Any]:
+        """The dict for :class:`CallbackContext`. It's marked as changed, since the handler
+        may change it."""
+        key = (kind, id_)
+        data = self._state.get(key)
+        if data is None:
+            data = self._state[key] = {}
+        self._dirty[key] = data
+        return data
+
+    async def update_persistence(self) -> None:
+        """Write the dicts that were accessed by handlers since the last call to
+        :attr:`persistence`. This is done every :paramref:`persistence_interval` seconds while
+        the application runs and once when it stops, so it's only needed when calling
+        :meth:`process_update` directly."""
+        if not self._dirty:
+            return
+        batch, self._dirty = self._dirty, {}
+        dropped: Set[StateKey] = set()
+        self._dropped_while_writing.append(dropped)
+        try:
+            await self.persistence.update_data(batch)
+        except BaseException as exc:
+            # Including cancellation: the batch is written by the next flush. Newer changes
+            # of the same dicts are kept, and dicts dropped in the meantime stay dropped.
+            for key, data in batch.items():
+                if key not in dropped:
+                    self._dirty.setdefault(key, data)
+            if not isinstance(exc, Exception):
+                raise
+            self._logger.exception("Error while updating the persistence")
+        else:
+            # The write may have landed after the data was dropped
+            for key in dropped.intersection(batch):
+                await self.persistence.drop_data(key)
+        finally:
+            self._dropped_while_writing.remove(dropped)
+        self._trim_state()
+
+    async def drop_user_data(self, user_id: str) -> None:
+        """Delete the :attr:`CallbackContext.user_data` of a user."""
+        await self._drop_state(("user", str(user_id)))
+
+    async def drop_chat_data(self, chat_id: str) -> None:
+        """Delete the :attr:`CallbackContext.chat_data` of a chat."""
+        await self._drop_state(("chat", str(chat_id)))
+
+    async def _drop_state(self, key: StateKey) -> None:
+        self._state.pop(key, None)
+        self._dirty.pop(key, None)
+        for dropped in self._dropped_while_writing:
+            dropped.add(key)
+        await self.persistence.drop_data(key)
+
+    async def _persistence_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.persistence_interval)
+            # Shielded, so that stopping doesn't interrupt a write, see _stop_persistence
+            self._persistence_flush = asyncio.ensure_future(self.update_persistence())
+            await asyncio.shield(self._persistence_flush)
+
+    def _start_persistence(self) -> None:
+        self._persistence_task = asyncio.create_task(self._persistence_loop())
+
+    async def _stop_persistence(self) -> None:
+        if self._persistence_task is not None:
+            self._persistence_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._persistence_task
+            self._persistence_task = None
+        flush, self._persistence_flush = self._persistence_flush, None
+        if flush is not None and not flush.done():
+            # The final flush must not overtake a write that is in progress
+            await asyncio.wait((flush,))
+        await self.update_persistence()
+        await self.persistence.close()
 
-    def add_handler(self, handler: CommandHandler) -> None:
-        self.handlers.append(handler)
-    
     async def process_update(self, update: Update) -> None:
-        for handler in self.handlers:
-            if handler.check_update(update):
-                coroutine = handler.handle_update(update, self)
-                task = asyncio.create_task(coroutine)
-                await task
+        # Load user_data etc. first, so CallbackContext can return them without waiting
+        keys = self._state_keys(update)
+        missing = self._pin_state(keys)
+        try:
+            if missing:
+                await self._load_state(missing)
+            self._start_independent_groups(update, keys)
+            await self._dispatch(update)
+        finally:
+            self._release_state(keys)
+
+    async def _dispatch(self, update: Update) -> None:
+        for router in self._sequential_groups:
+            try:
+                await self._run_group(router, update)
+            except ApplicationHandlerStop:
                 break
 
+    @staticmethod
+    def _lane_key(update: Update) -> Hashable:
+        if update.message and update.message.chat:
+            return update.message.chat.id
+        # Not related to other updates
+        return object()
+
+    def _enqueue_in_lane(self, update: Update) -> None:
+        key = self._lane_key(update)
+        lane = self._lanes.get(key)
+        if lane is not None:
+            # The task working on the lane picks it up
+            lane.append(update)
+            return
+        self._lanes[key] = collections.deque((update,))
+        if self._active_lanes < self._concurrent_updates:
+            self._start_lane(key)
+        else:
+            self._waiting_lanes.append(key)
+
+    def _start_lane(self, key: Hashable) -> None:
+        self._active_lanes += 1
+        self._track(asyncio.create_task(self._process_lane(key)))
+
+    async def _process_lane(self, key: Hashable) -> None:
+        """Process the updates of a chat in order while holding one slot. If other chats are
+        waiting for a slot, hand it over after each update, so one busy chat can't starve them.
+        """
+        lane = self._lanes[key]
+        try:
+            while lane:
+                try:
+                    await self.process_update(lane[0])
+                except Exception as exc:  # pragma: no cover - logging only
+                    self._logger.exception("Error while processing update: %s", exc)
+                finally:
+                    lane.popleft()
+                    self._update_processed()
+                if lane and self._waiting_lanes:
+                    self._waiting_lanes.append(key)
+                    return
+            del self._lanes[key]
+        finally:
+            self._active_lanes -= 1
+            if self._waiting_lanes:
+                self._start_lane(self._waiting_lanes.popleft())
+
+    def _update_processed(self) -> None:
+        self.update_queue.task_done()
+        self._held_updates -= 1
+        if self._room_for_updates is not None:
+            self._room_for_updates.set()
+
     def process_update_sync(self, update: Update) -> None:
-        asyncio.run(self.process_update(update))
+        async def process() -> None:
+            await self.process_update(update)
+            await self._wait_for_update_tasks()
 
-    async def _polling_loop(self) -> None:
+        asyncio.run(process())
+
+    def stop(self) -> None:
+        """Stop fetching or receiving new updates. Updates already received are still processed
+        before :meth:`run_polling` or :meth:`run_webhook` return."""
+        self._running = False
+        if self._fetcher is not None and self._awaiting_server:
+            # Don't wait for a pending long-poll request to time out. While the fetcher waits
+            # for space in the queue, it holds an update and stops on its own once it's queued.
+            self._fetcher.cancel()
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+    def _next_offset(self) -> Optional[int]:
+        if self._last_update_id is None:
+            return None
+        return self._last_update_id + 1
+
+    async def _fetch_updates(self, timeout: int, max_backoff: float) -> None:
+        """Long-poll for updates and put them into :attr:`update_queue`.
+
+        The next request is issued as soon as the previous one returns. Only network errors
+        delay the loop, using exponential backoff up to :paramref:`max_backoff` seconds.
+        """
+        backoff = 0.0
+        while self._running:
+            self._awaiting_server = True
+            try:
+                update = await self.bot.get_update(offset=self._next_offset(), timeout=timeout)
+            except InvalidToken:
+                raise
+            except Exception as exc:  # pragma: no cover - logging only
+                self._awaiting_server = False
+                backoff = min(max(backoff * 2, 0.5), max_backoff)
+                self._logger.exception(
+                    "Error while fetching updates, retrying in %.1fs: %s", backoff, exc
+                )
+                # Waits on the stop event, so that stop() doesn't wait for the backoff
+                stopped = self._stop_event.wait()  # type: ignore[union-attr]
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(stopped, backoff)
+                continue
+            finally:
+                self._awaiting_server = False
+
+            backoff = 0.0
+            if update is None:
+                continue
+            # Blocks while the queue is full, so we never fetch faster than we can process
+            await self.update_queue.put(update)
+            # Only now may the update be acknowledged, see _acknowledge_updates
+            if update.update_id is not None:
+                self._last_update_id = update.update_id
+
+    async def _process_updates(self) -> None:
+        if self._concurrent_updates == 1:
+            while True:
+                update = await self.update_queue.get()
+                try:
+                    await self.process_update(update)  # type: ignore[arg-type]
+                except Exception as exc:  # pragma: no cover - logging only
+                    self._logger.exception("Error while processing update: %s", exc)
+                finally:
+                    self.update_queue.task_done()
+
+        # Each chat takes a slot only for itself, so a burst from one chat can't block the
+        # others. Taking updates from the queue is limited, so that waiting updates stay in the
+        # bounded queue and apply backpressure to the fetcher.
+        limit = max(self._update_queue_size, self._concurrent_updates)
+        self._room_for_updates = asyncio.Event()
+        while True:
+            while self._update_queue_size > 0 and self._held_updates >= limit:
+                self._room_for_updates.clear()
+                await self._room_for_updates.wait()
+            update = await self.update_queue.get()
+            self._held_updates += 1
+            self._enqueue_in_lane(update)  # type: ignore[arg-type]
+
+    async def _acknowledge_updates(self) -> None:
+        # Tell the server that the updates we processed last don't need to be sent again
+        if self._last_update_id is None:
+            return
+        with contextlib.suppress(Exception):
+            await self.bot.get_update(offset=self._next_offset(), limit=1, timeout=0)
+
+    async def _start_processing(self) -> asyncio.Task:
         await self.bot.initialize()
+        self.update_queue = asyncio.Queue(self._update_queue_size)
         self._running = True
+        self._stop_event = asyncio.Event()
+        self._start_persistence()
+        return asyncio.create_task(self._process_updates())
+
+    async def _stop_processing(self, consumer: asyncio.Task) -> None:
+        self._running = False
+        self._stop_event = None
+        await self.update_queue.join()
+        consumer.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await consumer
+        await self._wait_for_update_tasks()
+        await self._stop_persistence()
+
+    async def _polling_loop(self, timeout: int = 30, max_backoff: float = 30.0) -> None:
+        consumer = await self._start_processing()
+        self._fetcher = asyncio.create_task(
+            self._fetch_updates(timeout=timeout, max_backoff=max_backoff)
+        )
         try:
-            while self._running:
-                try:
-                    update = await self.bot.get_update(timeout=30)
-                except Exception as exc:  # pragma: no cover - logging only
-                    self._logger.exception("Error while fetching updates: %s", exc)
-                    await asyncio.sleep(1)
-                    continue
-                if update:
-                    await self.process_update(update)
-                else:
-                    await asyncio.sleep(1)
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._fetcher
+        finally:
+            self._running = False
+            if not self._fetcher.done():
+                self._fetcher.cancel()
+            self._fetcher = None
+            await self._stop_processing(consumer)
+            await self._acknowledge_updates()
+            await self.bot.shutdown()
+
+    def run_polling(self, timeout: int = 30, max_backoff: float = 30.0) -> None:
+        """Fetch updates via long polling and process them until :meth:`stop` is called or the
+        process is interrupted.
+
+        Fetching and processing run concurrently: while handlers work on one update, the next
+        long-poll request is already waiting for the server.
+
+        Args:
+            timeout (:obj:`int`, optional): Long polling timeout in seconds passed to
+                :meth:`zalo_bot.Bot.get_update`. Defaults to ``30``.
+            max_backoff (:obj:`float`, optional): Maximum time in seconds to wait before
+                retrying after a failed request. Defaults to ``30``.
+        """
+        asyncio.run(self._polling_loop(timeout=timeout, max_backoff=max_backoff))
+
+    async def _webhook_loop(
+        self,
+        listen: str,
+        port: int,
+        url_path: str,
+        secret_token: Optional[str],
+        webhook_url: Optional[str],
+    ) -> None:
+        consumer = await self._start_processing()
+        server = WebhookServer(
+            listen=listen,
+            port=port,
+            url_path=url_path,
+            update_queue=self.update_queue,
+            bot=self.bot,
+            secret_token=secret_token,
+        )
+        try:
+            await server.start()
+            if webhook_url:
+                await self.bot.set_webhook(webhook_url, secret_token)  # type: ignore[arg-type]
+            await self._stop_event.wait()  # type: ignore[union-attr]
         finally:
+            await server.stop()
+            await self._stop_processing(consumer)
             await self.bot.shutdown()
 
-    def run_polling(self) -> None:
-        asyncio.run(self._polling_loop())
+    def run_webhook(
+        self,
+        listen: DVInput[str] = DEFAULT_IP,
+        port: DVInput[int] = DEFAULT_80,
+        url_path: str = "",
+        secret_token: Optional[str] = None,
+        webhook_url: Optional[str] = None,
+    ) -> None:
+        """Start a small HTTP server receiving updates from the Bot API and process them until
+        :meth:`stop` is called or the process is interrupted.
+
+        Each request is answered with ``200 OK`` as soon as the update is put into
+        :attr:`update_queue`; handlers run independently of the HTTP response. While the
+        queue is full, requests are answered with ``503 Service Unavailable``, so that the Bot
+        API delivers the updates again later.
+
+        Note:
+            Unless :paramref:`webhook_url` is passed, the webhook has to be registered
+            separately with :meth:`zalo_bot.Bot.set_webhook`, using a public HTTPS URL that
+            forwards to :paramref:`listen`:`port`/`url_path`.
+
+        Args:
+            listen (:obj:`str`, optional): IP address to listen on. Defaults to
+                ``127.0.0.1``.
+            port (:obj:`int`, optional): Port to listen on. Defaults to ``80``.
+            url_path (:obj:`str`, optional): Path on which updates are accepted. Defaults to
+                ``""``, i.e. the root path.
+            secret_token (:obj:`str`, optional): Secret token passed to
+                :meth:`zalo_bot.Bot.set_webhook`. If passed, requests without a matching
+                ``X-Bot-Api-Secret-Token`` header are rejected.
+            webhook_url (:obj:`str`, optional): Public URL of the webhook. If passed, it is
+                registered via :meth:`zalo_bot.Bot.set_webhook` once the server is listening.
+                Requires :paramref:`secret_token`.
+        """
+        if webhook_url and not secret_token:
+            raise ValueError("`secret_token` is required when passing `webhook_url`.")
+        asyncio.run(
+            self._webhook_loop(
+                listen=DefaultValue.get_value(listen),
+                port=DefaultValue.get_value(port),
+                url_path=url_path,
+                secret_token=secret_token,
+                webhook_url=webhook_url,
+            )
+        )
 
 
 class ApplicationBuilder:
-    """Builder for :class:`Application`."""
+    """Builder for :class:`Application`.
+
+    The settings for the request objects of the bot come in two flavours: the plain ones (e.g.
+    :meth:`connection_pool_size`) apply to all API calls except
+    :meth:`zalo_bot.Bot.get_update`, the ``get_updates_*`` ones only to long polling. Either
+    pass a ready made :class:`~zalo_bot.request.BaseRequest` via :meth:`request` or tune the
+    default :class:`~zalo_bot.request.HTTPXRequest`, but not both.
+    """
 
     def __init__(self) -> None:
         self._token: str | None = None
+        self._concurrent_updates = 1
+        self._rate_limiter: Optional[BaseRateLimiter] = None
+        self._persistence: Optional[BasePersistence] = None
+        self._persistence_interval = 5.0
+        self._request: Optional[BaseRequest] = None
+        self._get_updates_request: Optional[BaseRequest] = None
+        self._request_kwargs: Dict[str, Any] = {}
+        self._get_updates_request_kwargs: Dict[str, Any] = {}
+
+    def _set_request_kwarg(self, get_updates: bool, name: str, value: Any) -> ApplicationBuilder:
+        prefix = "get_updates_" if get_updates else ""
+        if (self._get_updates_request if get_updates else self._request) is not None:
+            raise RuntimeError(
+                f"The parameter `{prefix}{name}` may only be set, if no `{prefix}request` was set."
+            )
+        (self._get_updates_request_kwargs if get_updates else self._request_kwargs)[name] = value
+        return self
+
+    def _build_request(self, get_updates: bool) -> Optional[BaseRequest]:
+        request = self._get_updates_request if get_updates else self._request
+        if request is not None:
+            return request
+        kwargs = self._get_updates_request_kwargs if get_updates else self._request_kwargs
+        if not kwargs:
+            # Let the bot build its defaults
+            return None
+        return HTTPXRequest(**{"retry_policy": RetryPolicy(), **kwargs})
 
     def token(self, token: str) -> 'ApplicationBuilder':
         self._token = token
@@ -73,8 +697,108 @@ class ApplicationBuilder:
         self._base_url = base_url
         return self
 
+    def concurrent_updates(self, concurrent_updates: int) -> 'ApplicationBuilder':
+        """Sets :paramref:`Application.concurrent_updates`."""
+        self._concurrent_updates = concurrent_updates
+        return self
+
+    def rate_limiter(self, rate_limiter: BaseRateLimiter) -> 'ApplicationBuilder':
+        """Sets the rate limiter passed to :class:`zalo_bot.Bot`."""
+        self._rate_limiter = rate_limiter
+        return self
+
+    def persistence(self, persistence: BasePersistence) -> ApplicationBuilder:
+        """Sets :paramref:`Application.persistence`."""
+        self._persistence = persistence
+        return self
+
+    def persistence_interval(self, persistence_interval: float) -> ApplicationBuilder:
+        """Sets :paramref:`Application.persistence_interval`."""
+        self._persistence_interval = persistence_interval
+        return self
+
+    def request(self, request: BaseRequest) -> ApplicationBuilder:
+        """Sets :paramref:`zalo_bot.Bot.request`."""
+        if self._request_kwargs:
+            raise RuntimeError(
+                "The parameter `request` may only be set, if no request settings were set."
+            )
+        self._request = request
+        return self
+
+    def get_updates_request(self, get_updates_request: BaseRequest) -> ApplicationBuilder:
+        """Sets :paramref:`zalo_bot.Bot.get_updates_request`."""
+        if self._get_updates_request_kwargs:
+            raise RuntimeError(
+                "The parameter `get_updates_request` may only be set, if no get_updates request "
+                "settings were set."
+            )
+        self._get_updates_request = get_updates_request
+        return self
+
+    def connection_pool_size(self, connection_pool_size: int) -> ApplicationBuilder:
+        """Sets :paramref:`zalo_bot.request.HTTPXRequest.connection_pool_size`."""
+        return self._set_request_kwarg(False, "connection_pool_size", connection_pool_size)
+
+    def http_version(self, http_version: HTTPVersion) -> ApplicationBuilder:
+        """Sets :paramref:`zalo_bot.request.HTTPXRequest.http_version`. Use ``"2"`` to
+        multiplex concurrent requests over few connections, see
+        :meth:`zalo_bot.request.HTTPXRequest.http2`."""
+        return self._set_request_kwarg(False, "http_version", http_version)
+
+    def read_timeout(self, read_timeout: Optional[float]) -> ApplicationBuilder:
+        """Sets :paramref:`zalo_bot.request.HTTPXRequest.read_timeout`."""
+        return self._set_request_kwarg(False, "read_timeout", read_timeout)
+
+    def write_timeout(self, write_timeout: Optional[float]) -> ApplicationBuilder:
+        """Sets :paramref:`zalo_bot.request.HTTPXRequest.write_timeout`."""
+        return self._set_request_kwarg(False, "write_timeout", write_timeout)
+
+    def connect_timeout(self, connect_timeout: Optional[float]) -> ApplicationBuilder:
+        """Sets :paramref:`zalo_bot.request.HTTPXRequest.connect_timeout`."""
+        return self._set_request_kwarg(False, "connect_timeout", connect_timeout)
+
+    def pool_timeout(self, pool_timeout: Optional[float]) -> ApplicationBuilder:
+        """Sets :paramref:`zalo_bot.request.HTTPXRequest.pool_timeout`."""
+        return self._set_request_kwarg(False, "pool_timeout", pool_timeout)
+
+    def get_updates_connection_pool_size(self, connection_pool_size: int) -> ApplicationBuilder:
+        """Like :meth:`connection_pool_size`, but for long polling."""
+        return self._set_request_kwarg(True, "connection_pool_size", connection_pool_size)
+
+    def get_updates_http_version(self, http_version: HTTPVersion) -> ApplicationBuilder:
+        """Like :meth:`http_version`, but for long polling."""
+        return self._set_request_kwarg(True, "http_version", http_version)
+
+    def get_updates_read_timeout(self, read_timeout: Optional[float]) -> ApplicationBuilder:
+        """Like :meth:`read_timeout`, but for long polling."""
+        return self._set_request_kwarg(True, "read_timeout", read_timeout)
+
+    def get_updates_write_timeout(self, write_timeout: Optional[float]) -> ApplicationBuilder:
+        """Like :meth:`write_timeout`, but for long polling."""
+        return self._set_request_kwarg(True, "write_timeout", write_timeout)
+
+    def get_updates_connect_timeout(self, connect_timeout: Optional[float]) -> ApplicationBuilder:
+        """Like :meth:`connect_timeout`, but for long polling."""
+        return self._set_request_kwarg(True, "connect_timeout", connect_timeout)
+
+    def get_updates_pool_timeout(self, pool_timeout: Optional[float]) -> ApplicationBuilder:
+        """Like :meth:`pool_timeout`, but for long polling."""
+        return self._set_request_kwarg(True, "pool_timeout", pool_timeout)
+
     def build(self) -> Application:
         if not self._token:
             raise ValueError("Token must be set")
-        bot = Bot(token=self._token, base_url=self._base_url if hasattr(self, '_base_url') else None)
-        return Application(bot)
+        bot = Bot(
+            token=self._token,
+            base_url=self._base_url if hasattr(self, '_base_url') else None,
+            rate_limiter=self._rate_limiter,
+            request=self._build_request(get_updates=False),
+            get_updates_request=self._build_request(get_updates=True),
+        )
+        return Application(
+            bot,
+            concurrent_updates=self._concurrent_updates,
+            persistence=self._persistence,
+            persistence_interval=self._persistence_interval,
+        )
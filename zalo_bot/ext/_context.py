@@ -1,15 +1,54 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Any, Dict, List, Match, Optional
+
+from zalo_bot._update import Update
 
 
 class CallbackContext:
-    """Simple context passed to handler callbacks."""
+    """Simple context passed to handler callbacks.
+
+    Attributes:
+        args: Arguments of the command, for :class:`CommandHandler`.
+        match: The match of the pattern, for :class:`PatternHandler`.
+        update: The update being handled.
+    """
 
-    def __init__(self, application: 'Application', args: Optional[List[str]] = None) -> None:
+    def __init__(
+        self,
+        application: 'Application',
+        args: Optional[List[str]] = None,
+        match: Optional[Match[str]] = None,
+        update: Optional[Update] = None,
+    ) -> None:
         self.application = application
         self.bot = application.bot
         self.args = args or []
+        self.match = match
+        self.update = update
+
+    @property
+    def user_data(self) -> Optional[Dict[str, Any]]:
+        """A dict for storing data about the user who sent the update, kept in
+        :attr:`Application.persistence`. :obj:`None` if the update has no user."""
+        user = self.update.effective_user if self.update else None
+        if user is None or not user.id:
+            return None
+        return self.application._get_state("user", str(user.id))
+
+    @property
+    def chat_data(self) -> Optional[Dict[str, Any]]:
+        """Like :attr:`user_data`, but for the chat of the update."""
+        chat = self.update.message.chat if self.update and self.update.message else None
+        if chat is None or not chat.id:
+            return None
+        return self.application._get_state("chat", str(chat.id))
+
+    @property
+    def bot_data(self) -> Dict[str, Any]:
+        """A dict for storing data shared by all updates, kept in
+        :attr:`Application.persistence`."""
+        return self.application._get_state("bot", "")
 
 
 class ContextTypes:
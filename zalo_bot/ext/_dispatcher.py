@@ -1,54 +1,137 @@
 # zalo_bot/ext/dispatcher.py
 import asyncio
-from typing import List, Optional
+import time
+from typing import Dict, List, Optional, Tuple
 from zalo_bot._bot import Bot
 from zalo_bot._update import Update
+from zalo_bot._utils.logging import get_logger
 from ._application import Application
 from ._handler import CommandHandler
 
 
 class Dispatcher:
-    def __init__(self, bot: Bot, update_queue: Optional[asyncio.Queue] = None, workers: int = 0) -> None:
+    """Feeds updates to the handlers of an :class:`Application`, optionally through a pool of
+    worker tasks.
+
+    Args:
+        bot (:class:`zalo_bot.Bot`): The bot passed to the callbacks.
+        update_queue (:class:`asyncio.Queue`, optional): Queue to read updates from. If not
+            passed, a queue holding at most :paramref:`queue_size` updates is created by
+            :meth:`start`.
+        workers (:obj:`int`, optional): Number of worker tasks processing updates concurrently.
+            If ``0``, :meth:`feed_update` processes the update directly. Defaults to ``0``.
+        queue_size (:obj:`int`, optional): Maximum number of updates waiting for a worker.
+            :meth:`feed_update` blocks while the queue is full. Defaults to ``100``.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        update_queue: Optional[asyncio.Queue] = None,
+        workers: int = 0,
+        queue_size: int = 100,
+    ) -> None:
         self.bot = bot
         self.application = Application(bot)
-        self.handlers: List[CommandHandler] = []
         self._external_queue = update_queue
-        self.update_queue = None  # defer init
+        # Created in start() so that it is bound to the running event loop
+        self.update_queue: Optional[asyncio.Queue] = None
         self.workers = workers
+        self._queue_size = queue_size
         self._worker_tasks: List[asyncio.Task] = []
+        self._logger = get_logger(__name__, "Dispatcher")
+        self._busy_workers = 0
+        self._busy_time = 0.0
+        self._processed_updates = 0
+        self._started_at: Optional[float] = None
+
+    @property
+    def handlers(self) -> Tuple[CommandHandler, ...]:
+        """See :attr:`Application.handlers`."""
+        return self.application.handlers
 
-    def add_handler(self, handler: CommandHandler) -> None:
-        self.handlers.append(handler)
-        self.application.add_handler(handler)
+    def add_handler(self, handler: CommandHandler, group: int = 0) -> None:
+        self.application.add_handler(handler, group)
 
-    def process_update(self, update: Update) -> None:
-        self.application.process_update_sync(update)
+    def remove_handler(self, handler: CommandHandler, group: int = 0) -> None:
+        self.application.remove_handler(handler, group)
+
+    async def process_update(self, update: Update) -> None:
+        await self.application.process_update(update)
 
     async def start(self) -> None:
         await self.bot.initialize()
+        self.application._start_persistence()
         if self.workers > 0:
+            self.update_queue = self._external_queue or asyncio.Queue(self._queue_size)
+            self._started_at = time.monotonic()
             for _ in range(self.workers):
                 task = asyncio.create_task(self._worker_loop())
                 self._worker_tasks.append(task)
 
     async def stop(self) -> None:
-        for _ in range(self.workers):
-            await self.update_queue.put(None)
-        await asyncio.gather(*self._worker_tasks)
+        """Wait until all queued updates are processed, then stop the workers and shut down
+        the bot."""
+        if self._worker_tasks:
+            await self.update_queue.join()
+            for _ in self._worker_tasks:
+                await self.update_queue.put(None)
+            await asyncio.gather(*self._worker_tasks)
+            self._worker_tasks.clear()
+        await self.application._wait_for_update_tasks()
+        await self.application._stop_persistence()
         await self.bot.shutdown()
 
     async def _worker_loop(self) -> None:
         while True:
             update = await self.update_queue.get()
             if update is None:
+                self.update_queue.task_done()
                 break
+
+            self._busy_workers += 1
+            started = time.monotonic()
             try:
                 await self.application.process_update(update)
+            except Exception as exc:  # pragma: no cover - logging only
+                self._logger.exception("Error while processing update: %s", exc)
             finally:
+                self._busy_workers -= 1
+                self._busy_time += time.monotonic() - started
+                self._processed_updates += 1
                 self.update_queue.task_done()
 
     async def feed_update(self, update: Update) -> None:
+        """Hand an update to the workers. Waits while the queue is full."""
         if self.workers > 0:
+            if self.update_queue is None:
+                raise RuntimeError("This Dispatcher is not started!")
             await self.update_queue.put(update)
         else:
             await self.process_update(update)
+
+    def statistics(self) -> Dict[str, float]:
+        """Current load of the worker pool.
+
+        Returns:
+            Dict[:obj:`str`, :obj:`float`]: A dict with the keys
+
+            * ``queue_size``: Number of updates waiting for a worker.
+            * ``queue_capacity``: Maximum size of the queue (``0`` means unbounded).
+            * ``workers``: Number of worker tasks.
+            * ``busy_workers``: Number of workers currently processing an update.
+            * ``processed_updates``: Number of updates processed since :meth:`start`.
+            * ``utilization``: Fraction of the available worker time since :meth:`start` that
+              was spent processing updates.
+        """
+        queue = self.update_queue
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        capacity = self.workers * elapsed
+        return {
+            "queue_size": queue.qsize() if queue is not None else 0,
+            "queue_capacity": queue.maxsize if queue is not None else self._queue_size,
+            "workers": self.workers,
+            "busy_workers": self._busy_workers,
+            "processed_updates": self._processed_updates,
+            "utilization": min(self._busy_time / capacity, 1.0) if capacity else 0.0,
+        }
@@ -1,12 +1,32 @@
 from __future__ import annotations
 
-from typing import Callable, Awaitable, Any
+from typing import (
+    Callable, Awaitable, Any, Dict, Iterable, List, Match, Optional, Pattern, Sequence, Tuple, Union
+)
 import inspect
+import re
 
 from zalo_bot._update import Update
 from ._context import ContextTypes, CallbackContext
 
 
+# A back reference like \1 (not an escaped backslash followed by a digit) or a conditional
+# like (?(1)...)
+_NUMBERED_GROUP_REFERENCE = re.compile(r"(?<!\\)(?:\\\\)*\\[1-9]|\(\?\(\d")
+
+
+def parse_command(update: Update) -> Optional[Tuple[str, List[str]]]:
+    """Split a message like ``/start a b`` into the command without the slash and its
+    arguments. Returns :obj:`None` if the update is not a command."""
+    text = update.message.text if update.message else None
+    if not text or "/" not in text:
+        return None
+    parts = text.split()
+    if not parts or not parts[0].startswith("/"):
+        return None
+    return parts[0][1:], parts[1:]
+
+
 class CommandHandler:
     """Handle commands like ``/start``."""
 
@@ -15,14 +35,18 @@ class CommandHandler:
         self.callback = callback
 
     def check_update(self, update: Update) -> bool:
-        if update.message and update.message.text:
-            return update.message.text.strip().split()[0] == f"/{self.command}"
-        return False
+        parsed = parse_command(update)
+        return parsed is not None and parsed[0] == self.command
 
-    async def handle_update(self, update: Update, application: 'Application') -> None:
-        text = update.message.text if update.message else ''
-        args = text.split()[1:] if text else []
-        context = ContextTypes.DEFAULT_TYPE(application, args=args)
+    async def handle_update(
+        self, update: Update, application: 'Application', args: Optional[List[str]] = None
+    ) -> None:
+        """Run the callback. :paramref:`args` are the arguments of the command, if the caller
+        already parsed them."""
+        if args is None:
+            parsed = parse_command(update)
+            args = parsed[1] if parsed else []
+        context = ContextTypes.DEFAULT_TYPE(application, args=args, update=update)
         result: Any = self.callback(update, context)
         if inspect.isawaitable(result):
             await result
@@ -38,7 +62,182 @@ class MessageHandler:
         return bool(update.message and self.filters(update))
 
     async def handle_update(self, update: Update, application: 'Application') -> None:
-        context = ContextTypes.DEFAULT_TYPE(application)
+        context = ContextTypes.DEFAULT_TYPE(application, update=update)
         result: Any = self.callback(update, context)
         if inspect.isawaitable(result):
             await result
+
+
+_Callback = Callable[[Update, CallbackContext], Awaitable[None]]
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """A regular expression matching any of :paramref:`keywords`, built from their prefix tree
+    so that the engine follows one branch per character instead of trying every keyword.
+    Longer keywords are preferred over their prefixes."""
+    trie: Dict[str, Any] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        optional = "" in node
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")" + ("?" if optional else "")
+
+    return build(trie)
+
+
+class PatternHandler:
+    """Handle text messages by matching them against many patterns at once.
+
+    The patterns of all routes are compiled into a single regular expression, so the cost of
+    routing a message doesn't grow with the number of routes. The route whose pattern matches
+    earliest in the text wins; on ties, the route added first. The callback gets the match in
+    :attr:`CallbackContext.match`.
+
+    Example:
+        .. code:: python
+
+            PatternHandler(
+                [
+                    (["hello", "hi", "xin chào"], greet),
+                    (["giá vé", "ticket price"], prices),
+                ],
+                keywords=True,
+            )
+
+    Args:
+        routes: Pairs of a pattern and the callback for messages that match it. With
+            :paramref:`keywords`, the first element is a keyword or a list of keywords instead.
+        keywords (:obj:`bool`, optional): Whether the routes are given by keywords. Keywords
+            match whole words, ignoring case. Defaults to :obj:`False`.
+        flags (:obj:`int`, optional): Flags for :func:`re.compile`, if the patterns are
+            strings.
+
+    Raises:
+        :exc:`ValueError`: If :paramref:`routes` is empty.
+    """
+
+    def __init__(
+        self,
+        routes: Sequence[Tuple[Union[str, Pattern[str], Iterable[str]], _Callback]],
+        keywords: bool = False,
+        flags: int = 0,
+    ):
+        if not routes:
+            raise ValueError("`routes` must not be empty.")
+        self.callbacks: List[_Callback] = []
+        # The result of the last check_update, reused by handle_update
+        self._last: Tuple[Optional[Update], Optional[Tuple[int, Match[str]]]] = (None, None)
+        if keywords:
+            self._by_keyword: Dict[str, int] = {}
+            for index, (route_keywords, callback) in enumerate(routes):
+                if isinstance(route_keywords, str):
+                    route_keywords = [route_keywords]
+                for keyword in filter(None, route_keywords):
+                    self._by_keyword.setdefault(keyword.lower(), index)
+                self.callbacks.append(callback)
+            self._keyword_pattern: Optional[Pattern[str]] = re.compile(
+                rf"(?<!\w)(?:{_trie_pattern(self._by_keyword)})(?!\w)", re.IGNORECASE
+            )
+            return
+
+        self._keyword_pattern = None
+        self.patterns: List[Pattern[str]] = []
+        for pattern, callback in routes:
+            self.patterns.append(re.compile(pattern, flags) if isinstance(pattern, str) else pattern)
+            self.callbacks.append(callback)
+        # In the combined pattern, group numbers are shifted, so patterns that refer to groups
+        # by number are searched on their own
+        combinable = [
+            index
+            for index, pattern in enumerate(self.patterns)
+            if not _NUMBERED_GROUP_REFERENCE.search(pattern.pattern)
+        ]
+        self._combined = self._combine(combinable)
+        self._separate: List[int] = [
+            index
+            for index in range(len(self.patterns))
+            if self._combined is None or index not in combinable
+        ]
+
+    def _combine(self, indices: List[int]) -> Optional[Pattern[str]]:
+        """Each route becomes a named group. The route is identified by the group that matched
+        and the match is repeated with its own pattern, so that its groups are numbered as the
+        user expects."""
+        if not indices:
+            return None
+        try:
+            combined = re.compile(
+                "|".join(f"(?P<_route{index}>{self.patterns[index].pattern})" for index in indices),
+                self.patterns[indices[0]].flags,
+            )
+        except re.error:
+            # E.g. duplicate group names across the patterns
+            return None
+        if any(self.patterns[index].flags != combined.flags for index in indices):
+            return None
+        return combined
+
+    def _keyword_route(self, matched: str) -> Optional[int]:
+        index = self._by_keyword.get(matched.lower())
+        if index is not None:
+            return index
+        # Matching ignores case beyond what lower() maps, e.g. "ſ" (long s) matches "s"
+        return min(
+            (
+                index
+                for keyword, index in self._by_keyword.items()
+                if re.fullmatch(re.escape(keyword), matched, re.IGNORECASE)
+            ),
+            default=None,
+        )
+
+    def _search(self, text: str) -> Optional[Tuple[int, Match[str]]]:
+        if self._keyword_pattern is not None:
+            match = self._keyword_pattern.search(text)
+            if match is None:
+                return None
+            index = self._keyword_route(match.group())
+            return (index, match) if index is not None else None
+        best: Optional[Tuple[int, Match[str]]] = None
+        if self._combined is not None:
+            combined = self._combined.search(text)
+            if combined is not None:
+                index = int(combined.lastgroup[len("_route"):])  # type: ignore[index]
+                match = self.patterns[index].match(text, combined.start())
+                if match is not None:
+                    best = (index, match)
+        for index in self._separate:
+            match = self.patterns[index].search(text)
+            if match is not None and (
+                best is None or (match.start(), index) < (best[1].start(), best[0])
+            ):
+                best = (index, match)
+        return best
+
+    def check_update(self, update: Update) -> bool:
+        text = update.message.text if update.message else None
+        result = self._search(text) if text else None
+        self._last = (update, result)
+        return result is not None
+
+    async def handle_update(self, update: Update, application: 'Application') -> None:
+        last_update, result = self._last
+        if last_update is not update:
+            text = update.message.text if update.message else None
+            result = self._search(text) if text else None
+        if result is None:
+            return
+        index, match = result
+        context = ContextTypes.DEFAULT_TYPE(application, match=match, update=update)
+        outcome: Any = self.callbacks[index](update, context)
+        if inspect.isawaitable(outcome):
+            await outcome
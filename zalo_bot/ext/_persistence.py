@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from zalo_bot._utils.json_codec import JSONCodec, get_json_codec
+
+#: Key of a stored dict: the kind (``"user"``, ``"chat"`` or ``"bot"``) and the id
+StateKey = Tuple[str, str]
+
+
+class BasePersistence(ABC):
+    """Interface for storing :attr:`CallbackContext.user_data`, :attr:`~CallbackContext.chat_data`
+    and :attr:`~CallbackContext.bot_data`.
+
+    Each dict is stored under a :data:`StateKey`, i.e. its kind (``"user"``, ``"chat"`` or
+    ``"bot"``) and the user or chat id (``""`` for ``"bot"``). :class:`Application` loads the
+    dicts before running the handlers of an update and writes the changed ones in batches via
+    :meth:`update_data`, so handlers never wait for a write.
+    """
+
+    @abstractmethod
+    async def get_data(self, key: StateKey) -> Optional[Dict[str, Any]]:
+        """The dict stored under :paramref:`key` or :obj:`None`."""
+
+    @abstractmethod
+    async def update_data(self, entries: Dict[StateKey, Dict[str, Any]]) -> None:
+        """Store several dicts at once. The dicts may be changed by handlers afterwards, so
+        implementations that don't keep them in memory have to serialize them before the first
+        ``await``."""
+
+    @abstractmethod
+    async def drop_data(self, key: StateKey) -> None:
+        """Delete the dict stored under :paramref:`key`, if any."""
+
+    async def close(self) -> None:
+        """Release the resources of the persistence. Called when the application stops."""
+
+
+class InMemoryPersistence(BasePersistence):
+    """Keeps the dicts in memory, bounded by number and age. Nothing survives a restart.
+
+    Args:
+        max_entries (:obj:`int`, optional): Maximum number of dicts. The least recently used
+            ones are dropped first. Defaults to ``10000``.
+        ttl (:obj:`float`, optional): Seconds after the last access after which a dict is
+            dropped. By default, dicts don't expire.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: Optional[float] = None):
+        if max_entries <= 0:
+            raise ValueError("`max_entries` must be positive.")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("`ttl` must be positive.")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # Ordered by last access, so the entries that expire first are at the front
+        self._entries: "OrderedDict[StateKey, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _expiry(self) -> float:
+        return time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        while self._entries:
+            expires, _ = next(iter(self._entries.values()))
+            if len(self._entries) <= self.max_entries and expires > now:
+                break
+            self._entries.popitem(last=False)
+
+    async def get_data(self, key: StateKey) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries[key] = (self._expiry(), entry[1])
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    async def update_data(self, entries: Dict[StateKey, Dict[str, Any]]) -> None:
+        expires = self._expiry()
+        for key, data in entries.items():
+            self._entries[key] = (expires, data)
+            self._entries.move_to_end(key)
+        self._evict()
+
+    async def drop_data(self, key: StateKey) -> None:
+        self._entries.pop(key, None)
+
+
+class SQLitePersistence(BasePersistence):
+    """Stores the dicts as JSON in an SQLite database. The database is accessed from a single
+    worker thread, so it never blocks the event loop. Each batch is written in one transaction.
+
+    Args:
+        path (:obj:`str` | :class:`pathlib.Path`): The database file. Created if it doesn't
+            exist.
+        json_codec (:obj:`str` | :class:`zalo_bot.request.JSONCodec`, optional): Codec used to
+            serialize the dicts, see :class:`zalo_bot.request.JSONCodec`. Defaults to the
+            standard library.
+    """
+
+    def __init__(
+        self, path: Union[str, Path], json_codec: Optional[Union[str, JSONCodec]] = None
+    ):
+        self.path = Path(path)
+        self._codec = get_json_codec(json_codec)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._connection: Optional[sqlite3.Connection] = None
+
+    async def _run(self, func: Any, *args: Any) -> Any:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(1, thread_name_prefix="SQLitePersistence")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Only called from the worker thread
+        if self._connection is None:
+            self._connection = sqlite3.connect(str(self.path))
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS data "
+                "(kind TEXT NOT NULL, id TEXT NOT NULL, value TEXT NOT NULL, PRIMARY KEY (kind, id))"
+            )
+            self._connection.commit()
+        return self._connection
+
+    def _select(self, key: StateKey) -> Optional[str]:
+        row = self._connect().execute(
+            "SELECT value FROM data WHERE kind = ? AND id = ?", key
+        ).fetchone()
+        return row[0] if row else None
+
+    def _upsert(self, rows: List[Tuple[str, str, str]]) -> None:
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO data (kind, id, value) VALUES (?, ?, ?)", rows
+            )
+
+    def _delete(self, key: StateKey) -> None:
+        with self._connect() as connection:
+            connection.execute("DELETE FROM data WHERE kind = ? AND id = ?", key)
+
+    def _close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    async def get_data(self, key: StateKey) -> Optional[Dict[str, Any]]:
+        value = await self._run(self._select, key)
+        return self._codec.loads(value) if value is not None else None
+
+    async def update_data(self, entries: Dict[StateKey, Dict[str, Any]]) -> None:
+        # Serialize right away, handlers may change the dicts while the rows are written
+        rows = [(kind, id_, self._codec.dumps(data)) for (kind, id_), data in entries.items()]
+        if rows:
+            await self._run(self._upsert, rows)
+
+    async def drop_data(self, key: StateKey) -> None:
+        await self._run(self._delete, key)
+
+    async def close(self) -> None:
+        if self._executor is None:
+            return
+        await self._run(self._close)
+        self._executor.shutdown()
+        self._executor = None
@@ -0,0 +1,266 @@
+"""This module contains rate limiters for the requests made by :class:`zalo_bot.Bot`."""
+import abc
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Coroutine, Dict, Hashable, Optional, TypeVar
+
+from zalo_bot._utils.logging import get_logger
+from zalo_bot._utils.types import JSONDict
+from zalo_bot.error import RetryAfter
+
+RT = TypeVar("RT")
+
+_LOGGER = get_logger(__name__, "RateLimiter")
+
+
+class BaseRateLimiter(abc.ABC):
+    """Abstract interface for rate limiting the requests made by :class:`zalo_bot.Bot`.
+
+    Pass an instance to :class:`zalo_bot.Bot` or
+    :meth:`zalo_bot.ext.ApplicationBuilder.rate_limiter`. Every API call is then routed through
+    :meth:`process_request`, which decides when (and whether) the request is actually made.
+    """
+
+    __slots__ = ()
+
+    async def initialize(self) -> None:
+        """Initialize resources used by this class. Called by :meth:`zalo_bot.Bot.initialize`."""
+
+    async def shutdown(self) -> None:
+        """Stop & clear resources used by this class. Called by :meth:`zalo_bot.Bot.shutdown`."""
+
+    @abc.abstractmethod
+    async def process_request(
+        self,
+        callback: Callable[..., Coroutine[Any, Any, RT]],
+        args: Any,
+        kwargs: Dict[str, Any],
+        endpoint: str,
+        data: JSONDict,
+    ) -> RT:
+        """Process a request. Must eventually call ``await callback(*args, **kwargs)`` and return
+        its result, or raise an exception.
+
+        Args:
+            callback (Callable): The coroutine function that makes the request.
+            args (Tuple): Positional arguments for :paramref:`callback`.
+            kwargs (Dict[:obj:`str`, any]): Keyword arguments for :paramref:`callback`.
+            endpoint (:obj:`str`): The Bot API method being called, e.g. ``"sendMessage"``.
+            data (Dict[:obj:`str`, any]): The parameters of the request. Must not be modified.
+        """
+
+
+class _TokenBucket:
+    """Allows ``max_rate`` acquisitions per ``time_period`` seconds, with bursts of up to
+    ``max_rate``. Callers that find the bucket empty wait in FIFO order.
+
+    The bucket isn't bound to an event loop: callers reserve their token under a thread lock and
+    wait in their own loop, so e.g. the ``*_sync`` methods of :class:`zalo_bot.Bot` can share it
+    with the main loop.
+    """
+
+    __slots__ = ("_lock", "_paused", "_rate", "_tokens", "_updated", "_waiters", "capacity")
+
+    def __init__(self, max_rate: float, time_period: float) -> None:
+        self.capacity = max_rate
+        self._rate = max_rate / time_period
+        # Negative while callers wait, each of them having reserved a token
+        self._tokens = max_rate
+        # In the future while paused, so that no tokens are added until then
+        self._updated = time.monotonic()
+        # Total time the bucket was paused for, to postpone the callers already waiting
+        self._paused = 0.0
+        self._waiters = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        if now > self._updated:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+
+    def is_idle(self) -> bool:
+        """Whether the bucket is full and nobody waits on it, i.e. it can be discarded."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            return not self._waiters and self._tokens >= self.capacity and now >= self._updated
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            until = now + seconds
+            if until > self._updated:
+                self._paused += until - self._updated
+                self._updated = until
+
+    async def acquire(self) -> float:
+        """Take one token, waiting if necessary. Returns the number of seconds waited."""
+        with self._lock:
+            started = time.monotonic()
+            self._refill(started)
+            self._tokens -= 1
+            ready = max(started, self._updated) + max(0.0, -self._tokens) / self._rate
+            if ready <= started:
+                return 0.0
+            paused = self._paused
+            self._waiters += 1
+        try:
+            while True:
+                now = time.monotonic()
+                if now >= ready:
+                    return now - started
+                await asyncio.sleep(ready - now)
+                with self._lock:
+                    ready += self._paused - paused
+                    paused = self._paused
+        except BaseException:
+            # Give the reserved token back
+            with self._lock:
+                self._tokens = min(self.capacity, self._tokens + 1)
+            raise
+        finally:
+            with self._lock:
+                self._waiters -= 1
+
+
+class TokenBucketRateLimiter(BaseRateLimiter):
+    """Rate limiter with one token bucket for all requests and one per chat.
+
+    Requests that would exceed a limit wait until the bucket has refilled instead of failing.
+    If the Bot API nevertheless answers with :class:`zalo_bot.error.RetryAfter`, the affected
+    bucket (the chat's bucket if the request targets a chat, otherwise the overall bucket) is
+    paused for :attr:`~zalo_bot.error.RetryAfter.retry_after` seconds and the request is retried.
+
+    Args:
+        overall_max_rate (:obj:`float`, optional): Maximum number of requests in
+            :paramref:`overall_time_period`. Pass ``0`` to disable the overall limit.
+            Defaults to ``30``.
+        overall_time_period (:obj:`float`, optional): Length of the overall window in seconds.
+            Defaults to ``1``.
+        per_chat_max_rate (:obj:`float`, optional): Maximum number of requests targeting the
+            same ``chat_id`` in :paramref:`per_chat_time_period`. Pass ``0`` to disable the
+            per-chat limit. Defaults to ``5``.
+        per_chat_time_period (:obj:`float`, optional): Length of the per-chat window in
+            seconds. Defaults to ``1``.
+        max_retries (:obj:`int`, optional): How often a request is retried after a
+            :class:`~zalo_bot.error.RetryAfter` before the error is passed on to the caller.
+            Defaults to ``3``.
+    """
+
+    __slots__ = (
+        "_chat_buckets",
+        "_lock",
+        "_max_retries",
+        "_overall_bucket",
+        "_per_chat_max_rate",
+        "_per_chat_time_period",
+        "_prune_at",
+        "_stats",
+    )
+
+    _MIN_PRUNE_SIZE = 1000
+
+    def __init__(
+        self,
+        overall_max_rate: float = 30,
+        overall_time_period: float = 1,
+        per_chat_max_rate: float = 5,
+        per_chat_time_period: float = 1,
+        max_retries: int = 3,
+    ):
+        self._overall_bucket: Optional[_TokenBucket] = (
+            _TokenBucket(overall_max_rate, overall_time_period) if overall_max_rate else None
+        )
+        self._per_chat_max_rate = per_chat_max_rate
+        self._per_chat_time_period = per_chat_time_period
+        self._chat_buckets: Dict[Hashable, _TokenBucket] = {}
+        # Guards the chat buckets and the statistics, as the limiter may be used from several
+        # threads, see _TokenBucket
+        self._lock = threading.Lock()
+        self._prune_at = self._MIN_PRUNE_SIZE
+        self._max_retries = max_retries
+        self._stats: Dict[str, float] = dict.fromkeys(
+            ("requests", "delayed_requests", "total_wait", "max_wait", "retry_after"), 0
+        )
+
+    def _get_chat_bucket(self, chat_id: Hashable) -> Optional[_TokenBucket]:
+        if not self._per_chat_max_rate or chat_id is None:
+            return None
+        with self._lock:
+            bucket = self._chat_buckets.get(chat_id)
+            if bucket is None:
+                if len(self._chat_buckets) >= self._prune_at:
+                    # Full buckets behave exactly like new ones, so dropping them is safe
+                    for key in [k for k, value in self._chat_buckets.items() if value.is_idle()]:
+                        del self._chat_buckets[key]
+                    # Keep pruning amortized O(1) if most buckets are still in use
+                    self._prune_at = max(self._MIN_PRUNE_SIZE, 2 * len(self._chat_buckets))
+                bucket = self._chat_buckets[chat_id] = _TokenBucket(
+                    self._per_chat_max_rate, self._per_chat_time_period
+                )
+            return bucket
+
+    async def _wait(self, chat_bucket: Optional[_TokenBucket]) -> None:
+        waited = 0.0
+        # Chat bucket first, so that a throttled chat doesn't hold up the overall queue
+        if chat_bucket is not None:
+            waited += await chat_bucket.acquire()
+        if self._overall_bucket is not None:
+            waited += await self._overall_bucket.acquire()
+
+        with self._lock:
+            self._stats["requests"] += 1
+            if waited > 0:
+                self._stats["delayed_requests"] += 1
+                self._stats["total_wait"] += waited
+                self._stats["max_wait"] = max(self._stats["max_wait"], waited)
+
+    async def process_request(
+        self,
+        callback: Callable[..., Coroutine[Any, Any, RT]],
+        args: Any,
+        kwargs: Dict[str, Any],
+        endpoint: str,
+        data: JSONDict,
+    ) -> RT:
+        """See :meth:`BaseRateLimiter.process_request`."""
+        chat_bucket = self._get_chat_bucket(data.get("chat_id"))
+        retries = 0
+        while True:
+            await self._wait(chat_bucket)
+            try:
+                return await callback(*args, **kwargs)
+            except RetryAfter as exc:
+                with self._lock:
+                    self._stats["retry_after"] += 1
+                if retries >= self._max_retries:
+                    raise
+                retries += 1
+                _LOGGER.info(
+                    "Rate limit hit for `%s`. Retrying in %s seconds.", endpoint, exc.retry_after
+                )
+                bucket = chat_bucket or self._overall_bucket
+                if bucket is None:
+                    await asyncio.sleep(exc.retry_after)
+                else:
+                    bucket.pause(exc.retry_after)
+
+    def statistics(self) -> Dict[str, float]:
+        """Wait time metrics since creation.
+
+        Returns:
+            Dict[:obj:`str`, :obj:`float`]: A dict with the keys
+
+            * ``requests``: Number of requests that passed the limiter.
+            * ``delayed_requests``: Number of those that had to wait.
+            * ``total_wait``: Total time in seconds spent waiting.
+            * ``max_wait``: Longest time in seconds a single request waited.
+            * ``mean_wait``: Average wait time in seconds over all requests.
+            * ``retry_after``: Number of :class:`~zalo_bot.error.RetryAfter` errors received.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats["mean_wait"] = stats["total_wait"] / stats["requests"] if stats["requests"] else 0.0
+        return stats
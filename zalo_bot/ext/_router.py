@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from zalo_bot._update import Update
+
+from ._handler import CommandHandler, parse_command
+
+
+class CommandRouter:
+    """Finds the first handler, in the order they were added, that matches an update.
+
+    :class:`CommandHandler` instances are looked up by their command in a dict, after parsing
+    the command of the update once. Other handlers are checked one by one, but only those added
+    before the first command handler that matches.
+    """
+
+    __slots__ = ("_commands", "_others", "handlers")
+
+    def __init__(self) -> None:
+        self.handlers: List[Any] = []
+        # Handlers by command, each with its position in `handlers`
+        self._commands: Dict[str, List[Tuple[int, CommandHandler]]] = {}
+        self._others: List[Tuple[int, Any]] = []
+
+    def add(self, handler: Any) -> None:
+        position = len(self.handlers)
+        self.handlers.append(handler)
+        # Subclasses may override check_update, so only index the plain handler
+        if type(handler) is CommandHandler:
+            self._commands.setdefault(handler.command, []).append((position, handler))
+        else:
+            self._others.append((position, handler))
+
+    def match(self, update: Update) -> Optional[Tuple[Any, Optional[List[str]]]]:
+        """Returns the matching handler and, for command handlers, the parsed arguments."""
+        command_match = None
+        if self._commands:
+            parsed = parse_command(update)
+            if parsed is not None:
+                candidates = self._commands.get(parsed[0])
+                if candidates:
+                    command_match = (candidates[0][0], candidates[0][1], parsed[1])
+
+        for position, handler in self._others:
+            if command_match is not None and position > command_match[0]:
+                break
+            if handler.check_update(update):
+                return handler, None
+
+        if command_match is not None:
+            return command_match[1], command_match[2]
+        return None
+
+    def __len__(self) -> int:
+        return len(self.handlers)
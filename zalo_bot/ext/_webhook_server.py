@@ -0,0 +1,244 @@
+"""This module contains a minimal asyncio HTTP server receiving webhook updates."""
+import asyncio
+import contextlib
+import hmac
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Dict, Optional, Set, Tuple
+
+from zalo_bot._update import Update
+from zalo_bot._utils.json_codec import DEFAULT_CODEC, JSONCodec
+from zalo_bot._utils.logging import get_logger
+
+if TYPE_CHECKING:
+    from zalo_bot import Bot
+
+_LOGGER = get_logger(__name__, "WebhookServer")
+
+SECRET_TOKEN_HEADER = "x-bot-api-secret-token"
+_MAX_HEADER_SIZE = 16 * 1024
+# Time stop() gives requests in progress to finish
+_STOP_TIMEOUT = 5.0
+
+
+class WebhookServer:
+    """HTTP server accepting ``POST`` requests with updates from the Bot API and putting them
+    into a queue.
+
+    The server answers every valid request with ``200 OK`` as soon as the update is queued, so
+    slow handlers never cause the Bot API to time out and resend the update. If the queue is
+    full, the request is answered with ``503 Service Unavailable`` right away, so that the Bot
+    API delivers the update again later.
+
+    Warning:
+        This is a deliberately small HTTP/1.1 implementation meant to sit behind a reverse proxy
+        that terminates TLS. It only understands requests with a ``Content-Length`` header.
+
+    Once :meth:`stop` is called, no more updates are queued: idle keep-alive connections are
+    closed and requests still arriving are answered with ``503 Service Unavailable``.
+
+    Args:
+        listen (:obj:`str`): IP address to listen on.
+        port (:obj:`int`): Port to listen on. Pass ``0`` to pick a free port, see :attr:`port`.
+        url_path (:obj:`str`): Path on which updates are accepted.
+        update_queue (:class:`asyncio.Queue`): The queue parsed updates are put into.
+        bot (:class:`zalo_bot.Bot`): The bot associated with the parsed updates. Its
+            :attr:`~zalo_bot.Bot.json_codec` decodes the requests.
+        secret_token (:obj:`str`, optional): If passed, requests must carry this value in the
+            ``X-Bot-Api-Secret-Token`` header. Others are answered with ``403 Forbidden``.
+        max_body_size (:obj:`int`, optional): Maximum accepted size of a request body in bytes.
+            Defaults to 1 MiB.
+    """
+
+    __slots__ = (
+        "_bot",
+        "_connections",
+        "_idle_writers",
+        "_json_codec",
+        "_listen",
+        "_max_body_size",
+        "_port",
+        "_secret_token",
+        "_server",
+        "_stopping",
+        "_update_queue",
+        "_url_path",
+    )
+
+    def __init__(
+        self,
+        listen: str,
+        port: int,
+        url_path: str,
+        update_queue: "asyncio.Queue[object]",
+        bot: "Bot",
+        secret_token: Optional[str] = None,
+        max_body_size: int = 1024 * 1024,
+    ):
+        self._listen = listen
+        self._port = port
+        self._url_path = "/" + url_path.lstrip("/")
+        self._update_queue = update_queue
+        self._bot = bot
+        self._json_codec: JSONCodec = bot.json_codec if bot is not None else DEFAULT_CODEC
+        self._secret_token = secret_token
+        self._max_body_size = max_body_size
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._stopping = False
+        # The tasks serving the open connections and the writers of those waiting for a request
+        self._connections: Set[asyncio.Task] = set()
+        self._idle_writers: Set[asyncio.StreamWriter] = set()
+
+    @property
+    def port(self) -> int:
+        """:obj:`int`: The port the server is listening on."""
+        if self._server is not None and self._server.sockets:
+            return self._server.sockets[0].getsockname()[1]
+        return self._port
+
+    @property
+    def is_running(self) -> bool:
+        """:obj:`bool`: Whether the server is accepting connections."""
+        return self._server is not None
+
+    async def start(self) -> None:
+        """Start listening for incoming connections."""
+        if self._server is not None:
+            return
+        self._stopping = False
+        self._server = await asyncio.start_server(self._handle_connection, self._listen, self._port)
+        _LOGGER.debug("Webhook server listening on %s:%s%s", self._listen, self.port, self._url_path)
+
+    async def stop(self) -> None:
+        """Stop accepting connections and close the listening socket. Idle connections are
+        closed and requests in progress get up to a few seconds to finish, so that no update is
+        queued once this returns."""
+        if self._server is None:
+            return
+        self._stopping = True
+        self._server.close()
+        for writer in self._idle_writers:
+            writer.close()
+        if self._connections:
+            _, pending = await asyncio.wait(set(self._connections), timeout=_STOP_TIMEOUT)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+        await self._server.wait_closed()
+        self._server = None
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        task = asyncio.current_task()
+        self._connections.add(task)  # type: ignore[arg-type]
+        try:
+            # Keep serving requests on the same connection until the client closes it
+            while not self._stopping:
+                self._idle_writers.add(writer)
+                try:
+                    keep_alive = await self._handle_request(reader, writer)
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+                    if not writer.is_closing():
+                        await self._respond(writer, HTTPStatus.BAD_REQUEST, keep_alive=False)
+                    break
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self._connections.discard(task)  # type: ignore[arg-type]
+            self._idle_writers.discard(writer)
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _handle_request(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> bool:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as exc:
+            if not exc.partial:
+                # The connection was closed between two requests
+                return False
+            raise
+        self._idle_writers.discard(writer)
+        if len(head) > _MAX_HEADER_SIZE:
+            raise ValueError("Request header too large")
+
+        method, path, headers = self._parse_head(head)
+        keep_alive = headers.get("connection", "").lower() != "close"
+        length = int(headers.get("content-length", "0"))
+        if length > self._max_body_size:
+            await self._respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, keep_alive=False)
+            return False
+        body = await reader.readexactly(length) if length else b""
+
+        if self._stopping:
+            # The updates in the queue may already be processed for the last time
+            status = HTTPStatus.SERVICE_UNAVAILABLE
+        else:
+            status = await self._process(method, path, headers, body)
+        keep_alive = keep_alive and not self._stopping
+        await self._respond(writer, status, keep_alive=keep_alive)
+        return keep_alive
+
+    @staticmethod
+    def _parse_head(head: bytes) -> Tuple[str, str, Dict[str, str]]:
+        lines = head.decode("latin-1").split("\r\n")
+        method, target, _ = lines[0].split(" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            if not line:
+                continue
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        return method, target.split("?", 1)[0], headers
+
+    async def _process(
+        self, method: str, path: str, headers: Dict[str, str], body: bytes
+    ) -> HTTPStatus:
+        if path != self._url_path:
+            return HTTPStatus.NOT_FOUND
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED
+        if self._secret_token is not None and not hmac.compare_digest(
+            headers.get(SECRET_TOKEN_HEADER, "").encode(), self._secret_token.encode()
+        ):
+            _LOGGER.debug("Rejected webhook request with invalid secret token")
+            return HTTPStatus.FORBIDDEN
+
+        try:
+            data = self._json_codec.loads(body)
+        except ValueError:
+            _LOGGER.debug("Received invalid JSON on webhook: %r", body[:200])
+            return HTTPStatus.BAD_REQUEST
+        if not isinstance(data, dict):
+            return HTTPStatus.BAD_REQUEST
+        # Updates may arrive wrapped like `getUpdates` responses
+        if isinstance(data.get("result"), dict):
+            data = data["result"]
+
+        try:
+            update = Update.de_json(data, self._bot)
+        except Exception as exc:
+            _LOGGER.critical("Error while parsing webhook update %r", data, exc_info=exc)
+            return HTTPStatus.BAD_REQUEST
+
+        if update is not None:
+            try:
+                self._update_queue.put_nowait(update)
+            except asyncio.QueueFull:
+                _LOGGER.warning("Update queue is full, rejecting webhook update")
+                return HTTPStatus.SERVICE_UNAVAILABLE
+        return HTTPStatus.OK
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: HTTPStatus, keep_alive: bool) -> None:
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Length: 0\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1")
+        )
+        await writer.drain()
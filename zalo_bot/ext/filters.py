@@ -1,31 +1,251 @@
+"""Filters for :class:`zalo_bot.ext.MessageHandler`.
+
+Filters can be combined with ``&``, ``|`` and ``~``. Combining them builds an expression tree
+that is compiled into a single function on first use: nested ``&``/``|`` are flattened,
+duplicate sub-filters are removed, the operands of each ``&``/``|`` are ordered by their
+:attr:`BaseFilter.cost` and a sub-filter used in several places is evaluated at most once per
+update. Because the operands may be reordered, filters should not have side effects.
+"""
 from __future__ import annotations
 
-from typing import Callable
+import re
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Pattern, Tuple, Union
 
 from zalo_bot._update import Update
 
+# Relative costs used to order the operands of & and |
+CHEAP = 1
+DEFAULT_COST = 5
+EXPENSIVE = 10
+
 
 class BaseFilter:
-    def __init__(self, func: Callable[[Update], bool]):
+    """A filter for updates.
+
+    Args:
+        func: Returns whether an update passes the filter.
+        cost (:obj:`int`, optional): Relative cost of :paramref:`func`. Cheaper filters are
+            checked first when filters are combined. Defaults to ``5``, while the simple
+            attribute checks of this module have cost ``1``.
+    """
+
+    def __init__(self, func: Callable[[Update], bool], cost: int = DEFAULT_COST):
         self.func = func
+        self.cost = cost
+
+    @property
+    def key(self) -> Hashable:
+        """Filters with equal keys are considered duplicates when combined."""
+        return self
 
     def __call__(self, update: Update) -> bool:
         return self.func(update)
 
     def __and__(self, other: 'BaseFilter') -> 'BaseFilter':
-        return BaseFilter(lambda update: self(update) and other(update))
+        return _MergedFilter("and", (self, other))
 
     def __or__(self, other: 'BaseFilter') -> 'BaseFilter':
-        return BaseFilter(lambda update: self(update) or other(update))
+        return _MergedFilter("or", (self, other))
 
     def __invert__(self) -> 'BaseFilter':
-        return BaseFilter(lambda update: not self(update))
+        return _InvertedFilter(self)
+
+
+class _InvertedFilter(BaseFilter):
+    def __init__(self, inner: BaseFilter):
+        super().__init__(_compile_on_call(self), inner.cost)
+        self.inner = inner
+
+    @property
+    def key(self) -> Hashable:
+        return ("not", self.inner.key)
+
+    def __invert__(self) -> BaseFilter:
+        return self.inner
+
+
+class _MergedFilter(BaseFilter):
+    def __init__(self, operator: str, operands: Iterable[BaseFilter]):
+        flat: Dict[Hashable, BaseFilter] = {}
+        for operand in operands:
+            nested = (
+                operand.operands
+                if isinstance(operand, _MergedFilter) and operand.operator == operator
+                else (operand,)
+            )
+            for inner in nested:
+                flat.setdefault(inner.key, inner)
+        if operator == "and" and len(flat) > 1:
+            flat.pop(ALL.key, None)
+        # sorted() is stable, so filters of equal cost keep their order
+        self.operands: Tuple[BaseFilter, ...] = tuple(
+            sorted(flat.values(), key=lambda operand: operand.cost)
+        )
+        self.operator = operator
+        super().__init__(_compile_on_call(self), sum(operand.cost for operand in self.operands))
+
+    @property
+    def key(self) -> Hashable:
+        return (self.operator, tuple(operand.key for operand in self.operands))
+
+
+def _compile_on_call(compound: BaseFilter) -> Callable[[Update], bool]:
+    def compile_and_call(update: Update) -> bool:
+        compound.func = _compile(compound)
+        return compound.func(update)
+
+    return compile_and_call
+
+
+def _compile(compound: BaseFilter) -> Callable[[Update], bool]:
+    """Generate a function that evaluates the expression tree of :paramref:`compound` without
+    a call per node. Leaves that occur more than once are memoized in local variables."""
+    leaves: Dict[Hashable, int] = {}
+    functions: List[Callable[[Update], Any]] = []
+    counts: List[int] = []
+
+    def collect(node: BaseFilter) -> None:
+        if isinstance(node, _MergedFilter):
+            for operand in node.operands:
+                collect(operand)
+        elif isinstance(node, _InvertedFilter):
+            collect(node.inner)
+        elif node.key in leaves:
+            counts[leaves[node.key]] += 1
+        else:
+            leaves[node.key] = len(functions)
+            # Subclasses may override __call__ instead of passing a function
+            functions.append(node.func if type(node).__call__ is BaseFilter.__call__ else node)
+            counts.append(1)
+
+    def expression(node: BaseFilter) -> str:
+        if isinstance(node, _MergedFilter):
+            joined = f" {node.operator} ".join(expression(operand) for operand in node.operands)
+            return f"({joined})"
+        if isinstance(node, _InvertedFilter):
+            return f"(not {expression(node.inner)})"
+        index = leaves[node.key]
+        if counts[index] == 1:
+            return f"_f{index}(update)"
+        return f"(_m{index} if _m{index} is not None else (_m{index} := bool(_f{index}(update))))"
+
+    collect(compound)
+    body = expression(compound)
+    memos = [f"_m{index}" for index, count in enumerate(counts) if count > 1]
+    lines = ["def evaluate(update, _last=[None, False]):"]
+    # The same filter is often checked by several handlers for one update
+    lines.append("    if _last[0] is update: return _last[1]")
+    if memos:
+        lines.append(f"    {' = '.join(memos)} = None")
+    lines.append(f"    result = bool({body})")
+    lines.append("    _last[0] = update")
+    lines.append("    _last[1] = result")
+    lines.append("    return result")
+    namespace: Dict[str, Any] = {f"_f{index}": function for index, function in enumerate(functions)}
+    exec("\n".join(lines), namespace)  # pylint: disable=exec-used
+    return namespace["evaluate"]
+
+
+class Regex(BaseFilter):
+    """Messages whose text matches a regular expression, using :func:`re.search`.
+
+    Args:
+        pattern (:obj:`str` | :class:`re.Pattern`): The regular expression.
+        flags (:obj:`int`, optional): Flags for :func:`re.compile`, if :paramref:`pattern` is a
+            string.
+    """
+
+    def __init__(self, pattern: Union[str, Pattern], flags: int = 0):
+        self.pattern: Pattern = re.compile(pattern, flags) if isinstance(pattern, str) else pattern
+        search = self.pattern.search
+
+        def check(update: Update) -> bool:
+            text = update.message.text if update.message else None
+            return bool(text and search(text))
+
+        super().__init__(check, EXPENSIVE)
+
+    @property
+    def key(self) -> Hashable:
+        return ("regex", self.pattern.pattern, self.pattern.flags)
+
+
+def _ids(ids: Union[str, Iterable[str]]) -> frozenset:
+    if isinstance(ids, (str, int)):
+        return frozenset((str(ids),))
+    return frozenset(str(id_) for id_ in ids)
+
+
+class ChatType(BaseFilter):
+    """Messages from chats of the given types, e.g. ``"PRIVATE"`` or ``"GROUP"``. The
+    comparison ignores case. See also :data:`PRIVATE` and :data:`GROUP`."""
+
+    def __init__(self, *chat_types: str):
+        self.chat_types = frozenset(chat_type.upper() for chat_type in chat_types)
+        chat_types_ = self.chat_types
+
+        def check(update: Update) -> bool:
+            chat = update.message.chat if update.message else None
+            return bool(chat and chat.type and chat.type.upper() in chat_types_)
+
+        super().__init__(check, CHEAP)
+
+    @property
+    def key(self) -> Hashable:
+        return ("chat_type", self.chat_types)
+
+
+class User(BaseFilter):
+    """Messages sent by one of the given users.
+
+    Args:
+        user_ids (:obj:`str` | Iterable[:obj:`str`]): The user id or ids.
+    """
+
+    def __init__(self, user_ids: Union[str, Iterable[str]]):
+        self.user_ids = _ids(user_ids)
+        user_ids_ = self.user_ids
+
+        def check(update: Update) -> bool:
+            user = update.message.from_user if update.message else None
+            return bool(user and user.id in user_ids_)
+
+        super().__init__(check, CHEAP)
+
+    @property
+    def key(self) -> Hashable:
+        return ("user", self.user_ids)
+
+
+class Chat(BaseFilter):
+    """Messages in one of the given chats.
+
+    Args:
+        chat_ids (:obj:`str` | Iterable[:obj:`str`]): The chat id or ids.
+    """
+
+    def __init__(self, chat_ids: Union[str, Iterable[str]]):
+        self.chat_ids = _ids(chat_ids)
+        chat_ids_ = self.chat_ids
+
+        def check(update: Update) -> bool:
+            chat = update.message.chat if update.message else None
+            return bool(chat and chat.id in chat_ids_)
+
+        super().__init__(check, CHEAP)
+
+    @property
+    def key(self) -> Hashable:
+        return ("chat", self.chat_ids)
 
 
-TEXT = BaseFilter(lambda update: bool(update.message and update.message.text))
+TEXT = BaseFilter(lambda update: bool(update.message and update.message.text), CHEAP)
 COMMAND = BaseFilter(
-    lambda update: bool(update.message and update.message.text and update.message.text.startswith('/'))
+    lambda update: bool(update.message and update.message.text and update.message.text.startswith('/')),
+    CHEAP,
 )
-PHOTO = BaseFilter(lambda update: bool(update.message and update.message.photo_url))
-STICKER = BaseFilter(lambda update: bool(update.message and update.message.sticker))
-ALL = BaseFilter(lambda update: True)
+PHOTO = BaseFilter(lambda update: bool(update.message and update.message.photo_url), CHEAP)
+STICKER = BaseFilter(lambda update: bool(update.message and update.message.sticker), CHEAP)
+ALL = BaseFilter(lambda update: True, CHEAP)
+PRIVATE = ChatType("PRIVATE")
+GROUP = ChatType("GROUP")
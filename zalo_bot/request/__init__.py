@@ -1,7 +1,24 @@
 """Networking backend classes for zalo-bot."""
 
 from ._base_request import BaseRequest
+from ._hooks import RequestEvent, RequestHook
 from ._httpx_request import HTTPXRequest
+from ._metrics import MetricsCollector
 from ._request_data import RequestData
+from ._request_logger import RequestLogger
+from ._retry_policy import RetryPolicy
+from ._upload_cache import UploadCache
+from zalo_bot._utils.json_codec import JSONCodec
 
-__all__ = ("BaseRequest", "HTTPXRequest", "RequestData")
\ No newline at end of file
+__all__ = (
+    "BaseRequest",
+    "HTTPXRequest",
+    "JSONCodec",
+    "MetricsCollector",
+    "RequestData",
+    "RequestEvent",
+    "RequestHook",
+    "RequestLogger",
+    "RetryPolicy",
+    "UploadCache",
+)
\ No newline at end of file
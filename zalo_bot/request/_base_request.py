@@ -1,12 +1,29 @@
 """Abstract class for making POST and GET requests."""
 import abc
-import json
+import asyncio
+import contextlib
+import functools
+import time
 from http import HTTPStatus
 from types import TracebackType
-from typing import AsyncContextManager, Final, List, Optional, Tuple, Type, TypeVar, Union, final
+from typing import (
+    AsyncContextManager,
+    AsyncIterator,
+    Final,
+    List,
+    NoReturn,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    final,
+)
 
 from zalo_bot._utils.default_value import DEFAULT_NONE as _DEFAULT_NONE
 from zalo_bot._utils.default_value import DefaultValue
+from zalo_bot._utils.json_codec import DEFAULT_CODEC, JSONCodec
 from zalo_bot._utils.logging import get_logger
 from zalo_bot._utils.strings import TextEncoding
 from zalo_bot._utils.types import JSONDict, ODVInput
@@ -22,7 +39,9 @@ from zalo_bot.error import (
     RetryAfter,
     ZaloError,
 )
+from zalo_bot.request._hooks import RequestEvent, RequestHook
 from zalo_bot.request._request_data import RequestData
+from zalo_bot.request._retry_policy import RetryPolicy
 from zalo_bot.warnings import PTBDeprecationWarning
 
 RT = TypeVar("RT", bound="BaseRequest")
@@ -56,8 +75,14 @@ class BaseRequest(
             await request_object.shutdown()
 
     Tip:
-        JSON encoding/decoding uses standard library :mod:`json` by default.
-        Override :meth:`parse_json_payload` for custom logic.
+        JSON decoding uses the standard library's :mod:`json` by default. Set
+        :attr:`json_codec` to use a faster library or override :meth:`parse_json_payload` for
+        custom logic.
+
+    Tip:
+        Register a :class:`zalo_bot.request.RequestHook` via :meth:`add_hook` to observe the
+        latency, status code and payload sizes of each request, e.g. with the built-in
+        :class:`zalo_bot.request.MetricsCollector`.
 
     .. seealso:: :wiki:`Architecture Overview <Architecture>`,
         :wiki:`Builder Pattern <Builder-Pattern>`
@@ -65,10 +90,12 @@ class BaseRequest(
     .. versionadded:: 20.0
     """
 
-    __slots__ = ()
+    __slots__ = ("_hooks", "_json_codec", "_retry_policy")
 
     USER_AGENT: Final[str] = f"zalo-bot v{ptb_ver}"
     """User agent for Bot API requests."""
+    DEFAULT_CHUNK_SIZE: Final[int] = 64 * 1024
+    """Default size in bytes of the chunks yielded by :meth:`stream`."""
     DEFAULT_NONE: Final[DefaultValue[None]] = _DEFAULT_NONE
     """Special object indicating argument was not explicitly passed.
 
@@ -123,6 +150,139 @@ class BaseRequest(
         """
         raise NotImplementedError
 
+    @property
+    def retry_policy(self) -> Optional[RetryPolicy]:
+        """:class:`zalo_bot.request.RetryPolicy`: Optional. Policy deciding whether requests
+        failing with transient errors are retried. :obj:`None` disables retries.
+        """
+        return getattr(self, "_retry_policy", None)
+
+    @retry_policy.setter
+    def retry_policy(self, value: Optional[RetryPolicy]) -> None:
+        self._retry_policy = value
+
+    @property
+    def json_codec(self) -> JSONCodec:
+        """:class:`zalo_bot.request.JSONCodec`: The codec used to parse the responses, see
+        :meth:`parse_json_payload`."""
+        return getattr(self, "_json_codec", None) or DEFAULT_CODEC
+
+    @json_codec.setter
+    def json_codec(self, value: JSONCodec) -> None:
+        self._json_codec = value
+
+    def _copy_for_event_loop(self) -> "BaseRequest":
+        """A request object with the same settings that can be used in another event loop, e.g.
+        by the ``*_sync`` methods of :class:`zalo_bot.Bot`. Backends whose resources are bound
+        to an event loop must override this. The default returns this object itself.
+        """
+        return self
+
+    def _is_unsent_error(self, exc: ZaloError) -> bool:  # pylint: disable=unused-argument
+        """Whether :paramref:`exc` guarantees that the request never reached the server, so that
+        even non-idempotent requests can be retried. Backends can override this; the default
+        assumes the worst.
+        """
+        return False
+
+    @property
+    def hooks(self) -> Tuple[RequestHook, ...]:
+        """Tuple[:class:`zalo_bot.request.RequestHook`]: The registered hooks, in the order they
+        are called.
+        """
+        return getattr(self, "_hooks", ())
+
+    def add_hook(self, hook: RequestHook) -> None:
+        """Register a hook that observes every attempt of every request made by this object.
+
+        Args:
+            hook (:class:`zalo_bot.request.RequestHook`): The hook.
+        """
+        self._hooks = (*self.hooks, hook)
+
+    def remove_hook(self, hook: RequestHook) -> None:
+        """Unregister a hook added via :meth:`add_hook`.
+
+        Raises:
+            :exc:`ValueError`: If :paramref:`hook` is not registered.
+        """
+        hooks = list(self.hooks)
+        hooks.remove(hook)
+        self._hooks = tuple(hooks)
+
+    @staticmethod
+    def _call_hooks(hooks: Sequence[RequestHook], name: str, event: RequestEvent) -> None:
+        for hook in hooks:
+            try:
+                getattr(hook, name)(event)
+            except Exception:  # pylint: disable=broad-exception-caught
+                _LOGGER.exception("Request hook %r failed in `%s`", hook, name)
+
+    def _request_size(self, request_data: Optional[RequestData]) -> int:
+        """Size of the body sent for :paramref:`request_data`, used for
+        :attr:`RequestEvent.bytes_sent`. Assumes form fields, implementations that send another
+        body override this. Only called when a hook reads the size, after the body was built."""
+        if request_data is None:
+            return 0
+        size = len(request_data.url_encoded_parameters())
+        if request_data.contains_files:
+            # Approximation: the multipart boundaries and headers are not counted
+            for _, content, _ in request_data.multipart_data.values():
+                if isinstance(content, bytes):
+                    size += len(content)
+        return size
+
+    async def _request_with_retries(
+        self, endpoint: Optional[str], **kwargs: object
+    ) -> bytes:
+        policy = self.retry_policy
+        hooks = self.hooks
+        if policy is None and not hooks:
+            return await self._request_wrapper(**kwargs)  # type: ignore[arg-type]
+
+        attempt = 1
+        while True:
+            event = None
+            if hooks:
+                event = RequestEvent(
+                    endpoint,
+                    kwargs["method"],  # type: ignore[arg-type]
+                    attempt,
+                    functools.partial(
+                        self._request_size, kwargs.get("request_data")  # type: ignore[arg-type]
+                    ),
+                )
+                self._call_hooks(hooks, "before_send", event)
+            try:
+                payload = await self._request_wrapper(event=event, **kwargs)  # type: ignore
+            except ZaloError as exc:
+                if event is not None:
+                    event.duration = time.monotonic() - event.started
+                    event.error = exc
+                    self._call_hooks(hooks, "on_error", event)
+                if policy is None:
+                    raise
+                delay = policy.next_delay(endpoint, exc, attempt, self._is_unsent_error(exc))
+                if delay is None:
+                    raise
+                _LOGGER.debug(
+                    "Attempt %d for `%s` failed with %r. Retrying in %.2fs.",
+                    attempt,
+                    endpoint,
+                    exc,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            if event is not None:
+                event.duration = time.monotonic() - event.started
+                self._call_hooks(hooks, "after_response", event)
+            if policy is not None and attempt == 1:
+                policy.record_success()
+            return payload
+
     @abc.abstractmethod
     async def initialize(self) -> None:
         """Initialize resources used by this class. Must be implemented by a subclass."""
@@ -158,7 +318,8 @@ class BaseRequest(
         Returns:
           The JSON response of the Bot API.
         """
-        result = await self._request_wrapper(
+        result = await self._request_with_retries(
+            endpoint=url.rsplit("/", 1)[-1],
             url=url,
             method="POST",
             request_data=request_data,
@@ -167,7 +328,7 @@ class BaseRequest(
             connect_timeout=connect_timeout,
             pool_timeout=pool_timeout,
         )
-        json_data = self.parse_json_payload(result)
+        json_data = self._parse_json(result)
         return json_data.get("result")
 
     @final
@@ -208,7 +369,8 @@ class BaseRequest(
             :obj:`bytes`: The files contents.
 
         """
-        return await self._request_wrapper(
+        return await self._request_with_retries(
+            endpoint=None,
             url=url,
             method="GET",
             read_timeout=read_timeout,
@@ -217,6 +379,116 @@ class BaseRequest(
             pool_timeout=pool_timeout,
         )
 
+    @final
+    async def stream(
+        self,
+        url: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        read_timeout: ODVInput[float] = DEFAULT_NONE,
+        write_timeout: ODVInput[float] = DEFAULT_NONE,
+        connect_timeout: ODVInput[float] = DEFAULT_NONE,
+        pool_timeout: ODVInput[float] = DEFAULT_NONE,
+    ) -> AsyncIterator[bytes]:
+        """Retrieve the contents of a file by its URL in chunks, so that large files don't have
+        to be held in memory as a whole.
+
+        Failures are retried according to :attr:`retry_policy`, but only until the first chunk
+        was received.
+
+        Warning:
+            This method will be called by the methods of :class:`zalo_bot.File` and should *not*
+            be called manually.
+
+        Args:
+            url (:obj:`str`): The web location we want to retrieve.
+            chunk_size (:obj:`int`, optional): Maximum size of the chunks in bytes. Defaults to
+                :attr:`DEFAULT_CHUNK_SIZE`.
+            read_timeout (:obj:`float` | :obj:`None`, optional): See :meth:`retrieve`. For
+                streams, this is the maximum time to wait for each chunk.
+            write_timeout (:obj:`float` | :obj:`None`, optional): See :meth:`retrieve`.
+            connect_timeout (:obj:`float` | :obj:`None`, optional): See :meth:`retrieve`.
+            pool_timeout (:obj:`float` | :obj:`None`, optional): See :meth:`retrieve`.
+
+        Yields:
+            :obj:`bytes`: The chunks of the file.
+        """
+        policy = self.retry_policy
+        hooks = self.hooks
+        attempt = 1
+        while True:
+            event = None
+            if hooks:
+                event = RequestEvent(None, "GET", attempt, 0)
+                self._call_hooks(hooks, "before_send", event)
+            received = 0
+            try:
+                async with self._stream_wrapper(
+                    url, chunk_size, read_timeout, write_timeout, connect_timeout, pool_timeout
+                ) as (code, chunks):
+                    if event is not None:
+                        event.status_code = code
+                    async for chunk in chunks:
+                        received += len(chunk)
+                        yield chunk
+            except ZaloError as exc:
+                if event is not None:
+                    event.duration = time.monotonic() - event.started
+                    event.bytes_received = received
+                    event.error = exc
+                    self._call_hooks(hooks, "on_error", event)
+                # Once data was passed on, a retry would duplicate it
+                if policy is None or received:
+                    raise
+                delay = policy.next_delay(None, exc, attempt, self._is_unsent_error(exc))
+                if delay is None:
+                    raise
+                _LOGGER.debug(
+                    "Attempt %d for file download failed with %r. Retrying in %.2fs.",
+                    attempt,
+                    exc,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            if event is not None:
+                event.duration = time.monotonic() - event.started
+                event.bytes_received = received
+                self._call_hooks(hooks, "after_response", event)
+            if policy is not None and attempt == 1:
+                policy.record_success()
+            return
+
+    @contextlib.asynccontextmanager
+    async def _stream_wrapper(
+        self,
+        url: str,
+        chunk_size: int,
+        read_timeout: ODVInput[float],
+        write_timeout: ODVInput[float],
+        connect_timeout: ODVInput[float],
+        pool_timeout: ODVInput[float],
+    ) -> AsyncIterator[Tuple[int, AsyncIterator[bytes]]]:
+        """Like :meth:`_request_wrapper`, but for :meth:`do_stream_request`. Unsuccessful
+        responses raise before the chunks are handed out."""
+        try:
+            async with self.do_stream_request(
+                url=url,
+                chunk_size=chunk_size,
+                read_timeout=read_timeout,
+                write_timeout=write_timeout,
+                connect_timeout=connect_timeout,
+                pool_timeout=pool_timeout,
+            ) as (code, chunks):
+                if not HTTPStatus.OK <= code <= 299:
+                    self._raise_for_status(code, b"".join([chunk async for chunk in chunks]))
+                yield code, chunks
+        except ZaloError:
+            raise
+        except Exception as exc:
+            raise NetworkError(f"Unknown error in HTTP implementation: {exc!r}") from exc
+
     async def _request_wrapper(
         self,
         url: str,
@@ -226,6 +498,7 @@ class BaseRequest(
         write_timeout: ODVInput[float] = DEFAULT_NONE,
         connect_timeout: ODVInput[float] = DEFAULT_NONE,
         pool_timeout: ODVInput[float] = DEFAULT_NONE,
+        event: Optional[RequestEvent] = None,
     ) -> bytes:
         """Wraps the real implementation request method.
 
@@ -254,6 +527,8 @@ class BaseRequest(
                 amount of time (in seconds) to wait for a connection to become available instead
                 of the time specified during creating of this object. Defaults to
                 :attr:`DEFAULT_NONE`.
+            event (:class:`zalo_bot.request.RequestEvent`, optional): The event of this attempt,
+                if hooks are registered. Status code and response size are recorded on it.
 
         Returns:
             bytes: The payload part of the HTTP server response.
@@ -302,11 +577,26 @@ class BaseRequest(
         except Exception as exc:
             raise NetworkError(f"Unknown error in HTTP implementation: {exc!r}") from exc
 
+        if event is not None:
+            event.status_code = code
+            event.bytes_received = len(payload)
+
         if HTTPStatus.OK <= code <= 299:
             # 200-299 range are HTTP success statuses
             return payload
 
-        response_data = self.parse_json_payload(payload)
+        self._raise_for_status(code, payload)
+
+    def _raise_for_status(self, code: int, payload: bytes) -> NoReturn:
+        """Raise the error matching an unsuccessful response of the Bot API."""
+        if code >= HTTPStatus.INTERNAL_SERVER_ERROR:
+            # A gateway or proxy in front of the Bot API may answer with e.g. an HTML page. That
+            # is still a network error, so that it can be retried.
+            try:
+                self.json_codec.loads(payload)
+            except ValueError as exc:
+                raise NetworkError(f"Server error ({code})") from exc
+        response_data = self._parse_json(payload)
 
         description = response_data.get("description")
         message = description if description else "Unknown HTTPError"
@@ -339,17 +629,28 @@ class BaseRequest(
             raise NetworkError(description or "Bad Gateway")
         raise NetworkError(f"{message} ({code})")
 
+    def _parse_json(self, payload: bytes) -> JSONDict:
+        """Parse a response with :attr:`json_codec`, unless a subclass overrides
+        :meth:`parse_json_payload`."""
+        if type(self).parse_json_payload is not BaseRequest.parse_json_payload:
+            return self.parse_json_payload(payload)
+        return BaseRequest.parse_json_payload(payload, self.json_codec)
+
     @staticmethod
-    def parse_json_payload(payload: bytes) -> JSONDict:
+    def parse_json_payload(payload: bytes, json_codec: Optional[JSONCodec] = None) -> JSONDict:
         """Parse the JSON returned from Zalo Bot.
 
         Tip:
-            By default, this method uses the standard library's :func:`json.loads` and
-            ``errors="replace"`` in :meth:`bytes.decode`.
-            You can override it to customize either of these behaviors.
+            The payload is decoded directly from :obj:`bytes`. Only if that fails, it is decoded
+            again with ``errors="replace"`` in :meth:`bytes.decode`, so that stray invalid UTF-8
+            does not make the whole response unusable.
+            You can override this method to customize either of these behaviors. Otherwise, the
+            requests made by this object are parsed with :attr:`json_codec`.
 
         Args:
             payload (:obj:`bytes`): The UTF-8 encoded JSON payload as returned by Zalo Bot.
+            json_codec (:class:`zalo_bot.request.JSONCodec`, optional): The codec to decode
+                with. Defaults to the standard library.
 
         Returns:
             dict: A JSON parsed as Python dict with results.
@@ -357,9 +658,14 @@ class BaseRequest(
         Raises:
             ZaloError: If loading the JSON data failed
         """
+        codec = json_codec or DEFAULT_CODEC
+        try:
+            return codec.loads(payload)
+        except ValueError:
+            pass
         decoded_s = payload.decode(TextEncoding.UTF_8, "replace")
         try:
-            return json.loads(decoded_s)
+            return codec.loads(decoded_s)
         except ValueError as exc:
             _LOGGER.exception('Can not load invalid JSON data: "%s"', decoded_s)
             raise ZaloError("Invalid server response") from exc
@@ -407,3 +713,51 @@ class BaseRequest(
             Tuple[:obj:`int`, :obj:`bytes`]: The HTTP return code & the payload part of the server
             response.
         """
+
+    @contextlib.asynccontextmanager
+    async def do_stream_request(
+        self,
+        url: str,
+        chunk_size: int,
+        read_timeout: ODVInput[float] = DEFAULT_NONE,
+        write_timeout: ODVInput[float] = DEFAULT_NONE,
+        connect_timeout: ODVInput[float] = DEFAULT_NONE,
+        pool_timeout: ODVInput[float] = DEFAULT_NONE,
+    ) -> AsyncIterator[Tuple[int, AsyncIterator[bytes]]]:
+        """Makes a ``GET`` request and streams the response. Used by :meth:`stream`.
+
+        This is an asynchronous context manager giving the HTTP return code and an asynchronous
+        iterator over the chunks of the response body. The connection is released on exit.
+
+        The default implementation falls back to :meth:`do_request`, i.e. it loads the whole
+        response into memory first. Subclasses should override this to actually stream.
+
+        Warning:
+            This method will be called by :meth:`stream`. It should *not* be called manually.
+
+        Args:
+            url (:obj:`str`): The URL to request.
+            chunk_size (:obj:`int`): Maximum size of the chunks in bytes.
+            read_timeout (:obj:`float` | :obj:`None`, optional): See :meth:`do_request`.
+            write_timeout (:obj:`float` | :obj:`None`, optional): See :meth:`do_request`.
+            connect_timeout (:obj:`float` | :obj:`None`, optional): See :meth:`do_request`.
+            pool_timeout (:obj:`float` | :obj:`None`, optional): See :meth:`do_request`.
+
+        Yields:
+            Tuple[:obj:`int`, AsyncIterator[:obj:`bytes`]]: The HTTP return code & the chunks of
+            the response body.
+        """
+        code, payload = await self.do_request(
+            url=url,
+            method="GET",
+            read_timeout=read_timeout,
+            write_timeout=write_timeout,
+            connect_timeout=connect_timeout,
+            pool_timeout=pool_timeout,
+        )
+
+        async def chunks() -> AsyncIterator[bytes]:
+            for start in range(0, len(payload), chunk_size):
+                yield payload[start : start + chunk_size]
+
+        yield code, chunks()
@@ -0,0 +1,95 @@
+"""This module contains the interface for observing the requests made by
+:class:`zalo_bot.request.BaseRequest`."""
+import time
+from typing import Callable, Optional, Union
+
+from zalo_bot.error import ZaloError
+
+
+class RequestEvent:
+    """Describes one attempt of a request. The same instance is passed to all callbacks of a
+    :class:`RequestHook` for that attempt and is filled in as the attempt progresses.
+
+    Attributes:
+        endpoint (:obj:`str` | :obj:`None`): The Bot API method, e.g. ``"sendMessage"``, or
+            :obj:`None` for file downloads.
+        method (:obj:`str`): The HTTP method.
+        attempt (:obj:`int`): Number of the attempt, starting at ``1``. Higher numbers are
+            retries, see :class:`zalo_bot.request.RetryPolicy`.
+        started (:obj:`float`): Value of :func:`time.monotonic` when the attempt started.
+        duration (:obj:`float` | :obj:`None`): Seconds the attempt took. Set once it finished.
+        status_code (:obj:`int` | :obj:`None`): The HTTP status code, if a response was
+            received.
+        bytes_received (:obj:`int` | :obj:`None`): Size of the response body in bytes, if a
+            response was received.
+        error (:class:`zalo_bot.error.ZaloError` | :obj:`None`): The error the attempt failed
+            with, if any.
+    """
+
+    __slots__ = (
+        "_bytes_sent",
+        "attempt",
+        "bytes_received",
+        "duration",
+        "endpoint",
+        "error",
+        "method",
+        "started",
+        "status_code",
+    )
+
+    def __init__(
+        self,
+        endpoint: Optional[str],
+        method: str,
+        attempt: int,
+        bytes_sent: Union[int, Callable[[], int]],
+    ):
+        self.endpoint = endpoint
+        self.method = method
+        self.attempt = attempt
+        self._bytes_sent = bytes_sent
+        self.started = time.monotonic()
+        self.duration: Optional[float] = None
+        self.status_code: Optional[int] = None
+        self.bytes_received: Optional[int] = None
+        self.error: Optional[ZaloError] = None
+
+    @property
+    def bytes_sent(self) -> int:
+        """:obj:`int`: Approximate size of the request body in bytes. If a function was passed,
+        it is called on first access, so the size costs nothing unless a hook reads it."""
+        if callable(self._bytes_sent):
+            self._bytes_sent = self._bytes_sent()
+        return self._bytes_sent
+
+    @bytes_sent.setter
+    def bytes_sent(self, value: int) -> None:
+        self._bytes_sent = value
+
+    def __repr__(self) -> str:
+        return (
+            f"RequestEvent(endpoint={self.endpoint!r}, attempt={self.attempt}, "
+            f"status_code={self.status_code}, duration={self.duration})"
+        )
+
+
+class RequestHook:
+    """Base class for observing requests. Override any of the methods and register an instance
+    via :meth:`zalo_bot.request.BaseRequest.add_hook`.
+
+    The callbacks are called synchronously in the request path, so they should be fast. Errors
+    raised by them are logged and otherwise ignored.
+    """
+
+    __slots__ = ()
+
+    def before_send(self, event: RequestEvent) -> None:
+        """Called before each attempt is sent."""
+
+    def after_response(self, event: RequestEvent) -> None:
+        """Called after an attempt succeeded."""
+
+    def on_error(self, event: RequestEvent) -> None:
+        """Called after an attempt failed, including error responses of the Bot API.
+        :attr:`RequestEvent.error` is set."""
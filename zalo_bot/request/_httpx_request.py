@@ -1,14 +1,34 @@
 """This module contains methods to make POST and GET requests using the httpx library."""
-from typing import Any, Collection, Dict, Optional, Tuple, Union
+import asyncio
+import contextlib
+import copy
+import time
+from collections import deque
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Collection,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 import httpx  # type: ignore
 
 from zalo_bot._utils.default_value import DefaultValue
+from zalo_bot._utils.json_codec import JSONCodec, get_json_codec
 from zalo_bot._utils.logging import get_logger
-from zalo_bot._utils.types import HTTPVersion, ODVInput, SocketOpt
+from zalo_bot._utils.types import BodyFormat, HTTPVersion, ODVInput, SocketOpt, UploadFileDict
 from zalo_bot._utils.warnings import warn
-from zalo_bot.error import NetworkError, TimedOut
+from zalo_bot.error import NetworkError, TimedOut, ZaloError
 from zalo_bot.request._base_request import BaseRequest
+from zalo_bot.request._pool_sizer import PoolSizer
 from zalo_bot.request._request_data import RequestData
+from zalo_bot.request._retry_policy import RetryPolicy
 from zalo_bot.warnings import PTBDeprecationWarning
 
 # Note to future devs:
@@ -117,10 +137,60 @@ class HTTPXRequest(BaseRequest):
                 way.
 
             .. versionadded:: 21.6
+        keep_alive (:obj:`bool`, optional): Whether connections should be kept open and reused
+            across requests. If :obj:`False`, every request is sent with a ``Connection: close``
+            header and pays a fresh TCP/TLS handshake. Only disable this if a proxy between the
+            bot and the Bot API mishandles persistent connections. Defaults to :obj:`True`.
+        keepalive_expiry (:obj:`float` | :obj:`None`, optional): Number of seconds an idle
+            connection may be reused. Expired connections are closed by the pool the next time
+            a connection is requested. :obj:`None` keeps idle connections until the server
+            closes them. Defaults to ``30``.
+        max_keepalive_connections (:obj:`int`, optional): Maximum number of idle connections
+            kept per pool. Defaults to :paramref:`connection_pool_size`.
+        retry_policy (:class:`zalo_bot.request.RetryPolicy`, optional): Policy for retrying
+            requests that failed with transient network errors. See
+            :attr:`~zalo_bot.request.BaseRequest.retry_policy`. Defaults to :obj:`None`, i.e.
+            no retries.
+        json_codec (:obj:`str` | :class:`zalo_bot.request.JSONCodec`, optional): Codec used to
+            decode responses. Either a codec instance or one of ``"json"``, ``"orjson"``,
+            ``"ujson"`` and ``"auto"``, see :class:`~zalo_bot.request.JSONCodec`. Defaults to
+            the standard library.
+        body_format (:obj:`str`, optional): How request parameters are encoded.
+
+            * ``"form"``: As ``application/x-www-form-urlencoded`` fields, where each value
+              that is not a string is JSON encoded on its own.
+            * ``"json"``: As a single ``application/json`` body, see
+              :attr:`~zalo_bot.request.RequestData.json_payload`. This is smaller and cheaper
+              to encode.
+
+            Requests that upload files are always sent as ``multipart/form-data``. Defaults to
+            ``"form"``.
+        max_connection_pool_size (:obj:`int`, optional): If passed, the pool size adapts to the
+            load: it starts at :paramref:`connection_pool_size` and grows up to this value when
+            requests have to wait for a connection, and shrinks back when the load drops. The
+            connection limit of the client is this value, while the number of requests let into
+            the pool at a time follows the pool size. Further requests wait for their turn,
+            which counts towards :paramref:`pool_timeout`. Shrinking closes no connections, idle
+            ones are closed after :paramref:`keepalive_expiry`. See :meth:`pool_statistics`.
 
     """
 
-    __slots__ = ("_client", "_client_kwargs", "_http_version", "_media_write_timeout")
+    __slots__ = (
+        "_client",
+        "_body_format",
+        "_admission_waiters",
+        "_admitted",
+        "_client_kwargs",
+        "_pool_sizer",
+        "_socket_options",
+        "_headers",
+        "_json_headers",
+        "_http_version",
+        "_default_timeout",
+        "_media_timeout",
+        "_media_write_timeout",
+        "_urls",
+    )
 
     def __init__(
         self,
@@ -135,6 +205,13 @@ class HTTPXRequest(BaseRequest):
         proxy: Optional[Union[str, httpx.Proxy, httpx.URL]] = None,
         media_write_timeout: Optional[float] = 20.0,
         httpx_kwargs: Optional[Dict[str, Any]] = None,
+        keep_alive: bool = True,
+        keepalive_expiry: Optional[float] = 30.0,
+        max_keepalive_connections: Optional[int] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        json_codec: Optional[Union[str, JSONCodec]] = None,
+        body_format: BodyFormat = "form",
+        max_connection_pool_size: Optional[int] = None,
     ):
         if proxy_url is not None and proxy is not None:
             raise ValueError("The parameters `proxy_url` and `proxy` are mutually exclusive.")
@@ -149,6 +226,8 @@ class HTTPXRequest(BaseRequest):
             )
 
         self._http_version = http_version
+        self._retry_policy = retry_policy
+        self._json_codec = get_json_codec(json_codec)
         self._media_write_timeout = media_write_timeout
         timeout = httpx.Timeout(
             connect=connect_timeout,
@@ -156,10 +235,30 @@ class HTTPXRequest(BaseRequest):
             write=write_timeout,
             pool=pool_timeout,
         )
+        self._pool_sizer: Optional[PoolSizer] = None
+        if max_connection_pool_size is not None:
+            self._pool_sizer = PoolSizer(connection_pool_size, max_connection_pool_size)
+            connection_pool_size = max_connection_pool_size
+        # Requests let into the pool and requests waiting for their turn, see _enter_pool
+        self._admitted = 0
+        self._admission_waiters: Deque[asyncio.Future] = deque()
+
+        if not keep_alive:
+            max_keepalive_connections = 0
+        elif max_keepalive_connections is None:
+            max_keepalive_connections = connection_pool_size
         limits = httpx.Limits(
             max_connections=connection_pool_size,
-            max_keepalive_connections=connection_pool_size,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
         )
+        self._headers: Dict[str, str] = {"User-Agent": self.USER_AGENT}
+        if not keep_alive:
+            self._headers["Connection"] = "close"
+        if body_format not in ("form", "json"):
+            raise ValueError("`body_format` must be either 'form' or 'json'.")
+        self._body_format = body_format
+        self._json_headers = {**self._headers, "Content-Type": "application/json"}
 
         if http_version not in ("1.1", "2", "2.0"):
             raise ValueError("`http_version` must be either '1.1', '2.0' or '2'.")
@@ -181,6 +280,10 @@ class HTTPXRequest(BaseRequest):
             **http_kwargs,
             **(httpx_kwargs or {}),
         }
+        # Needed to build a new transport in _copy_for_event_loop, unless one was passed in
+        self._socket_options = (
+            socket_options if self._client_kwargs["transport"] is transport else None
+        )
 
         try:
             self._client = self._build_client()
@@ -198,6 +301,52 @@ class HTTPXRequest(BaseRequest):
                 '"zalo-bot[http2]"`.'
             ) from exc
 
+        # Reused by every request that doesn't override any timeout
+        self._default_timeout: httpx.Timeout = self._client.timeout
+        self._media_timeout = httpx.Timeout(
+            connect=self._default_timeout.connect,
+            read=self._default_timeout.read,
+            write=self._media_write_timeout,
+            pool=self._default_timeout.pool,
+        )
+        # Parsed API URLs. Only POST requests are cached, as the URLs of file downloads vary
+        self._urls: Dict[str, httpx.URL] = {}
+
+    @classmethod
+    def http2(
+        cls,
+        connection_pool_size: int = 2,
+        pool_timeout: Optional[float] = 10.0,
+        **kwargs: Any,
+    ) -> "HTTPXRequest":
+        """Preset for sending many requests concurrently, e.g. with
+        :meth:`zalo_bot.Bot.send_message_many`.
+
+        HTTP/2 multiplexes concurrent requests as streams over a single connection, so a few
+        connections carry hundreds of requests in flight (up to the server's stream limit per
+        connection) without paying a TCP/TLS handshake per connection. Because requests no
+        longer queue for a free connection, :paramref:`pool_timeout` only matters if the server
+        does not agree to HTTP/2.
+
+        Note:
+            Requires ``pip install "zalo-bot[http2]"``. HTTP/2 is negotiated during the TLS
+            handshake; if the server does not support it, the requests fall back to HTTP/1.1 and
+            at most :paramref:`connection_pool_size` requests are in flight.
+
+        Args:
+            connection_pool_size (:obj:`int`, optional): Maximum number of connections.
+                Defaults to ``2``.
+            pool_timeout (:obj:`float` | :obj:`None`, optional): See
+                :paramref:`HTTPXRequest.pool_timeout`. Defaults to ``10``.
+            **kwargs: Further arguments for :class:`HTTPXRequest`.
+        """
+        return cls(
+            connection_pool_size=connection_pool_size,
+            pool_timeout=pool_timeout,
+            http_version="2",
+            **kwargs,
+        )
+
     @property
     def http_version(self) -> str:
         """
@@ -217,9 +366,43 @@ class HTTPXRequest(BaseRequest):
         """
         return self._client.timeout.read
 
+    def _is_unsent_error(self, exc: ZaloError) -> bool:
+        """See :meth:`BaseRequest._is_unsent_error`. Failing to get a connection from the pool
+        or to establish one means that nothing was sent."""
+        return isinstance(
+            exc.__cause__, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+        )
+
+    def _request_size(self, request_data: Optional[RequestData]) -> int:
+        """See :meth:`BaseRequest._request_size`. JSON bodies are measured as sent."""
+        if (
+            request_data is not None
+            and self._body_format == "json"
+            and not request_data.contains_files
+        ):
+            return len(request_data.json_payload)
+        return super()._request_size(request_data)
+
     def _build_client(self) -> httpx.AsyncClient:
         return httpx.AsyncClient(**self._client_kwargs)
 
+    def _copy_for_event_loop(self) -> "HTTPXRequest":
+        """See :meth:`BaseRequest._copy_for_event_loop`. The copy has its own connection pool,
+        but the same settings, retry policy, JSON codec and hooks."""
+        clone = copy.copy(self)
+        clone._client_kwargs = dict(self._client_kwargs)
+        if self._socket_options:
+            clone._client_kwargs["transport"] = httpx.AsyncHTTPTransport(
+                socket_options=self._socket_options
+            )
+        clone._client = clone._build_client()
+        clone._urls = {}
+        clone._admitted = 0
+        clone._admission_waiters = deque()
+        if self._pool_sizer is not None:
+            clone._pool_sizer = PoolSizer(self._pool_sizer.min_size, self._pool_sizer.max_size)
+        return clone
+
     async def initialize(self) -> None:
         """See :meth:`BaseRequest.initialize`."""
         if self._client.is_closed:
@@ -233,6 +416,102 @@ class HTTPXRequest(BaseRequest):
 
         await self._client.aclose()
 
+    def pool_statistics(self) -> Dict[str, Any]:
+        """Current state of the connection pool.
+
+        Returns:
+            Dict[:obj:`str`, any]: A dict with the key ``pool_size``. If
+            :paramref:`max_connection_pool_size` was passed, additionally:
+
+            * ``min_pool_size``/``max_pool_size``: The bounds for ``pool_size``.
+            * ``in_flight``: Number of requests currently being made.
+            * ``pool_timeouts``: Number of requests that timed out waiting for a connection.
+            * ``resizes``: Number of times the pool was resized.
+            * ``pool_wait``: Percentiles of the time in seconds requests waited for a
+              connection, see :meth:`~zalo_bot._utils.stats.Histogram.snapshot`.
+        """
+        if self._pool_sizer is None:
+            return {"pool_size": self._client_kwargs["limits"].max_connections}
+        return self._pool_sizer.statistics()
+
+    def _start_request(self) -> None:
+        self._pool_resized(self._pool_sizer.request_started())  # type: ignore[union-attr]
+
+    def _finish_request(
+        self, admitted: bool, pool_wait: Optional[float], pool_timed_out: bool
+    ) -> None:
+        if admitted:
+            self._admitted -= 1
+        self._pool_resized(
+            self._pool_sizer.request_finished(  # type: ignore[union-attr]
+                pool_wait, pool_timed_out
+            )
+        )
+        self._admit_waiting()
+
+    def _pool_resized(self, size: Optional[int]) -> None:
+        if size is not None:
+            _LOGGER.debug("Resized the connection pool to %s connections", size)
+            self._admit_waiting()
+
+    def _admit_waiting(self) -> None:
+        size = self._pool_sizer.size  # type: ignore[union-attr]
+        while self._admission_waiters and self._admitted < size:
+            self._admission_waiters.popleft().set_result(None)
+            self._admitted += 1
+
+    async def _enter_pool(self, pool_timeout: Optional[float]) -> None:
+        """Wait until fewer requests are in the pool than its current size, in order of arrival.
+
+        The client itself is limited to the maximum pool size, so resizing only changes how many
+        requests are let in. It never replaces the client or closes warm connections.
+        """
+        size = self._pool_sizer.size  # type: ignore[union-attr]
+        if self._admitted < size and not self._admission_waiters:
+            self._admitted += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._admission_waiters.append(waiter)
+        try:
+            await asyncio.wait((waiter,), timeout=pool_timeout)
+        except BaseException:
+            if waiter.done():
+                # We were let in just before being cancelled, so pass the turn on
+                self._admitted -= 1
+                self._admit_waiting()
+            else:
+                self._admission_waiters.remove(waiter)
+            raise
+        if not waiter.done():
+            self._admission_waiters.remove(waiter)
+            err = httpx.PoolTimeout("Timed out waiting for a connection from the pool.")
+            raise self._map_error(err) from err
+
+    async def warm_up(self, url: str, connections: int = 1) -> None:
+        """Open up to :paramref:`connections` connections to the host of :paramref:`url` ahead of
+        time, so that the first requests of a burst don't have to wait for TCP/TLS handshakes.
+
+        The connections are established by sending concurrent ``HEAD`` requests to the origin of
+        :paramref:`url`. Failures are logged and otherwise ignored.
+
+        Args:
+            url (:obj:`str`): Any URL on the host to connect to. Only scheme, host and port are
+                used, so it's safe to pass a URL containing the bot token.
+            connections (:obj:`int`, optional): Number of connections to open. Defaults to ``1``.
+        """
+        if self._client.is_closed:
+            raise RuntimeError("This HTTPXRequest is not initialized!")
+
+        origin = httpx.URL(url).copy_with(path="/", query=None, fragment=None)
+        results = await asyncio.gather(
+            *(self._client.head(origin, headers=self._headers) for _ in range(connections)),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                _LOGGER.debug("Failed to warm up connection to %s: %r", origin.host, result)
+
     async def do_request(
         self,
         url: str,
@@ -247,53 +526,175 @@ class HTTPXRequest(BaseRequest):
         if self._client.is_closed:
             raise RuntimeError("This HTTPXRequest is not initialized!")
 
-        files = request_data.multipart_data if request_data else None
-        data = request_data.json_parameters if request_data else None
+        files = data = content = None
+        headers = self._headers
+        if request_data is not None:
+            if self._body_format == "json" and not request_data.contains_files:
+                content = request_data.json_payload
+                headers = self._json_headers
+            else:
+                files = request_data.multipart_data
+                data = request_data.json_parameters
+
+        timeout = self._resolve_timeout(
+            self._media_timeout if files else self._default_timeout,
+            read_timeout,
+            write_timeout,
+            connect_timeout,
+            pool_timeout,
+        )
+
+        if method == "POST":
+            parsed_url = self._urls.get(url)
+            if parsed_url is None:
+                parsed_url = self._urls[url] = httpx.URL(url)
+        else:
+            parsed_url = httpx.URL(url)
+
+        if self._pool_sizer is None:
+            return await self._send(
+                self._client, method, parsed_url, headers, timeout, files, data, content
+            )
 
+        self._start_request()
+        started = time.monotonic()
+        pool_wait: List[float] = []
+
+        async def trace(  # pylint: disable=unused-argument
+            event_name: str, info: Dict[str, Any]
+        ) -> None:
+            # The first event is emitted once the request got a connection from the pool
+            if not pool_wait:
+                pool_wait.append(time.monotonic() - started)
+
+        admitted = pool_timed_out = False
+        try:
+            await self._enter_pool(timeout.pool)
+            admitted = True
+            return await self._send(
+                self._client, method, parsed_url, headers, timeout, files, data, content, trace
+            )
+        except TimedOut as exc:
+            pool_timed_out = isinstance(exc.__cause__, httpx.PoolTimeout)
+            raise
+        finally:
+            self._finish_request(admitted, pool_wait[0] if pool_wait else None, pool_timed_out)
+
+    @staticmethod
+    def _resolve_timeout(
+        default_timeout: httpx.Timeout,
+        read_timeout: ODVInput[float],
+        write_timeout: ODVInput[float],
+        connect_timeout: ODVInput[float],
+        pool_timeout: ODVInput[float],
+    ) -> httpx.Timeout:
         # If user did not specify timeouts (for e.g. in a bot method), use the default ones when we
         # created this instance.
+        if (
+            isinstance(read_timeout, DefaultValue)
+            and isinstance(write_timeout, DefaultValue)
+            and isinstance(connect_timeout, DefaultValue)
+            and isinstance(pool_timeout, DefaultValue)
+        ):
+            return default_timeout
         if isinstance(read_timeout, DefaultValue):
-            read_timeout = self._client.timeout.read
+            read_timeout = default_timeout.read
+        if isinstance(write_timeout, DefaultValue):
+            write_timeout = default_timeout.write
         if isinstance(connect_timeout, DefaultValue):
-            connect_timeout = self._client.timeout.connect
+            connect_timeout = default_timeout.connect
         if isinstance(pool_timeout, DefaultValue):
-            pool_timeout = self._client.timeout.pool
-
-        if isinstance(write_timeout, DefaultValue):
-            write_timeout = self._client.timeout.write if not files else self._media_write_timeout
-
-        timeout = httpx.Timeout(
+            pool_timeout = default_timeout.pool
+        return httpx.Timeout(
             connect=connect_timeout,
             read=read_timeout,
             write=write_timeout,
             pool=pool_timeout,
         )
 
+    @contextlib.asynccontextmanager
+    async def do_stream_request(
+        self,
+        url: str,
+        chunk_size: int,
+        read_timeout: ODVInput[float] = BaseRequest.DEFAULT_NONE,
+        write_timeout: ODVInput[float] = BaseRequest.DEFAULT_NONE,
+        connect_timeout: ODVInput[float] = BaseRequest.DEFAULT_NONE,
+        pool_timeout: ODVInput[float] = BaseRequest.DEFAULT_NONE,
+    ) -> AsyncIterator[Tuple[int, AsyncIterator[bytes]]]:
+        """See :meth:`BaseRequest.do_stream_request`. Reads the response body from the socket
+        as it is consumed."""
+        if self._client.is_closed:
+            raise RuntimeError("This HTTPXRequest is not initialized!")
+
+        timeout = self._resolve_timeout(
+            self._default_timeout, read_timeout, write_timeout, connect_timeout, pool_timeout
+        )
+        admitted = pool_timed_out = False
+        if self._pool_sizer is not None:
+            self._start_request()
         try:
-            res = await self._client.request(
+            if self._pool_sizer is not None:
+                # Downloads stay in the pool until the body is read
+                await self._enter_pool(timeout.pool)
+                admitted = True
+            async with self._client.stream(
+                "GET", url, headers=self._headers, timeout=timeout
+            ) as response:
+                yield response.status_code, response.aiter_bytes(chunk_size)
+        except httpx.HTTPError as err:
+            pool_timed_out = isinstance(err, httpx.PoolTimeout)
+            raise self._map_error(err) from err
+        except TimedOut as exc:
+            pool_timed_out = isinstance(exc.__cause__, httpx.PoolTimeout)
+            raise
+        finally:
+            if self._pool_sizer is not None:
+                self._finish_request(admitted, None, pool_timed_out)
+
+    @staticmethod
+    def _map_error(err: httpx.HTTPError) -> ZaloError:
+        if isinstance(err, httpx.PoolTimeout):
+            return TimedOut(
+                message=(
+                    "Pool timeout: All connections in the connection pool are occupied. "
+                    "Request was *not* sent to Zalo Bot. Consider adjusting the connection "
+                    "pool size or the pool timeout."
+                )
+            )
+        if isinstance(err, httpx.TimeoutException):
+            return TimedOut()
+        # HTTPError must come last as its the base httpx exception class
+        # TODO p4: do something smart here; for now just raise NetworkError
+
+        # We include the class name for easier debugging. Especially useful if the error
+        # message of `err` is empty.
+        return NetworkError(f"httpx.{err.__class__.__name__}: {err}")
+
+    @staticmethod
+    async def _send(
+        client: httpx.AsyncClient,
+        method: str,
+        url: httpx.URL,
+        headers: Dict[str, str],
+        timeout: httpx.Timeout,
+        files: Optional[UploadFileDict],
+        data: Optional[Dict[str, str]],
+        content: Optional[bytes],
+        trace: Optional[Callable[[str, Dict[str, Any]], Awaitable[None]]] = None,
+    ) -> Tuple[int, bytes]:
+        try:
+            res = await client.request(
                 method=method,
                 url=url,
-                headers={"User-Agent": self.USER_AGENT, "Connection": "close"},
+                headers=headers,
                 timeout=timeout,
                 files=files,
                 data=data,
+                content=content,
+                extensions={"trace": trace} if trace else None,
             )
-        except httpx.TimeoutException as err:
-            if isinstance(err, httpx.PoolTimeout):
-                raise TimedOut(
-                    message=(
-                        "Pool timeout: All connections in the connection pool are occupied. "
-                        "Request was *not* sent to Zalo Bot. Consider adjusting the connection "
-                        "pool size or the pool timeout."
-                    )
-                ) from err
-            raise TimedOut from err
         except httpx.HTTPError as err:
-            # HTTPError must come last as its the base httpx exception class
-            # TODO p4: do something smart here; for now just raise NetworkError
-
-            # We include the class name for easier debugging. Especially useful if the error
-            # message of `err` is empty.
-            raise NetworkError(f"httpx.{err.__class__.__name__}: {err}") from err
+            raise HTTPXRequest._map_error(err) from err
 
         return res.status_code, res.content
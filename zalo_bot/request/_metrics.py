@@ -0,0 +1,114 @@
+"""This module contains an in-memory collector of request metrics."""
+from typing import Any, Dict, Optional
+
+from zalo_bot._utils.stats import Histogram
+from zalo_bot.request._hooks import RequestEvent, RequestHook
+
+
+class _EndpointMetrics:
+    __slots__ = (
+        "bytes_received",
+        "bytes_sent",
+        "errors",
+        "latency",
+        "requests",
+        "retries",
+        "statuses",
+    )
+
+    def __init__(self) -> None:
+        self.latency = Histogram()
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.statuses: Dict[int, int] = {}
+
+
+class MetricsCollector(RequestHook):
+    """Collects latency, status code, payload size and retry metrics per API method in memory.
+
+    Example:
+        .. code:: python
+
+            metrics = MetricsCollector()
+            bot.request.add_hook(metrics)
+            ...
+            for endpoint, stats in metrics.statistics().items():
+                export(endpoint, p50=stats["latency"]["p50"], p99=stats["latency"]["p99"])
+
+    Latency percentiles are estimated with fixed buckets that double in size, from 0.5 ms to
+    ~65 s, see :meth:`statistics`.
+    """
+
+    __slots__ = ("_endpoints",)
+
+    def __init__(self) -> None:
+        self._endpoints: Dict[str, _EndpointMetrics] = {}
+
+    def _get(self, event: RequestEvent) -> _EndpointMetrics:
+        # File downloads have no endpoint
+        name = event.endpoint or "download"
+        metrics = self._endpoints.get(name)
+        if metrics is None:
+            metrics = self._endpoints[name] = _EndpointMetrics()
+        return metrics
+
+    def _record(self, event: RequestEvent) -> _EndpointMetrics:
+        metrics = self._get(event)
+        metrics.requests += 1
+        if event.attempt > 1:
+            metrics.retries += 1
+        if event.duration is not None:
+            metrics.latency.observe(event.duration)
+        metrics.bytes_sent += event.bytes_sent
+        if event.bytes_received is not None:
+            metrics.bytes_received += event.bytes_received
+        if event.status_code is not None:
+            metrics.statuses[event.status_code] = metrics.statuses.get(event.status_code, 0) + 1
+        return metrics
+
+    def after_response(self, event: RequestEvent) -> None:
+        self._record(event)
+
+    def on_error(self, event: RequestEvent) -> None:
+        self._record(event).errors += 1
+
+    def percentile(self, endpoint: str, percent: float) -> Optional[float]:
+        """Estimated latency percentile in seconds for :paramref:`endpoint`, or :obj:`None` if
+        there were no requests to it."""
+        metrics = self._endpoints.get(endpoint)
+        return metrics.latency.percentile(percent) if metrics else None
+
+    def statistics(self) -> Dict[str, Dict[str, Any]]:
+        """Metrics per API method since creation or the last :meth:`reset`.
+
+        Returns:
+            Dict[:obj:`str`, Dict[:obj:`str`, any]]: Maps the API method (``"download"`` for
+            file downloads) to a dict with the keys
+
+            * ``requests``: Number of attempts, including retries.
+            * ``errors``: Number of attempts that failed.
+            * ``retries``: Number of attempts that were retries.
+            * ``bytes_sent``/``bytes_received``: Total payload sizes in bytes.
+            * ``status_codes``: Number of responses per HTTP status code.
+            * ``latency``: ``count``, ``sum``, ``mean``, ``max``, ``p50``, ``p90`` and ``p99``
+              of the attempt durations in seconds.
+        """
+        return {
+            endpoint: {
+                "requests": metrics.requests,
+                "errors": metrics.errors,
+                "retries": metrics.retries,
+                "bytes_sent": metrics.bytes_sent,
+                "bytes_received": metrics.bytes_received,
+                "status_codes": dict(metrics.statuses),
+                "latency": metrics.latency.snapshot(),
+            }
+            for endpoint, metrics in self._endpoints.items()
+        }
+
+    def reset(self) -> None:
+        """Forget all collected metrics."""
+        self._endpoints.clear()
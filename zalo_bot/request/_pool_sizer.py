@@ -0,0 +1,111 @@
+"""This module contains the policy for adapting the connection pool size of
+:class:`zalo_bot.request.HTTPXRequest` to the load."""
+import time
+from typing import Dict, Optional, Union
+
+from zalo_bot._utils.stats import Histogram
+
+
+class PoolSizer:
+    """Decides when the connection pool should grow or shrink.
+
+    The pool grows (doubling, or straight to the number of requests in flight if that is
+    larger) as soon as more requests are in flight than there are connections, a request had
+    to wait for a connection for at least :paramref:`grow_wait` seconds or a request failed
+    with a pool timeout. It shrinks by half if for :paramref:`shrink_after` seconds at most
+    half of the connections were in use at the same time.
+
+    Warning:
+        This class is intended to be used internally by the library and *not* by the user.
+
+    Args:
+        min_size (:obj:`int`): Lower bound and initial size.
+        max_size (:obj:`int`): Upper bound.
+        grow_wait (:obj:`float`, optional): Pool wait in seconds that triggers growth.
+        shrink_after (:obj:`float`, optional): Length in seconds of the window for shrinking.
+    """
+
+    __slots__ = (
+        "_peak_in_flight",
+        "_saturated",
+        "_window_started",
+        "grow_wait",
+        "in_flight",
+        "max_size",
+        "min_size",
+        "pool_timeouts",
+        "pool_wait",
+        "resizes",
+        "shrink_after",
+        "size",
+    )
+
+    def __init__(
+        self, min_size: int, max_size: int, grow_wait: float = 0.05, shrink_after: float = 30.0
+    ):
+        if not 0 < min_size <= max_size:
+            raise ValueError("The pool size bounds must satisfy 0 < min_size <= max_size.")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.grow_wait = grow_wait
+        self.shrink_after = shrink_after
+        self.size = min_size
+        self.in_flight = 0
+        self.pool_timeouts = 0
+        self.resizes = 0
+        self.pool_wait = Histogram()
+        self._saturated = False
+        self._peak_in_flight = 0
+        self._window_started = time.monotonic()
+
+    def request_started(self) -> Optional[int]:
+        """Record a new request. Returns the new pool size, if the pool should grow."""
+        self.in_flight += 1
+        self._peak_in_flight = max(self._peak_in_flight, self.in_flight)
+        if self.in_flight > self.size:
+            self._saturated = True
+        return self._propose()
+
+    def request_finished(self, pool_wait: Optional[float], pool_timed_out: bool) -> Optional[int]:
+        """Record a finished request and how long it waited for a connection. Returns the new
+        pool size, if it should change."""
+        self.in_flight -= 1
+        if pool_wait is not None:
+            self.pool_wait.observe(pool_wait)
+            if pool_wait >= self.grow_wait:
+                self._saturated = True
+        if pool_timed_out:
+            self.pool_timeouts += 1
+            self._saturated = True
+        return self._propose()
+
+    def _propose(self) -> Optional[int]:
+        now = time.monotonic()
+        new_size = self.size
+        if self._saturated:
+            new_size = min(self.max_size, max(2 * self.size, self.in_flight))
+        elif now - self._window_started >= self.shrink_after:
+            if 2 * self._peak_in_flight <= self.size:
+                new_size = max(self.min_size, self.size // 2)
+        else:
+            return None
+
+        self._saturated = False
+        self._peak_in_flight = self.in_flight
+        self._window_started = now
+        if new_size == self.size:
+            return None
+        self.size = new_size
+        self.resizes += 1
+        return new_size
+
+    def statistics(self) -> Dict[str, Union[int, Dict[str, Optional[float]]]]:
+        return {
+            "pool_size": self.size,
+            "min_pool_size": self.min_size,
+            "max_pool_size": self.max_size,
+            "in_flight": self.in_flight,
+            "pool_timeouts": self.pool_timeouts,
+            "resizes": self.resizes,
+            "pool_wait": self.pool_wait.snapshot(),
+        }
@@ -1,9 +1,8 @@
 """This module contains a class that holds the parameters of a request to the Bot API."""
-import json
 from typing import Any, Dict, List, Optional, Union, final
 from urllib.parse import urlencode
 
-from zalo_bot._utils.strings import TextEncoding
+from zalo_bot._utils.json_codec import DEFAULT_CODEC, JSONCodec
 from zalo_bot._utils.types import UploadFileDict
 from zalo_bot.request._request_parameter import RequestParameter
 
@@ -18,16 +17,44 @@ class RequestData:
         and not part of PTBs public API. Users should exclusively rely on the documented
         attributes, properties and methods.
 
+    Note:
+        The parameters are fixed at construction and the derived views (:attr:`parameters`,
+        :attr:`json_parameters`, :attr:`json_payload` and :attr:`multipart_data`) are computed
+        on first access and cached, e.g. for retries. Don't modify the returned objects.
+
+    Args:
+        parameters (List[:class:`zalo_bot.request.RequestParameter`], optional): The parameters.
+        json_codec (:class:`zalo_bot.request.JSONCodec`, optional): The codec used for
+            :attr:`json_parameters` and :attr:`json_payload`. Defaults to the standard library.
+
     Attributes:
         contains_files (:obj:`bool`): Whether this object contains files to be uploaded via
             ``multipart/form-data``.
+        json_codec (:class:`zalo_bot.request.JSONCodec`): The codec used for JSON encoding.
     """
 
-    __slots__ = ("_parameters", "contains_files")
-
-    def __init__(self, parameters: Optional[List[RequestParameter]] = None):
+    __slots__ = (
+        "_json_parameters",
+        "_json_payload",
+        "_multipart_data",
+        "_parameters",
+        "_parameters_dict",
+        "contains_files",
+        "json_codec",
+    )
+
+    def __init__(
+        self,
+        parameters: Optional[List[RequestParameter]] = None,
+        json_codec: Optional[JSONCodec] = None,
+    ):
         self._parameters: List[RequestParameter] = parameters or []
+        self.json_codec: JSONCodec = json_codec or DEFAULT_CODEC
         self.contains_files: bool = any(param.input_files for param in self._parameters)
+        self._parameters_dict: Optional[Dict[str, Any]] = None
+        self._json_parameters: Optional[Dict[str, str]] = None
+        self._json_payload: Optional[bytes] = None
+        self._multipart_data: Optional[UploadFileDict] = None
 
     @property
     def parameters(self) -> Dict[str, Union[str, int, List[Any], Dict[Any, Any]]]:
@@ -39,11 +66,13 @@ class RequestData:
         Returns:
             Dict[:obj:`str`, Union[:obj:`str`, :obj:`int`, List[any], Dict[any, any]]]
         """
-        return {
-            param.name: param.value  # type: ignore[misc]
-            for param in self._parameters
-            if param.value is not None
-        }
+        if self._parameters_dict is None:
+            self._parameters_dict = {
+                param.name: param.value  # type: ignore[misc]
+                for param in self._parameters
+                if param.value is not None
+            }
+        return self._parameters_dict
 
     @property
     def json_parameters(self) -> Dict[str, str]:
@@ -51,18 +80,19 @@ class RequestData:
         value.
 
         Tip:
-            By default, this property uses the standard library's :func:`json.dumps`.
-            To use a custom library for JSON encoding, you can directly encode the keys of
-            :attr:`parameters` - note that string valued keys should not be JSON encoded.
+            Values are encoded with :attr:`json_codec`.
 
         Returns:
             Dict[:obj:`str`, :obj:`str`]
         """
-        return {
-            param.name: param.json_value
-            for param in self._parameters
-            if param.json_value is not None
-        }
+        if self._json_parameters is None:
+            json_parameters = {}
+            for param in self._parameters:
+                json_value = param.encode_json(self.json_codec)
+                if json_value is not None:
+                    json_parameters[param.name] = json_value
+            self._json_parameters = json_parameters
+        return self._json_parameters
 
     def url_encoded_parameters(self, encode_kwargs: Optional[Dict[str, Any]] = None) -> str:
         """Encodes the parameters with :func:`urllib.parse.urlencode`.
@@ -95,24 +125,28 @@ class RequestData:
 
     @property
     def json_payload(self) -> bytes:
-        """The :attr:`parameters` as UTF-8 encoded JSON payload.
+        """The :attr:`parameters` as UTF-8 encoded JSON payload. Unlike in
+        :attr:`json_parameters`, values keep their JSON types, e.g. lists are not encoded as
+        strings.
 
         Tip:
-            By default, this property uses the standard library's :func:`json.dumps`.
-            To use a custom library for JSON encoding, you can directly encode the keys of
-            :attr:`parameters` - note that string valued keys should not be JSON encoded.
+            The payload is encoded with :attr:`json_codec`.
 
         Returns:
             :obj:`bytes`
         """
-        return json.dumps(self.json_parameters).encode(TextEncoding.UTF_8)
+        if self._json_payload is None:
+            self._json_payload = self.json_codec.dumps_bytes(self.parameters)
+        return self._json_payload
 
     @property
     def multipart_data(self) -> UploadFileDict:
         """Gives the files contained in this object as mapping of part name to encoded content."""
-        multipart_data: UploadFileDict = {}
-        for param in self._parameters:
-            m_data = param.multipart_data
-            if m_data:
-                multipart_data.update(m_data)
-        return multipart_data
+        if self._multipart_data is None:
+            multipart_data: UploadFileDict = {}
+            for param in self._parameters:
+                m_data = param.multipart_data
+                if m_data:
+                    multipart_data.update(m_data)
+            self._multipart_data = multipart_data
+        return self._multipart_data
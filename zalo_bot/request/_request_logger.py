@@ -0,0 +1,132 @@
+"""This module contains the logging of the calls of :class:`zalo_bot.Bot` to the Bot API."""
+import logging
+import random
+import reprlib
+from typing import Optional, Sequence
+
+from zalo_bot._utils.logging import get_logger
+
+_LOGGER = get_logger(__name__, class_name="RequestLogger")
+_REDACTED = "<redacted>"
+
+
+class _RedactingRepr(reprlib.Repr):
+    def __init__(self) -> None:
+        super().__init__()
+        self.secrets: Sequence[str] = ()
+
+    def repr_str(self, x: str, level: int) -> str:
+        # Before reprlib cuts out the middle of long strings, which could split a secret
+        for secret in self.secrets:
+            x = x.replace(secret, _REDACTED)
+        return super().repr_str(x, level)
+
+
+class RequestLogger:
+    """Logs the calls to the Bot API at low cost, so that it can be left on in production.
+
+    For each call, :class:`zalo_bot.Bot` logs the parameters and the result. The following
+    keeps this cheap:
+
+    * Nothing is formatted unless the logger is enabled for :paramref:`level`.
+    * Only a fraction :paramref:`sample_rate` of the calls is logged.
+    * Parameters and results are formatted with :mod:`reprlib`, so that long strings and
+      collections are cut while formatting, instead of formatting everything and truncating
+      afterwards. The final message is additionally cut to :paramref:`max_length` characters.
+
+    Secrets, like the bot token, are replaced by ``<redacted>``. The records carry the
+    attributes ``endpoint`` and ``direction`` (``"request"`` or ``"response"``) for structured
+    log handlers.
+
+    Args:
+        logger (:class:`logging.Logger`, optional): The logger to use. The logger created by
+            :class:`zalo_bot.Bot` if none is passed to it uses the bot's logger.
+        level (:obj:`int`, optional): The log level. Defaults to :const:`logging.DEBUG`.
+        sample_rate (:obj:`float`, optional): Fraction of the calls to log, between ``0`` and
+            ``1``. Defaults to ``1``.
+        max_length (:obj:`int`, optional): Maximum length of the formatted parameters and
+            results. Defaults to ``1000``.
+        secrets (Sequence[:obj:`str`], optional): Strings to redact. :class:`zalo_bot.Bot`
+            adds its token.
+
+    Raises:
+        :exc:`ValueError`: If :paramref:`sample_rate` is not between ``0`` and ``1`` or
+            :paramref:`max_length` is not positive.
+    """
+
+    __slots__ = ("_repr", "level", "logger", "max_length", "sample_rate")
+
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        level: int = logging.DEBUG,
+        sample_rate: float = 1.0,
+        max_length: int = 1000,
+        secrets: Sequence[str] = (),
+    ):
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("`sample_rate` must be between 0 and 1.")
+        if max_length <= 0:
+            raise ValueError("`max_length` must be positive.")
+        self.logger: logging.Logger = logger or _LOGGER
+        self.level: int = level
+        self.sample_rate: float = sample_rate
+        self.max_length: int = max_length
+        self._repr = _RedactingRepr()
+        self._repr.maxlevel = 4
+        self._repr.maxdict = self._repr.maxlist = self._repr.maxtuple = 20
+        self._repr.maxstring = self._repr.maxother = max_length
+        self._repr.secrets = tuple(secrets)
+
+    @property
+    def secrets(self) -> Sequence[str]:
+        """Sequence[:obj:`str`]: The strings that are redacted."""
+        return self._repr.secrets
+
+    def add_secret(self, secret: str) -> None:
+        """Add a string to redact from the logged messages."""
+        if secret and secret not in self.secrets:
+            self._repr.secrets = (*self._repr.secrets, secret)
+
+    def sample(self) -> bool:
+        """Decide whether the current call is logged. Checks the log level first, so that a
+        disabled logger costs one method call.
+
+        Returns:
+            :obj:`bool`
+        """
+        if not self.logger.isEnabledFor(self.level):
+            return False
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def format(self, obj: object) -> str:
+        """Format :paramref:`obj` for a log message, truncated and with secrets redacted."""
+        text = self._repr.repr(obj)
+        # Secrets may also be contained in the repr of other objects
+        for secret in self.secrets:
+            text = text.replace(secret, _REDACTED)
+        if len(text) > self.max_length:
+            text = f"{text[: self.max_length]}..."
+        return text
+
+    def log_request(self, endpoint: str, data: object) -> None:
+        """Log the call of :paramref:`endpoint` with the parameters :paramref:`data`. Call only
+        if :meth:`sample` returned :obj:`True`."""
+        self.logger.log(
+            self.level,
+            "Calling Bot API endpoint `%s` with parameters `%s`",
+            endpoint,
+            self.format(data),
+            extra={"endpoint": endpoint, "direction": "request"},
+        )
+
+    def log_response(self, endpoint: str, result: object) -> None:
+        """Log the :paramref:`result` of a call of :paramref:`endpoint`. Call only if
+        :meth:`sample` returned :obj:`True`."""
+        self.logger.log(
+            self.level,
+            "Call to Bot API endpoint `%s` finished with return value `%s`",
+            endpoint,
+            self.format(result),
+            extra={"endpoint": endpoint, "direction": "response"},
+        )
@@ -1,5 +1,4 @@
 """This module contains a class that describes a single parameter of a request to the Bot API."""
-import json
 from dataclasses import dataclass
 from datetime import datetime
 from typing import List, Optional, Sequence, Tuple, final
@@ -10,8 +9,12 @@ from zalo_bot._files.input_sticker import InputSticker
 from zalo_bot._zalo_object import ZaloObject
 from zalo_bot._utils.datetime import to_timestamp
 from zalo_bot._utils.enum import StringEnum
+from zalo_bot._utils.json_codec import DEFAULT_CODEC, JSONCodec
 from zalo_bot._utils.types import UploadFileDict
 
+# Values of exactly these types are sent as they are. Subclasses like StringEnum are not
+_PLAIN_TYPES = frozenset((str, int, float, bool))
+
 
 @final
 @dataclass(repr=True, eq=False, order=False, frozen=True)
@@ -49,11 +52,15 @@ class RequestParameter:
         The latter can currently only happen if :attr:`input_files` has exactly one element that
         must not be uploaded via an attach:// URI.
         """
+        return self.encode_json(DEFAULT_CODEC)
+
+    def encode_json(self, json_codec: JSONCodec) -> Optional[str]:
+        """Like :attr:`json_value`, but encoded with the given codec."""
         if isinstance(self.value, str):
             return self.value
         if self.value is None:
             return None
-        return json.dumps(self.value)
+        return json_codec.dumps(self.value)
 
     @property
     def multipart_data(self) -> Optional[UploadFileDict]:
@@ -129,6 +136,9 @@ class RequestParameter:
         """Builds an instance of this class for a given key-value pair that represents the raw
         input as passed along from a method of :class:`zalo_bot.Bot`.
         """
+        if type(value) in _PLAIN_TYPES:
+            # Fast path for the vast majority of parameters
+            return RequestParameter(name=key, value=value, input_files=None)
         if not isinstance(value, (str, bytes)) and isinstance(value, Sequence):
             param_values = []
             input_files = []
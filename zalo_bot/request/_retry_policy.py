@@ -0,0 +1,161 @@
+"""This module contains a class that decides whether failed requests to the Bot API are
+retried."""
+import random
+from typing import Collection, Dict, FrozenSet, Optional
+
+from zalo_bot.error import BadRequest, NetworkError, ZaloError
+
+
+class RetryPolicy:
+    """Retry policy for :class:`zalo_bot.request.BaseRequest`.
+
+    Transient failures (:class:`~zalo_bot.error.NetworkError` and its subclass
+    :class:`~zalo_bot.error.TimedOut`, including ``5xx`` answers, but not
+    :class:`~zalo_bot.error.BadRequest`) are retried with exponential backoff.
+
+    Requests to endpoints that are not listed in :paramref:`idempotent_endpoints` (e.g.
+    ``sendMessage``) are only retried if the request provably never reached the server, e.g.
+    because no connection could be established. Otherwise a retry could deliver the message
+    twice.
+
+    To avoid a thundering herd of retries when the Bot API is down, retries draw from a
+    budget: every retry costs one token, every request that succeeds on its first attempt
+    refunds :paramref:`budget_refill_ratio` tokens, up to :paramref:`retry_budget`.
+
+    Args:
+        max_attempts (:obj:`int`, optional): Maximum number of attempts per request, including
+            the first one. Defaults to ``3``.
+        base_delay (:obj:`float`, optional): Delay in seconds before the first retry.
+            Defaults to ``0.5``.
+        max_delay (:obj:`float`, optional): Upper bound for the delay in seconds. Defaults
+            to ``10``.
+        multiplier (:obj:`float`, optional): Factor the delay grows by with every retry.
+            Defaults to ``2``.
+        jitter (:obj:`bool`, optional): Whether to pick the actual delay uniformly at random
+            between ``0`` and the computed delay ("full jitter"). Defaults to :obj:`True`.
+        idempotent_endpoints (Collection[:obj:`str`], optional): Bot API methods which may be
+            retried after any transient error. Defaults to
+            :attr:`DEFAULT_IDEMPOTENT_ENDPOINTS`.
+        retry_budget (:obj:`float`, optional): Maximum number of retry tokens. Defaults to
+            ``10``.
+        budget_refill_ratio (:obj:`float`, optional): Tokens refunded per successful request.
+            Defaults to ``0.1``, i.e. at most one retry per ten successful requests in the
+            long run.
+    """
+
+    __slots__ = (
+        "_budget",
+        "_stats",
+        "base_delay",
+        "budget_refill_ratio",
+        "idempotent_endpoints",
+        "jitter",
+        "max_attempts",
+        "max_delay",
+        "multiplier",
+        "retry_budget",
+    )
+
+    DEFAULT_IDEMPOTENT_ENDPOINTS: FrozenSet[str] = frozenset(
+        {
+            "deleteWebhook",
+            "getMe",
+            "getUpdates",
+            "getWebhookInfo",
+            "sendChatAction",
+            "setWebhook",
+        }
+    )
+    """FrozenSet[:obj:`str`]: Bot API methods that can safely be called more than once."""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 10.0,
+        multiplier: float = 2.0,
+        jitter: bool = True,
+        idempotent_endpoints: Optional[Collection[str]] = None,
+        retry_budget: float = 10.0,
+        budget_refill_ratio: float = 0.1,
+    ):
+        if max_attempts < 1:
+            raise ValueError("`max_attempts` must be at least 1.")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.idempotent_endpoints: FrozenSet[str] = (
+            self.DEFAULT_IDEMPOTENT_ENDPOINTS
+            if idempotent_endpoints is None
+            else frozenset(idempotent_endpoints)
+        )
+        self.retry_budget = retry_budget
+        self.budget_refill_ratio = budget_refill_ratio
+        self._budget = retry_budget
+        self._stats: Dict[str, int] = dict.fromkeys(
+            ("retries", "budget_exhausted", "attempts_exhausted"), 0
+        )
+
+    @property
+    def budget(self) -> float:
+        """:obj:`float`: Number of retry tokens currently available."""
+        return self._budget
+
+    def is_retryable(self, endpoint: Optional[str], exc: ZaloError, unsent: bool) -> bool:
+        """Whether :paramref:`exc` is a transient error after which the request may be repeated.
+
+        Args:
+            endpoint (:obj:`str` | :obj:`None`): The Bot API method, or :obj:`None` for file
+                downloads, which are always idempotent.
+            exc (:class:`zalo_bot.error.ZaloError`): The error raised by the request.
+            unsent (:obj:`bool`): Whether the backend guarantees that the request never
+                reached the server.
+        """
+        if not isinstance(exc, NetworkError) or isinstance(exc, BadRequest):
+            return False
+        return unsent or endpoint is None or endpoint in self.idempotent_endpoints
+
+    def get_delay(self, attempt: int) -> float:
+        """Delay in seconds before attempt number ``attempt + 1``."""
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        return random.uniform(0, delay) if self.jitter else delay  # noqa: S311
+
+    def next_delay(
+        self, endpoint: Optional[str], exc: ZaloError, attempt: int, unsent: bool = False
+    ) -> Optional[float]:
+        """Decide whether to retry after attempt number :paramref:`attempt` failed with
+        :paramref:`exc`. If so, a retry token is consumed.
+
+        Returns:
+            :obj:`float` | :obj:`None`: The delay in seconds before the next attempt or
+            :obj:`None` if the error should be raised.
+        """
+        if not self.is_retryable(endpoint, exc, unsent):
+            return None
+        if attempt >= self.max_attempts:
+            self._stats["attempts_exhausted"] += 1
+            return None
+        if self._budget < 1:
+            self._stats["budget_exhausted"] += 1
+            return None
+        self._budget -= 1
+        self._stats["retries"] += 1
+        return self.get_delay(attempt)
+
+    def record_success(self) -> None:
+        """Refund part of a retry token. Called for requests that succeeded on the first
+        attempt."""
+        self._budget = min(self.retry_budget, self._budget + self.budget_refill_ratio)
+
+    def statistics(self) -> Dict[str, float]:
+        """Retry counters since creation.
+
+        Returns:
+            Dict[:obj:`str`, :obj:`float`]: A dict with the keys ``retries`` (retries made),
+            ``budget_exhausted`` (retries refused because the budget was empty),
+            ``attempts_exhausted`` (requests that failed after :attr:`max_attempts` attempts)
+            and ``budget`` (currently available retry tokens).
+        """
+        return {**self._stats, "budget": self._budget}
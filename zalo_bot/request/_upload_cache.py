@@ -0,0 +1,290 @@
+"""This module contains a cache that avoids uploading the same file content repeatedly."""
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from zalo_bot._files.input_file import InputFile
+from zalo_bot._utils.logging import get_logger
+from zalo_bot._utils.types import FilePathInput, JSONDict
+
+_LOGGER = get_logger(__name__, class_name="UploadCache")
+_HASH_CHUNK_SIZE = 1024 * 1024
+# Contents up to this size are hashed in the event loop, a worker thread costs more
+_INLINE_HASH_SIZE = 64 * 1024
+
+
+class UploadCache:
+    """Remembers which file id or URL the Bot API returned for uploaded file contents, so that
+    sending the same content again references the file on the server instead of uploading it.
+
+    Pass an instance to :paramref:`zalo_bot.Bot.upload_cache`. When a :class:`zalo_bot.InputFile`
+    is passed to a method of :class:`zalo_bot.Bot`, its content is hashed with SHA-256. If the
+    same content was uploaded for the same parameter before, the value returned by the server
+    (e.g. :attr:`zalo_bot.Message.photo_url` for ``photo``) is sent instead. Otherwise, the file
+    is uploaded and the value from the response is remembered.
+
+    Note:
+        Contents of file handles that are not read on initialization of the
+        :class:`~zalo_bot.InputFile` are hashed only if the handle is seekable. Files given by
+        path are hashed once per modification time and size. Files, handles and large contents
+        are hashed in a worker thread, so they don't block the event loop.
+
+    Args:
+        max_size (:obj:`int`, optional): Maximum number of entries. The least recently used
+            entries are evicted first. Defaults to ``1024``.
+        path (:obj:`str` | :class:`pathlib.Path`, optional): JSON file to persist the entries
+            in. It is loaded on creation if it exists. Entries added in an event loop are written
+            in a worker thread at most every :paramref:`save_delay` seconds, see :meth:`flush`.
+            Outside of an event loop, the file is rewritten whenever an entry is added.
+        save_delay (:obj:`float`, optional): Seconds to collect new entries for before writing
+            them to :paramref:`path`. Defaults to ``1``.
+
+    Raises:
+        :exc:`ValueError`: If :paramref:`max_size` is not positive.
+    """
+
+    __slots__ = (
+        "_digests",
+        "_dirty",
+        "_entries",
+        "_save_executor",
+        "_save_task",
+        "hits",
+        "max_size",
+        "misses",
+        "path",
+        "save_delay",
+    )
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        path: Optional[FilePathInput] = None,
+        save_delay: float = 1.0,
+    ):
+        if max_size <= 0:
+            raise ValueError("`max_size` must be positive.")
+        self.max_size: int = max_size
+        self.path: Optional[Path] = Path(path) if path is not None else None
+        self.save_delay: float = save_delay
+        # Entries not yet written to path and the task that will write them
+        self._dirty: bool = False
+        self._save_task: Optional[asyncio.Task] = None
+        # A single thread, so the writes are applied in the order they were made
+        self._save_executor: Optional[ThreadPoolExecutor] = None
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        # Digests of local files by (path, size, mtime), so unchanged files aren't read again
+        self._digests: "OrderedDict[Tuple[Path, int, int], str]" = OrderedDict()
+
+        if self.path is not None and self.path.exists():
+            try:
+                entries = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as exc:
+                _LOGGER.warning("Ignoring unreadable upload cache %s: %r", self.path, exc)
+            else:
+                self._entries.update(entries)
+                self._evict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    @staticmethod
+    def _file_key(path: Path) -> Tuple[Path, int, int]:
+        stat = path.stat()
+        return path.resolve(), stat.st_size, stat.st_mtime_ns
+
+    @staticmethod
+    def _hash_file(path: Path) -> str:
+        sha = hashlib.sha256()
+        with path.open("rb") as file:
+            for chunk in iter(lambda: file.read(_HASH_CHUNK_SIZE), b""):
+                sha.update(chunk)
+        return sha.hexdigest()
+
+    def _remember_digest(self, key: Tuple[Path, int, int], digest: str) -> None:
+        self._digests[key] = digest
+        if len(self._digests) > self.max_size:
+            self._digests.popitem(last=False)
+
+    def _path_digest(self, path: Path) -> str:
+        key = self._file_key(path)
+        digest = self._digests.get(key)
+        if digest is None:
+            digest = self._hash_file(path)
+            self._remember_digest(key, digest)
+        return digest
+
+    async def _digest_in_thread(self, input_file: InputFile) -> Optional[str]:
+        content = input_file.input_file_content
+        if isinstance(content, bytes) and len(content) <= _INLINE_HASH_SIZE:
+            return hashlib.sha256(content).hexdigest()
+        loop = asyncio.get_running_loop()
+        if not isinstance(content, Path):
+            return await loop.run_in_executor(None, self.digest, input_file)
+        # Only the file system is accessed in the thread, the digests are updated here
+        key = await loop.run_in_executor(None, self._file_key, content)
+        digest = self._digests.get(key)
+        if digest is None:
+            digest = await loop.run_in_executor(None, self._hash_file, content)
+            self._remember_digest(key, digest)
+        return digest
+
+    def digest(self, input_file: InputFile) -> Optional[str]:
+        """The SHA-256 hex digest of the contents of :paramref:`input_file` or :obj:`None` if
+        it can't be hashed without consuming it."""
+        content = input_file.input_file_content
+        if isinstance(content, bytes):
+            return hashlib.sha256(content).hexdigest()
+        if isinstance(content, Path):
+            return self._path_digest(content)
+        try:
+            if not content.seekable():
+                return None
+            # The whole content is uploaded, regardless of the current position
+            position = content.tell()
+            content.seek(0)
+            sha = hashlib.sha256()
+            for chunk in iter(lambda: content.read(_HASH_CHUNK_SIZE), b""):  # type: ignore
+                sha.update(chunk)
+            content.seek(position)
+        except (AttributeError, OSError):
+            return None
+        return sha.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """The value remembered for :paramref:`key`, if any. Marks it as recently used."""
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: str) -> None:
+        """Remember :paramref:`value` for :paramref:`key` and persist the entries if
+        :paramref:`path` was passed."""
+        if self._entries.get(key) == value:
+            self._entries.move_to_end(key)
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        self._evict()
+        if self.path is not None:
+            self._schedule_save()
+
+    def _schedule_save(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.save()
+            return
+        self._dirty = True
+        if self._save_task is None or self._save_task.done():
+            self._save_task = loop.create_task(self._save_later())
+
+    async def _save_later(self) -> None:
+        # Entries added while waiting or writing are written by the next round. flush() takes
+        # over by resetting _save_task.
+        while self._dirty and self._save_task is asyncio.current_task():
+            await asyncio.sleep(self.save_delay)
+            await self._write_entries()
+
+    async def _write_entries(self) -> None:
+        self._dirty = False
+        text = json.dumps(self._entries)
+        if self._save_executor is None:
+            self._save_executor = ThreadPoolExecutor(1, thread_name_prefix="UploadCache")
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                self._save_executor, self._write, text
+            )
+        except OSError as exc:
+            _LOGGER.warning("Failed to save the upload cache to %s: %r", self.path, exc)
+
+    def _write(self, text: str) -> None:
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")  # type: ignore[union-attr]
+        tmp_path.write_text(text, encoding="utf-8")
+        os.replace(tmp_path, self.path)  # type: ignore[arg-type]
+
+    def save(self) -> None:
+        """Write the entries to :paramref:`path`. The file is replaced atomically."""
+        if self.path is None:
+            raise RuntimeError("This UploadCache has no path to save to.")
+        self._write(json.dumps(self._entries))
+
+    async def flush(self) -> None:
+        """Write the entries that were added in an event loop and are not saved yet, without
+        waiting for :paramref:`save_delay`. Called by :meth:`zalo_bot.Bot.shutdown`."""
+        task, self._save_task = self._save_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+            # The cancelled task may have been writing. Writing again waits for that write.
+            self._dirty = True
+        if self._dirty:
+            await self._write_entries()
+
+    def clear(self) -> None:
+        """Forget all entries. The file at :paramref:`path` is left untouched until the next
+        entry is added."""
+        self._entries.clear()
+        self._digests.clear()
+
+    async def substitute(self, data: JSONDict) -> Tuple[JSONDict, Dict[str, str]]:
+        """Replace the :class:`~zalo_bot.InputFile` values of :paramref:`data` whose content is
+        cached.
+
+        Returns:
+            Tuple[:obj:`dict`, Dict[:obj:`str`, :obj:`str`]]: The parameters, copied if anything
+            was replaced, and the cache keys of the files that are still uploaded by parameter
+            name. Pass the latter to :meth:`remember` along with the result of the request.
+        """
+        uploads: Dict[str, str] = {}
+        substituted: Optional[JSONDict] = None
+        for name, value in data.items():
+            if not isinstance(value, InputFile):
+                continue
+            digest = await self._digest_in_thread(value)
+            if digest is None:
+                continue
+            key = f"{name}:{digest}"
+            cached = self.get(key)
+            if cached is None:
+                self.misses += 1
+                uploads[name] = key
+                continue
+            self.hits += 1
+            if substituted is None:
+                substituted = dict(data)
+            substituted[name] = cached
+        return (substituted if substituted is not None else data), uploads
+
+    def remember(self, uploads: Dict[str, str], result: object) -> None:
+        """Remember the values the server returned for the uploaded files.
+
+        Args:
+            uploads (Dict[:obj:`str`, :obj:`str`]): As returned by :meth:`substitute`.
+            result (:obj:`dict`): The result of the request. For each parameter ``name``, the
+                value of ``name + "_url"`` or else ``name`` is used, if it is a string.
+        """
+        if not isinstance(result, dict):
+            return
+        for name, key in uploads.items():
+            value = result.get(f"{name}_url") or result.get(name)
+            if isinstance(value, str) and value:
+                self.put(key, value)
+
+    def statistics(self) -> Dict[str, int]:
+        """The number of ``entries`` and of cache ``hits`` and ``misses`` so far."""
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}